@@ -0,0 +1,278 @@
+"""Build `aegis-share/canonical.json` and `manifest.json` from `aegis-share/source/`, incrementally.
+
+```
+python3 scripts/aegis-build.py             # rebuild what changed, write bundle, pack and manifest
+python3 scripts/aegis-build.py --check     # would a build change anything? (writes nothing)
+python3 scripts/aegis-build.py --full      # ignore the cache; must give the same bytes
+```
+
+Everything in the bundle is already in `source/`: a document's `content` is its
+`.md` file after the frontmatter, `content_hash` is the sha256 of that body, the
+frontmatter supplies `doc_id`, `title`, `kind` and `ownership`, the edges are the
+two files under `source/edges/` tagged with their type and sorted by `edge_id`,
+and `tag_mappings` is `source/tag-mappings.json` as it stands. The serialization
+is `json.dumps(indent=2, ensure_ascii=False)` plus a newline, which the real
+bundle is byte for byte — `--full` on an unchanged tree reproduces the committed
+`canonical.json` exactly, and that is the first thing to check after touching
+this file.
+
+The build is incremental. Each document's serialized fragment (its object, at the
+indentation it has inside the bundle) is cached in `.aegis/build/` with the
+source file's size, mtime and sha256; a file whose stat is unchanged is not read,
+one whose stat changed but whose bytes did not is not re-encoded, and only a
+changed document is parsed and serialized again. Edges and tag mappings are
+cached the same way, per source file. The bundle is then the cached fragments
+joined in order. Its sha256 is streamed over the joined bytes, because
+`bundle_sha256` is defined as the hash of the file and a sha256 cannot be
+assembled from the hashes of its parts; at this size that costs well under a
+millisecond. What the per-part digests do give is the build key: when the
+digest of all parts matches the last build's, nothing is joined, hashed or
+written.
+
+Two manifest fields are not derivable from `source/`: `snapshot_id` and
+`knowledge_version` are issued by the Aegis share pipeline when it publishes.
+When the sources still describe the published snapshot, they are kept. When they
+do not, the build derives a local identity — `knowledge_version` one past the
+manifest's, `snapshot_id` the digest of the parts — and says so; give
+`--snapshot-id` / `--knowledge-version` to use the pipeline's values instead. The
+pack (`scripts/aegis-pack.py`) is rewritten whenever the bundle is, and with it
+the structure the share pipeline leaves in prose: each document's section index
+and the supersession closure read from the ADRs' status lines.
+"""
+
+import argparse
+import hashlib
+import importlib.util
+import json
+import pathlib
+import sys
+import time
+
+REPO = pathlib.Path(__file__).resolve().parent.parent
+SHARE = REPO / "aegis-share"
+SOURCE = SHARE / "source"
+STATE_DIR = REPO / ".aegis/build"
+STATE = STATE_DIR / "state.json"
+STATE_FORMAT = 1
+EDGE_SOURCES = (("path-requires.json", "path", "path_requires"), ("command-requires.json", "command", "command_requires"))
+
+_spec = importlib.util.spec_from_file_location("aegis_pack", REPO / "scripts/aegis-pack.py")
+PACK = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(PACK)
+
+
+def sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def parse_document(raw, name):
+    """The bundle's document object for one source `.md`."""
+    if not raw.startswith("---\n"):
+        raise ValueError(f"{name}: no frontmatter")
+    end = raw.index("\n---\n", 3)
+    front = {}
+    for line in raw[4:end].splitlines():
+        key, _, value = line.partition(":")
+        front[key.strip()] = value.strip()
+    body = raw[end + len("\n---\n") :]
+    return {
+        "doc_id": front["doc_id"],
+        "title": front["title"],
+        "kind": front["kind"],
+        "content": body,
+        "content_hash": sha256(body.encode("utf-8")),
+        "ownership": front["ownership"],
+        "template_origin": front.get("template_origin"),
+        "source_path": front.get("source_path"),
+        "source_refs_json": front.get("source_refs_json"),
+    }
+
+
+def encode(value, depth):
+    """`value` as it appears `depth` levels deep in an indent-2 dump, first line unindented."""
+    text = json.dumps(value, indent=2, ensure_ascii=False)
+    return text.replace("\n", "\n" + "  " * depth)
+
+
+def load_edges(texts):
+    edges = []
+    for (name, source_type, edge_type) in EDGE_SOURCES:
+        for e in json.loads(texts[name]):
+            edges.append(
+                {
+                    "edge_id": e["edge_id"],
+                    "source_type": source_type,
+                    "source_value": e["source_value"],
+                    "target_doc_id": e["target_doc_id"],
+                    "edge_type": edge_type,
+                    "priority": e["priority"],
+                    "specificity": e["specificity"],
+                }
+            )
+    return sorted(edges, key=lambda e: e["edge_id"])
+
+
+def join(identity, doc_fragments, edges_text, tags_text):
+    """The bundle's bytes from cached fragments."""
+    docs = "[\n" + ",\n".join("    " + f for f in doc_fragments) + "\n  ]" if doc_fragments else "[]"
+    members = [
+        ("format_version", "1"),
+        ("snapshot_id", json.dumps(identity["snapshot_id"])),
+        ("knowledge_version", json.dumps(identity["knowledge_version"])),
+        ("documents", docs),
+        ("edges", edges_text),
+        ("layer_rules", "[]"),
+        ("tag_mappings", tags_text),
+    ]
+    return ("{\n" + ",\n".join(f'  "{k}": {v}' for k, v in members) + "\n}\n").encode("utf-8")
+
+
+class Builder:
+    def __init__(self, full=False):
+        self.state = {"format": STATE_FORMAT, "files": {}, "parts": {}, "published": None, "key": None}
+        if not full:
+            try:
+                stored = json.loads(STATE.read_text())
+                if stored.get("format") == STATE_FORMAT:
+                    self.state = stored
+            except (FileNotFoundError, ValueError):
+                pass
+        self.reencoded = []
+
+    def _cached(self, path, produce):
+        """(digest, fragment) for one source file, re-produced only when its bytes changed."""
+        rel = str(path.relative_to(SOURCE))
+        stat = path.stat()
+        entry = self.state["files"].get(rel)
+        if entry and entry["stat"] == [stat.st_size, stat.st_mtime_ns]:
+            return entry
+        raw = path.read_bytes()
+        digest = sha256(raw)
+        if entry and entry["sha256"] == digest:
+            entry["stat"] = [stat.st_size, stat.st_mtime_ns]
+            return entry
+        entry = {"stat": [stat.st_size, stat.st_mtime_ns], "sha256": digest, **produce(raw.decode("utf-8"), rel)}
+        entry["part"] = sha256(entry["fragment"].encode("utf-8"))
+        self.state["files"][rel] = entry
+        self.reencoded.append(rel)
+        return entry
+
+    def _document(self, text, rel):
+        doc = parse_document(text, rel)
+        return {"doc_id": doc["doc_id"], "fragment": encode(doc, 2), "body": doc["content"]}
+
+    def parts(self):
+        """Every source part, in bundle order, from cache where possible."""
+        docs = [self._cached(p, self._document) for p in sorted((SOURCE / "documents").glob("*.md"))]
+        docs.sort(key=lambda e: e["doc_id"])
+        edge_entries = [self._cached(SOURCE / "edges" / name, lambda t, r: {"fragment": t}) for name, _, _ in EDGE_SOURCES]
+        tags_entry = self._cached(SOURCE / "tag-mappings.json", lambda t, r: {"fragment": encode(json.loads(t), 1)})
+        live = {str(p.relative_to(SOURCE)) for p in SOURCE.rglob("*") if p.is_file()}
+        self.state["files"] = {k: v for k, v in self.state["files"].items() if k in live}
+        edges_key = sha256("".join(e["sha256"] for e in edge_entries).encode())
+        if self.state["parts"].get("edges_key") != edges_key:
+            texts = {name: self.state["files"][f"edges/{name}"]["fragment"] for name, _, _ in EDGE_SOURCES}
+            self.state["parts"] = {"edges_key": edges_key, "edges": encode(load_edges(texts), 1)}
+            self.reencoded.append("edges")
+        return docs, self.state["parts"]["edges"], tags_entry["fragment"]
+
+    def build(self, manifest, snapshot_id=None, knowledge_version=None):
+        """(bundle bytes or None when unchanged, identity, content key, docs)."""
+        docs, edges_text, tags_text = self.parts()
+        content_key = sha256(
+            "".join([e["part"] for e in docs] + [sha256(edges_text.encode()), sha256(tags_text.encode())]).encode()
+        )
+        published = self.state.get("published")
+        if snapshot_id:
+            identity = {"snapshot_id": snapshot_id, "knowledge_version": knowledge_version or manifest["knowledge_version"] + 1}
+        elif published and published["content_key"] == content_key:
+            identity = published["identity"]
+        elif manifest["snapshot_id"] == content_key:
+            identity = {"snapshot_id": content_key, "knowledge_version": manifest["knowledge_version"]}
+        else:
+            identity = {"snapshot_id": manifest["snapshot_id"], "knowledge_version": manifest["knowledge_version"]}
+            data = join(identity, [e["fragment"] for e in docs], edges_text, tags_text)
+            if sha256(data) == manifest["bundle_sha256"]:
+                # First build against this snapshot: the sources are what was published.
+                self.state["published"] = {"content_key": content_key, "identity": identity}
+                return data, identity, content_key, docs
+            identity = {"snapshot_id": content_key, "knowledge_version": manifest["knowledge_version"] + 1}
+        key = sha256(json.dumps([identity, content_key]).encode())
+        if key == self.state.get("key") and not self.reencoded:
+            return None, identity, content_key, docs
+        return join(identity, [e["fragment"] for e in docs], edges_text, tags_text), identity, content_key, docs
+
+    def save(self, identity, content_key):
+        self.state["key"] = sha256(json.dumps([identity, content_key]).encode())
+        STATE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = STATE.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.state))
+        tmp.replace(STATE)
+
+
+def write_if_changed(path, data):
+    if path.exists() and path.read_bytes() == data:
+        return False
+    tmp = pathlib.Path(f"{path}.tmp")
+    tmp.write_bytes(data)
+    tmp.replace(path)
+    return True
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--check", action="store_true", help="report whether a build would change anything")
+    parser.add_argument("--full", action="store_true", help="rebuild every part, ignoring .aegis/build/")
+    parser.add_argument("--snapshot-id", help="the snapshot id the share pipeline issued")
+    parser.add_argument("--knowledge-version", type=int, help="the knowledge version it issued")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    manifest_path = SHARE / "manifest.json"
+    manifest = json.loads(manifest_path.read_text())
+    builder = Builder(full=args.full or args.check)
+    data, identity, content_key, docs = builder.build(manifest, args.snapshot_id, args.knowledge_version)
+    bundle_path = SHARE / manifest["bundle_file"]
+
+    if data is None:
+        print(f"{len(docs)} documents, nothing changed ({(time.perf_counter() - t0) * 1e3:.1f}ms)")
+        return 0
+    bundle_sha = sha256(data)
+    if args.check:
+        stale = bundle_sha != manifest["bundle_sha256"] or PACK.file_sha256(bundle_path) != bundle_sha
+        print(f"canonical.json is {'stale' if stale else 'current'} against aegis-share/source/")
+        return 1 if stale else 0
+
+    if identity["snapshot_id"] == content_key and manifest["snapshot_id"] != content_key:
+        print(f"sources differ from snapshot {manifest['snapshot_id'][:12]}; using a local identity "
+              f"(knowledge_version {identity['knowledge_version']}) — pass --snapshot-id to use the pipeline's")
+    wrote = write_if_changed(bundle_path, data)
+    pack_path = SHARE / manifest.get("pack_file", PACK.PACK.name)
+    pack_sha = manifest.get("pack_sha256")
+    if wrote or not pack_path.exists() or pack_sha != PACK.file_sha256(pack_path):
+        bundle = json.loads(data)
+        pack_data = PACK.pack_bytes(bundle, bundle_sha)
+        write_if_changed(pack_path, pack_data)
+        pack_sha = sha256(pack_data)
+    manifest.update(
+        snapshot_id=identity["snapshot_id"],
+        knowledge_version=identity["knowledge_version"],
+        bundle_sha256=bundle_sha,
+        includes_tag_mappings=bool(json.loads((SOURCE / "tag-mappings.json").read_text())),
+        pack_file=pack_path.name,
+        pack_sha256=pack_sha,
+    )
+    write_if_changed(manifest_path, (json.dumps(manifest, indent=2, ensure_ascii=False) + "\n").encode("utf-8"))
+    builder.save(identity, content_key)
+    changed = ", ".join(builder.reencoded[:6]) + (" …" if len(builder.reencoded) > 6 else "")
+    print(
+        f"{len(docs)} documents, {len(builder.reencoded)} part(s) re-encoded"
+        + (f" ({changed})" if changed else "")
+        + f", bundle {'written' if wrote else 'unchanged'}, sha256 {bundle_sha[:12]}"
+        f" ({(time.perf_counter() - t0) * 1e3:.1f}ms)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
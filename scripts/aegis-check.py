@@ -0,0 +1,212 @@
+"""Check `aegis-share/` for drift between the manifest, the bundle, the pack and `source/`.
+
+```
+python3 scripts/aegis-check.py              # exits non-zero on any problem
+python3 scripts/aegis-check.py --no-cache   # hash and compare everything again
+```
+
+`manifest.json` records a `bundle_sha256` and nothing verified it: a hand-edited
+`canonical.json`, a source ADR changed without a rebuild, or an edge left
+pointing at a removed document all went unnoticed until a compile returned the
+wrong thing. This checks, in one pass over the parsed bundle:
+
+- `canonical.json` hashes to the manifest's `bundle_sha256` (streamed, not read
+  whole), and the pack to `pack_sha256` and was built from that bundle;
+- every document's `content_hash` is the sha256 of its `content`, and its
+  content, title, kind and ownership match `source/documents/` — no document
+  missing from either side;
+- the edges are exactly `source/edges/*.json` and the tag mappings exactly
+  `source/tag-mappings.json`;
+- every edge's `target_doc_id` and every mapping's `doc_id` exists, and no
+  `edge_id` or (tag, doc_id) pair repeats.
+
+Sources are parsed the way `scripts/aegis-build.py` parses them, so the two cannot
+disagree about what a source file means. `snapshot_id` and `knowledge_version`
+are not checked against `source/`; they are issued by the share pipeline.
+
+Results are memoized in `.cache/aegis-check.json` by every input's size and
+mtime, plus the hash of this file and of `aegis-build.py` and `aegis-pack.py`,
+whose parsing and pack format the checks rely on: when none of them changed
+since a clean run, nothing is opened, which is what lets lefthook run this on
+every commit. A file whose stat changed is hashed again; one whose bytes turn
+out the same keeps its cached digest.
+"""
+
+import argparse
+import collections
+import hashlib
+import importlib.util
+import json
+import pathlib
+import sys
+
+REPO = pathlib.Path(__file__).resolve().parent.parent
+SHARE = REPO / "aegis-share"
+SOURCE = SHARE / "source"
+CACHE = REPO / ".cache/aegis-check.json"
+
+_spec = importlib.util.spec_from_file_location("aegis_build", REPO / "scripts/aegis-build.py")
+BUILD = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(BUILD)
+PACK = BUILD.PACK
+
+
+def inputs():
+    """Every file the check reads, relative to aegis-share/."""
+    files = [SHARE / "manifest.json"]
+    try:
+        manifest = json.loads(files[0].read_text())
+        files += [SHARE / manifest["bundle_file"], SHARE / manifest.get("pack_file", PACK.PACK.name)]
+    except (FileNotFoundError, ValueError, KeyError):
+        pass
+    files += sorted(p for p in SOURCE.rglob("*") if p.is_file())
+    return [str(p.relative_to(SHARE)) for p in files]
+
+
+def fingerprint(paths):
+    stats = {}
+    for rel in paths:
+        try:
+            st = (SHARE / rel).stat()
+            stats[rel] = [st.st_size, st.st_mtime_ns]
+        except FileNotFoundError:
+            stats[rel] = None
+    return stats
+
+
+class Digests:
+    """sha256 of files, reused while a file's size and mtime are unchanged."""
+
+    def __init__(self, cached, stats):
+        self.cached = cached
+        self.stats = stats
+
+    def __call__(self, rel):
+        entry = self.cached.get(rel)
+        if entry and entry[0] == self.stats[rel]:
+            return entry[1]
+        digest = PACK.file_sha256(SHARE / rel)
+        self.cached[rel] = [self.stats[rel], digest]
+        return digest
+
+
+def check(digest):
+    """Problems, as sentences; empty when aegis-share/ is consistent."""
+    problems = []
+    try:
+        manifest = json.loads((SHARE / "manifest.json").read_text())
+        bundle_rel = manifest["bundle_file"]
+        bundle = json.loads((SHARE / bundle_rel).read_text())
+    except (FileNotFoundError, ValueError, KeyError) as exc:
+        return [f"cannot read the manifest or bundle: {exc}"]
+
+    if digest(bundle_rel) != manifest["bundle_sha256"]:
+        problems.append(f"{bundle_rel} does not hash to the manifest's bundle_sha256")
+    for key in ("snapshot_id", "knowledge_version", "format_version"):
+        if bundle.get(key) != manifest.get(key):
+            problems.append(f"{key} differs between manifest.json and {bundle_rel}")
+    if "pack_file" in manifest:
+        pack_rel = manifest["pack_file"]
+        if not (SHARE / pack_rel).exists():
+            problems.append(f"{pack_rel} is missing; run scripts/aegis-pack.py")
+        elif digest(pack_rel) != manifest.get("pack_sha256"):
+            problems.append(f"{pack_rel} does not hash to the manifest's pack_sha256")
+        else:
+            with PACK.Pack(SHARE / pack_rel) as pack:
+                if pack.header["bundle_sha256"] != manifest["bundle_sha256"]:
+                    problems.append(f"{pack_rel} was built from a different bundle; run scripts/aegis-pack.py")
+
+    documents = {}
+    for doc in bundle["documents"]:
+        if doc["doc_id"] in documents:
+            problems.append(f"{doc['doc_id']} appears twice in {bundle_rel}")
+        documents[doc["doc_id"]] = doc
+        if BUILD.sha256(doc["content"].encode("utf-8")) != doc["content_hash"]:
+            problems.append(f"{doc['doc_id']}: content_hash is not the sha256 of its content")
+    sources = {}
+    for path in sorted((SOURCE / "documents").glob("*.md")):
+        try:
+            parsed = BUILD.parse_document(path.read_text(), path.name)
+        except (ValueError, KeyError) as exc:
+            problems.append(f"source/documents/{path.name}: unreadable frontmatter ({exc})")
+            continue
+        sources[parsed["doc_id"]] = parsed
+    for doc_id in sorted(sources.keys() - documents.keys()):
+        problems.append(f"{doc_id} is in source/ but not in {bundle_rel}; rebuild with scripts/aegis-build.py")
+    for doc_id in sorted(documents.keys() - sources.keys()):
+        problems.append(f"{doc_id} is in {bundle_rel} but not in source/")
+    for doc_id in sorted(documents.keys() & sources.keys()):
+        drifted = [k for k in ("content_hash", "title", "kind", "ownership") if documents[doc_id][k] != sources[doc_id][k]]
+        if drifted:
+            verb = "differs" if len(drifted) == 1 else "differ"
+            problems.append(f"{doc_id}: {', '.join(drifted)} {verb} from source/")
+
+    try:
+        texts = {name: (SOURCE / "edges" / name).read_text() for name, _, _ in BUILD.EDGE_SOURCES}
+        if bundle["edges"] != BUILD.load_edges(texts):
+            problems.append(f"edges in {bundle_rel} differ from source/edges/")
+        if bundle["tag_mappings"] != json.loads((SOURCE / "tag-mappings.json").read_text()):
+            problems.append(f"tag_mappings in {bundle_rel} differ from source/tag-mappings.json")
+    except (FileNotFoundError, ValueError, KeyError) as exc:
+        problems.append(f"cannot read source edges or tag mappings: {exc}")
+
+    for edge_id, count in collections.Counter(e["edge_id"] for e in bundle["edges"]).items():
+        if count > 1:
+            problems.append(f"edge {edge_id} appears {count} times")
+    for edge in bundle["edges"]:
+        if edge["target_doc_id"] not in documents:
+            problems.append(f"edge {edge['edge_id']} ({edge['source_value']}) targets missing {edge['target_doc_id']}")
+    pairs = collections.Counter((m["tag"], m["doc_id"]) for m in bundle["tag_mappings"])
+    for (tag, doc_id), count in sorted(pairs.items()):
+        if count > 1:
+            problems.append(f"tag mapping {tag} → {doc_id} appears {count} times")
+        if doc_id not in documents:
+            problems.append(f"tag mapping {tag} → {doc_id} names a missing document")
+    return problems
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--no-cache", action="store_true", help="ignore .cache/aegis-check.json")
+    args = parser.parse_args(argv)
+
+    rules = hashlib.sha256(
+        b"".join(
+            path.read_bytes()
+            for path in (pathlib.Path(__file__), REPO / "scripts/aegis-build.py", REPO / "scripts/aegis-pack.py")
+        )
+    ).hexdigest()
+    stats = fingerprint(inputs())
+    cache = {}
+    if not args.no_cache:
+        try:
+            cache = json.loads(CACHE.read_text())
+        except (FileNotFoundError, ValueError):
+            pass
+        if cache.get("rules") != rules:
+            cache = {}
+        elif cache.get("clean") == stats:
+            print("aegis-share is consistent (unchanged since the last check)")
+            return 0
+
+    digest = Digests(cache.get("digests", {}), stats)
+    problems = check(digest)
+    CACHE.parent.mkdir(exist_ok=True)
+    CACHE.write_text(
+        json.dumps(
+            {"rules": rules, "clean": None if problems else stats, "digests": {k: v for k, v in digest.cached.items() if k in stats}},
+            indent=1,
+        )
+        + "\n"
+    )
+    for problem in problems:
+        print(f"  {problem}")
+    if problems:
+        print(f"\n{len(problems)} problem(s) in aegis-share/")
+        return 1
+    print(f"aegis-share is consistent ({len(stats)} files checked)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,323 @@
+"""Make and apply deltas between two Aegis bundles, so an update ships what changed.
+
+```
+python3 scripts/aegis-delta.py make OLD NEW -o update.delta   # OLD / NEW: a canonical.json, or a git revision
+python3 scripts/aegis-delta.py apply update.delta             # onto aegis-share/, then bundle, manifest and pack
+python3 scripts/aegis-delta.py apply update.delta --manifest published-manifest.json
+python3 scripts/aegis-delta.py --verify                       # round-trip a synthetic change, report sizes
+```
+
+Every `knowledge_version` bump replaces the whole `canonical.json`, even when one
+ADR gained a line. A delta names the snapshot it starts from and the one it
+produces (`snapshot_id`, `knowledge_version` and `bundle_sha256` of each) and lists
+what differs between them:
+
+- documents added (whole), removed (by `doc_id`) and modified — a modified
+  document carries its new metadata and its `content` as copy / insert operations
+  against the old body, by line: `["c", start, count]` copies old lines,
+  `["i", text]` inserts new text;
+- edges added, removed and modified, by `edge_id`;
+- tag mappings added, removed and modified, by (`tag`, `doc_id`);
+- `format_version` and `layer_rules`, only if they changed.
+
+On disk it is `b"AEGISDL\\x01"` followed by the zlib-compressed JSON, so one
+changed ADR makes a delta of a few hundred bytes rather than the bundle's
+~218 KB.
+
+`apply` refuses a delta whose starting `bundle_sha256` is not the hash of the
+bundle it is applied to, then rebuilds the target bundle in its canonical order
+(documents by `doc_id`, edges by `edge_id`, mappings by tag then document),
+checks each modified body against its `content_hash`, and serializes it the way
+the share pipeline does. The result is written only when its sha256 equals the
+target's — the delta's own, or `bundle_sha256` in `--manifest` when the published
+manifest was fetched separately — so a bad or mismatched delta leaves the
+bundle as it was. The manifest's snapshot fields and the pack
+(`scripts/aegis-pack.py`) are updated with it.
+"""
+
+import argparse
+import difflib
+import hashlib
+import importlib.util
+import json
+import pathlib
+import subprocess
+import sys
+import zlib
+
+REPO = pathlib.Path(__file__).resolve().parent.parent
+SHARE = REPO / "aegis-share"
+MAGIC = b"AEGISDL\x01"
+DELTA_FORMAT = 1
+
+_spec = importlib.util.spec_from_file_location("aegis_pack", REPO / "scripts/aegis-pack.py")
+PACK = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(PACK)
+
+
+class DeltaError(Exception):
+    pass
+
+
+def serialize(bundle):
+    return (json.dumps(bundle, indent=2, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def read_bundle(spec):
+    """(raw bytes, parsed) for a bundle path or a git revision of aegis-share/canonical.json."""
+    path = pathlib.Path(spec)
+    if path.is_file():
+        raw = path.read_bytes()
+    else:
+        result = subprocess.run(
+            ["git", "show", f"{spec}:aegis-share/canonical.json"], cwd=REPO, capture_output=True
+        )
+        if result.returncode:
+            raise DeltaError(f"{spec}: neither a file nor a revision with aegis-share/canonical.json")
+        raw = result.stdout
+    return raw, json.loads(raw)
+
+
+def identity(raw, bundle):
+    return {
+        "snapshot_id": bundle["snapshot_id"],
+        "knowledge_version": bundle["knowledge_version"],
+        "bundle_sha256": hashlib.sha256(raw).hexdigest(),
+    }
+
+
+def text_ops(old, new):
+    """Line copy / insert operations that turn `old` into `new`."""
+    a = old.splitlines(keepends=True)
+    b = new.splitlines(keepends=True)
+    ops = []
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, a, b, autojunk=False).get_opcodes():
+        if tag == "equal":
+            ops.append(["c", i1, i2 - i1])
+        elif j2 > j1:
+            ops.append(["i", "".join(b[j1:j2])])
+    return ops
+
+
+def apply_ops(old, ops):
+    a = old.splitlines(keepends=True)
+    out = []
+    for op in ops:
+        if op[0] == "c":
+            out.extend(a[op[1] : op[1] + op[2]])
+        elif op[0] == "i":
+            out.append(op[1])
+        else:
+            raise DeltaError(f"unknown content operation {op[0]!r}")
+    return "".join(out)
+
+
+def _keyed(items, key):
+    return {key(item): item for item in items}
+
+
+def _section(old, new, key, encode_key=lambda k: k):
+    """added / removed / modified between two lists of records keyed by `key`."""
+    before, after = _keyed(old, key), _keyed(new, key)
+    return {
+        "added": [after[k] for k in sorted(after.keys() - before.keys())],
+        "removed": [encode_key(k) for k in sorted(before.keys() - after.keys())],
+        "modified": [after[k] for k in sorted(after.keys() & before.keys()) if after[k] != before[k]],
+    }
+
+
+def _tag_key(mapping):
+    return (mapping["tag"], mapping["doc_id"])
+
+
+def make(old_raw, old, new_raw, new):
+    """The delta from one bundle to another, as a dict."""
+    before = _keyed(old["documents"], lambda d: d["doc_id"])
+    docs = _section(old["documents"], new["documents"], lambda d: d["doc_id"])
+    docs["modified"] = [
+        {
+            "meta": {k: v for k, v in doc.items() if k != "content"},
+            "ops": text_ops(before[doc["doc_id"]]["content"], doc["content"]),
+        }
+        for doc in docs["modified"]
+    ]
+    delta = {
+        "delta_format": DELTA_FORMAT,
+        "from": identity(old_raw, old),
+        "to": identity(new_raw, new),
+        "documents": docs,
+        "edges": _section(old["edges"], new["edges"], lambda e: e["edge_id"]),
+        "tag_mappings": _section(old["tag_mappings"], new["tag_mappings"], _tag_key, list),
+    }
+    for key in ("format_version", "layer_rules"):
+        if old[key] != new[key]:
+            delta[key] = new[key]
+    return delta
+
+
+def encode(delta):
+    return MAGIC + zlib.compress(json.dumps(delta, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), 9)
+
+
+def decode(data):
+    if not data.startswith(MAGIC):
+        raise DeltaError("not an Aegis delta")
+    delta = json.loads(zlib.decompress(data[len(MAGIC) :]))
+    if delta.get("delta_format") != DELTA_FORMAT:
+        raise DeltaError(f"unsupported delta_format {delta.get('delta_format')!r}")
+    return delta
+
+
+def _merge(items, section, key, decode_key=lambda k: k):
+    merged = _keyed(items, key)
+    for k in section["removed"]:
+        if merged.pop(decode_key(k), None) is None:
+            raise DeltaError(f"delta removes {k!r}, which the base does not have")
+    for item in section["modified"] + section["added"]:
+        merged[key(item)] = item
+    return [merged[k] for k in sorted(merged)]
+
+
+def apply(base_raw, base, delta, expected_sha256=None):
+    """The target bundle's bytes; raises DeltaError rather than return anything unverified."""
+    if hashlib.sha256(base_raw).hexdigest() != delta["from"]["bundle_sha256"]:
+        raise DeltaError(
+            f"delta starts from snapshot {delta['from']['snapshot_id'][:12]}"
+            f" (knowledge_version {delta['from']['knowledge_version']}), not this bundle"
+        )
+    before = _keyed(base["documents"], lambda d: d["doc_id"])
+    docs = delta["documents"]
+    modified = []
+    for change in docs["modified"]:
+        meta = change["meta"]
+        if meta["doc_id"] not in before:
+            raise DeltaError(f"delta modifies {meta['doc_id']}, which the base does not have")
+        content = apply_ops(before[meta["doc_id"]]["content"], change["ops"])
+        if hashlib.sha256(content.encode("utf-8")).hexdigest() != meta["content_hash"]:
+            raise DeltaError(f"{meta['doc_id']}: rebuilt content does not match its content_hash")
+        modified.append({k: (content if k == "content" else meta.get(k)) for k in PACK.DOC_KEYS})
+    target = {
+        "format_version": delta.get("format_version", base["format_version"]),
+        "snapshot_id": delta["to"]["snapshot_id"],
+        "knowledge_version": delta["to"]["knowledge_version"],
+        "documents": _merge(
+            base["documents"], {**docs, "modified": modified}, lambda d: d["doc_id"]
+        ),
+        "edges": _merge(base["edges"], delta["edges"], lambda e: e["edge_id"]),
+        "layer_rules": delta.get("layer_rules", base["layer_rules"]),
+        "tag_mappings": _merge(base["tag_mappings"], delta["tag_mappings"], _tag_key, tuple),
+    }
+    data = serialize(target)
+    want = expected_sha256 or delta["to"]["bundle_sha256"]
+    if hashlib.sha256(data).hexdigest() != want:
+        raise DeltaError("the rebuilt bundle's sha256 is not the target's; nothing was written")
+    return data
+
+
+def install(data, share=SHARE):
+    """Write a verified bundle into `share` with its manifest fields and pack."""
+    manifest_path = share / "manifest.json"
+    manifest = json.loads(manifest_path.read_text())
+    bundle = json.loads(data)
+    bundle_path = share / manifest["bundle_file"]
+    tmp = pathlib.Path(f"{bundle_path}.tmp")
+    tmp.write_bytes(data)
+    tmp.replace(bundle_path)
+    manifest.update(
+        snapshot_id=bundle["snapshot_id"],
+        knowledge_version=bundle["knowledge_version"],
+        bundle_sha256=hashlib.sha256(data).hexdigest(),
+    )
+    if "pack_file" in manifest:
+        manifest["pack_sha256"] = PACK.write_pack(bundle_path, share / manifest["pack_file"])
+    manifest_path.write_text(json.dumps(manifest, indent=2, ensure_ascii=False) + "\n")
+
+
+def synthetic_change(bundle):
+    """`bundle` after a typical publish: one ADR edited, one added, one edge and mapping changed."""
+    new = json.loads(json.dumps(bundle))
+    docs = new["documents"]
+    doc = docs[len(docs) // 2]
+    lines = doc["content"].splitlines(keepends=True)
+    lines.insert(len(lines) // 2, "- Revisited: the rule now also covers generated files.\n")
+    doc["content"] = "".join(lines)
+    doc["content_hash"] = hashlib.sha256(doc["content"].encode("utf-8")).hexdigest()
+    added = {**docs[0], "doc_id": "adr-9999", "title": "Synthetic addition"}
+    added["content"] = "# Synthetic addition\n\n- Status: proposed\n"
+    added["content_hash"] = hashlib.sha256(added["content"].encode("utf-8")).hexdigest()
+    new["documents"] = sorted(docs + [added], key=lambda d: d["doc_id"])
+    new["edges"][0] = {**new["edges"][0], "priority": new["edges"][0]["priority"] - 1}
+    new["tag_mappings"][0] = {**new["tag_mappings"][0], "confidence": 0.5}
+    new["snapshot_id"] = hashlib.sha256(serialize(new)).hexdigest()
+    new["knowledge_version"] += 1
+    return new
+
+
+def verify():
+    old_raw, old = read_bundle(SHARE / "canonical.json")
+    new = synthetic_change(old)
+    new_raw = serialize(new)
+    data = encode(make(old_raw, old, new_raw, new))
+    rebuilt = apply(old_raw, old, decode(data))
+    back = encode(make(new_raw, new, old_raw, old))
+    restored = apply(new_raw, new, decode(back))
+    ok = rebuilt == new_raw and restored == old_raw
+    print(f"{'  ok  ' if rebuilt == new_raw else '  FAIL'} forward delta rebuilds the changed bundle")
+    print(f"{'  ok  ' if restored == old_raw else '  FAIL'} reverse delta restores the committed bundle")
+    try:
+        apply(new_raw, new, decode(data))
+        print("  FAIL delta applied to the wrong base")
+        ok = False
+    except DeltaError:
+        print("  ok   delta refuses the wrong base")
+    print(f"bundle {len(new_raw)} bytes, delta {len(data)} bytes ({len(data) / len(new_raw):.2%})")
+    return 0 if ok else 1
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--verify", action="store_true", help="round-trip a synthetic change and report sizes")
+    sub = parser.add_subparsers(dest="command")
+    p_make = sub.add_parser("make", help="write the delta between two bundles")
+    p_make.add_argument("old", help="the bundle consumers have: a file or a git revision")
+    p_make.add_argument("new", help="the bundle to publish: a file or a git revision")
+    p_make.add_argument("-o", "--output", required=True)
+    p_apply = sub.add_parser("apply", help="apply a delta to aegis-share/")
+    p_apply.add_argument("delta")
+    p_apply.add_argument("--manifest", help="the published manifest whose bundle_sha256 the result must match")
+    args = parser.parse_args(argv)
+
+    if args.verify:
+        return verify()
+    try:
+        if args.command == "make":
+            old_raw, old = read_bundle(args.old)
+            new_raw, new = read_bundle(args.new)
+            data = encode(make(old_raw, old, new_raw, new))
+            pathlib.Path(args.output).write_bytes(data)
+            print(f"wrote {args.output} ({len(data)} bytes; bundle is {len(new_raw)})")
+        elif args.command == "apply":
+            delta = decode(pathlib.Path(args.delta).read_bytes())
+            expected = None
+            if args.manifest:
+                published = json.loads(pathlib.Path(args.manifest).read_text())
+                if published["snapshot_id"] != delta["to"]["snapshot_id"]:
+                    raise DeltaError("the delta does not produce the published snapshot")
+                expected = published["bundle_sha256"]
+            base_raw, base = read_bundle(SHARE / "canonical.json")
+            install(apply(base_raw, base, delta, expected))
+            print(
+                f"applied: snapshot {delta['to']['snapshot_id'][:12]}"
+                f" (knowledge_version {delta['to']['knowledge_version']})"
+            )
+        else:
+            parser.print_help()
+            return 2
+    except DeltaError as exc:
+        print(f"aegis-delta: {exc}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,490 @@
+"""An offline stand-in for the Aegis MCP server, answering compile_context from the bundle.
+
+```
+claude mcp add aegis -- python3 scripts/aegis-local-server.py     # offline session
+python3 scripts/aegis-local-server.py --call '{"target_files": ["AGENTS.md"], "command": "review"}'
+python3 scripts/aegis-local-server.py --bench 2000               # latency, cold vs cached
+```
+
+`test-aegis-gate.py` drove `post-aegis-compile.sh` only with responses written
+by hand (`compile_hook({"isError": False})`), so no harness saw what a compile of
+this repository's own bundle returns, and a session without the Aegis server —
+a remote container, a plane — cannot compile at all. This answers the same call
+from `aegis-share/` alone; `test-aegis-local-server.py` checks its answers on the
+real bundle, and one `test-aegis-gate.py` case feeds one to the hook. Register it under the server name `aegis`: the hooks
+match on the tool name `mcp__aegis__aegis_compile_context`, and any other name
+leaves the stamp hook silent.
+
+It speaks MCP's stdio transport (newline-delimited JSON-RPC 2.0): `initialize`,
+`tools/list` and `tools/call` for two tools. Arguments of the wrong shape — not
+an object, a `command` that is not a string, `target_files` or `intent_tags` that
+are not arrays — get a `-32602` error; nothing a client sends may end the process.
+
+- `aegis_compile_context` takes `target_files`, `command`, `intent_tags`,
+  `plan` (accepted and ignored — there is no tagger here) and `content_mode`.
+  `base` is what the path and command edges reach, resolved by
+  `scripts/aegis-resolve.py` and ordered by priority, specificity and id.
+  `expanded` is what the intent tags reach through the tag mappings and `base`
+  did not already hold, ordered by confidence — empty when the manifest says
+  `includes_tag_mappings: false`, as the real server's is. In both, a
+  superseded ADR is replaced by its live successor from the pack's supersession
+  table and marked `supersedes`, or dropped when the successor is already
+  there. Bodies are inline only under `content_mode: "always"` (ADR-0021). `debug_info.near_miss_edges`
+  lists, for each target file no edge matched, the path edges whose literal
+  prefix it shares, with `reason: "glob_no_match"` — the shape
+  `post-aegis-compile.sh` reads.
+  With `token_budget` (tokens, estimated as a quarter of the characters)
+  bodies are inline and cut to whole sections from the pack's section index:
+  every document first gets its most relevant section, in delivery order, then
+  the rest fill the budget. A Decision outranks an Amendment, which outranks the
+  title-and-status preamble and the Consequences, and a section mentioning a
+  target file, the command or a tag outranks its peers. Each document lists its
+  `sections` and `omitted_sections`, and `token_budget` in the response reports
+  the budget, the tokens used, those the whole bodies would have cost, and the
+  difference saved.
+- `aegis_get_known_tags` lists the tag catalog.
+
+This is a model of the service, not the service: ranking beyond the edges'
+own fields, the plan-driven tagger and observation logging are not reproduced,
+and the response carries `"server": "aegis-local"` so it cannot be mistaken for
+a real one in a transcript.
+
+Results are memoized, already serialized, in an LRU keyed by the normalized request — target files
+normalized, deduplicated and sorted, tags sorted — together with the bundle's
+`snapshot_id`. The manifest is re-read when it changes on disk, so a rebuilt
+bundle is picked up mid-session and can never be answered from the old one's
+entries. `--bench` starts a server process, replays a seeded mix of requests
+over the pipe, and reports latency with the cache off and on.
+"""
+
+import argparse
+import collections
+import importlib.util
+import json
+import pathlib
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+REPO = pathlib.Path(__file__).resolve().parent.parent
+SHARE = REPO / "aegis-share"
+PROTOCOL_VERSION = "2024-11-05"
+# Section relevance under a token budget, by the first word of the heading.
+SECTION_WEIGHT = {"decision": 3, "amendment": 2, "consequences": 1}
+PREAMBLE_WEIGHT = 2
+MENTION_WEIGHT = 2
+
+
+def _load(name, file):
+    spec = importlib.util.spec_from_file_location(name, REPO / "scripts" / file)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+PACK = _load("aegis_pack", "aegis-pack.py")
+RESOLVE = _load("aegis_resolve", "aegis-resolve.py")
+
+TOOLS = [
+    {
+        "name": "aegis_compile_context",
+        "description": "Documents the given target files, command and intent tags require (offline, from aegis-share/).",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "target_files": {"type": "array", "items": {"type": "string"}},
+                "command": {"type": "string"},
+                "intent_tags": {"type": "array", "items": {"type": "string"}},
+                "plan": {"type": "string"},
+                "content_mode": {"type": "string", "enum": ["always", "never"]},
+                "token_budget": {"type": "integer", "minimum": 0},
+            },
+            "required": ["target_files"],
+        },
+    },
+    {
+        "name": "aegis_get_known_tags",
+        "description": "The tag catalog from the bundle's tag mappings.",
+        "inputSchema": {"type": "object", "properties": {}},
+    },
+]
+
+
+class JsonBundle:
+    """The subset of `Pack` this server uses, over a parsed canonical.json."""
+
+    def __init__(self, path):
+        bundle = json.loads(pathlib.Path(path).read_text())
+        self.snapshot_id = bundle["snapshot_id"]
+        self.header = bundle
+        self.edges = bundle["edges"]
+        self.tag_mappings = bundle["tag_mappings"]
+        self.supersession = PACK.supersession(bundle["documents"])
+        self._by_id = {d["doc_id"]: d for d in bundle["documents"]}
+
+    def meta(self, doc_id):
+        return self._by_id.get(doc_id)
+
+    def sections(self, doc_id):
+        return PACK.section_index(self._by_id[doc_id]["content"])
+
+    def content(self, doc_id, start=0, end=None):
+        if start == 0 and end is None:
+            return self._by_id[doc_id]["content"]
+        return self._by_id[doc_id]["content"].encode("utf-8")[start:end].decode("utf-8")
+
+    def close(self):
+        pass
+
+
+class LRU:
+    def __init__(self, size):
+        self.size = size
+        self.entries = collections.OrderedDict()
+        self.hits = self.misses = 0
+
+    def get(self, key):
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        if self.size <= 0:
+            return
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+
+class Server:
+    def __init__(self, cache_size=256):
+        self.cache = LRU(cache_size)
+        self._stamp = None
+        self.bundle = None
+        self._reload()
+
+    def _reload(self):
+        """Open the bundle again if the manifest changed since it was last read."""
+        stat = (SHARE / "manifest.json").stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self._stamp:
+            return
+        manifest = json.loads((SHARE / "manifest.json").read_text())
+        if self.bundle is not None:
+            self.bundle.close()
+        pack_path = SHARE / manifest.get("pack_file", "canonical.pack")
+        bundle = None
+        if pack_path.exists():
+            bundle = PACK.Pack(pack_path)
+            if bundle.header["bundle_sha256"] != manifest["bundle_sha256"]:
+                bundle.close()
+                bundle = None
+        self.bundle = bundle or JsonBundle(SHARE / manifest["bundle_file"])
+        self.manifest = manifest
+        self.resolver = RESOLVE.Resolver(self.bundle.edges, supersession=self.bundle.supersession)
+        self._stamp = stamp
+
+    @staticmethod
+    def invalid_arguments(args):
+        """Why `args` cannot be a compile_context request, or None when it can."""
+        if not isinstance(args, dict):
+            return f"arguments must be an object, not {type(args).__name__}"
+        command = args.get("command")
+        if command is not None and not isinstance(command, str):
+            return f"command must be a string, not {type(command).__name__}"
+        for field in ("target_files", "intent_tags"):
+            value = args.get(field)
+            if value is not None and not isinstance(value, list):
+                return f"{field} must be an array, not {type(value).__name__}"
+        return None
+
+    @staticmethod
+    def request_key(args):
+        files = sorted({RESOLVE.normalize(f) for f in args.get("target_files") or [] if isinstance(f, str)})
+        tags = sorted({t for t in args.get("intent_tags") or [] if isinstance(t, str)})
+        budget = args.get("token_budget")
+        budget = budget if isinstance(budget, int) and not isinstance(budget, bool) and budget >= 0 else None
+        return (tuple(files), args.get("command") or None, tuple(tags), args.get("content_mode") == "always", budget)
+
+    def compile_text(self, args):
+        """The serialized compile_context result, from the LRU when the same request was seen."""
+        self._reload()
+        key = (self.bundle.snapshot_id,) + self.request_key(args)
+        text = self.cache.get(key)
+        if text is None:
+            text = json.dumps(self.compile_context(args), ensure_ascii=False)
+            self.cache.put(key, text)
+        return text
+
+    def compile_context(self, args):
+        self._reload()
+        files, command, tags, inline, budget = self.request_key(args)
+        resolved = self.resolver.resolve(list(files), command=command)
+        base = []
+        for d in resolved["documents"]:
+            base.append(self._doc(d["doc_id"], inline, reason=d["via"], priority=d["priority"]))
+            if "supersedes" in d:
+                base[-1]["supersedes"] = d["supersedes"]
+        reached = {d["doc_id"] for d in base}
+        expanded = []
+        if self.manifest.get("includes_tag_mappings") and tags:
+            best = {}
+            for m in self.bundle.tag_mappings:
+                doc_id = self.resolver.live(m["doc_id"])
+                if m["tag"] in tags and doc_id not in reached:
+                    if doc_id not in best or m["confidence"] > best[doc_id]["confidence"]:
+                        best[doc_id] = {**m, "doc_id": doc_id, "supersedes": m["doc_id"] if doc_id != m["doc_id"] else None}
+            for m in sorted(best.values(), key=lambda m: (-m["confidence"], m["doc_id"])):
+                expanded.append(self._doc(m["doc_id"], inline, reason=f"tag:{m['tag']}", confidence=m["confidence"]))
+                if m["supersedes"]:
+                    expanded[-1]["supersedes"] = [m["supersedes"]]
+        near = []
+        for path in resolved["unmatched"]:
+            for i in self.resolver.near_miss_edges(path):
+                edge = self.bundle.edges[i]
+                near.append(
+                    {
+                        "reason": "glob_no_match",
+                        "pattern": edge["source_value"],
+                        "target_doc_id": edge["target_doc_id"],
+                        "target_file": path,
+                    }
+                )
+        known = {m["tag"] for m in self.bundle.tag_mappings}
+        spent = None
+        if budget is not None:
+            spent = self._fit(base + expanded, budget, files, command, tags)
+        result = {
+            "server": "aegis-local",
+            "snapshot_id": self.bundle.snapshot_id,
+            "knowledge_version": self.manifest["knowledge_version"],
+            "base": {"documents": base},
+            "expanded": {"documents": expanded},
+            "debug_info": {
+                "unmatched_files": resolved["unmatched"],
+                "unknown_tags": [t for t in tags if t not in known],
+                "near_miss_edges": near,
+            },
+        }
+        if spent is not None:
+            result["token_budget"] = spent
+        return result
+
+    def _fit(self, docs, budget, files, command, tags):
+        """Give each of `docs` the sections that fit in `budget` tokens; returns the accounting.
+
+        Each document first gets its most relevant section, in delivery order
+        (edge priority, then tag confidence), so a tight budget reaches every
+        document's Decision before any document's Context; what is left goes to
+        the remaining sections by relevance, then document order.
+        """
+        needles = set(files) | {f.rsplit("/", 1)[-1] for f in files} | set(tags)
+        if command:
+            needles.add(command)
+        needles = {n.lower() for n in needles if len(n) >= 4}
+        candidates = []
+        full = 0
+        for rank, doc in enumerate(docs):
+            if doc.get("missing"):
+                continue
+            doc.pop("content", None)
+            sections = self.bundle.sections(doc["doc_id"])
+            full += sum(s["tokens"] for s in sections)
+            for number, section in enumerate(sections):
+                candidates.append((self._relevance(doc["doc_id"], number, section, needles), rank, number, section))
+        candidates.sort(key=lambda c: (-c[0], c[1], c[2]))
+        chosen = collections.defaultdict(list)
+        used = 0
+        for rank in sorted({c[1] for c in candidates}):
+            for _, _, number, section in (c for c in candidates if c[1] == rank):
+                if used + section["tokens"] <= budget:
+                    chosen[rank].append((number, section))
+                    used += section["tokens"]
+                    break
+        picked = {(rank, number) for rank, items in chosen.items() for number, _ in items}
+        for _, rank, number, section in candidates:
+            if (rank, number) not in picked and used + section["tokens"] <= budget:
+                chosen[rank].append((number, section))
+                used += section["tokens"]
+        for rank, doc in enumerate(docs):
+            if doc.get("missing"):
+                continue
+            items = sorted(chosen.get(rank, []), key=lambda item: item[0])
+            doc["content"] = "".join(
+                self.bundle.content(doc["doc_id"], s["start"], s["end"]) for _, s in items
+            )
+            doc["sections"] = [s["heading"] for _, s in items]
+            kept = {number for number, _ in items}
+            doc["omitted_sections"] = [
+                s["heading"] for n, s in enumerate(self.bundle.sections(doc["doc_id"])) if n not in kept
+            ]
+        return {"budget": budget, "used": used, "full": full, "saved": full - used}
+
+    def _relevance(self, doc_id, number, section, needles):
+        heading = section["heading"].lstrip("#").strip().lower()
+        score = SECTION_WEIGHT.get(heading.split(" ", 1)[0], 0) if number else PREAMBLE_WEIGHT
+        if needles:
+            text = self.bundle.content(doc_id, section["start"], section["end"]).lower()
+            if any(n in text for n in needles):
+                score += MENTION_WEIGHT
+        return score
+
+    def _doc(self, doc_id, inline, **why):
+        meta = self.bundle.meta(doc_id)
+        doc = {"doc_id": doc_id, "title": meta["title"] if meta else None, "kind": meta["kind"] if meta else None, **why}
+        if meta is None:
+            doc["missing"] = True
+        elif inline:
+            doc["content"] = self.bundle.content(doc_id)
+        return doc
+
+    def known_tags(self):
+        self._reload()
+        return {"tags": sorted({m["tag"] for m in self.bundle.tag_mappings})}
+
+    def handle(self, message):
+        """The JSON-RPC response for one message, or None for a notification."""
+        method = message.get("method")
+        if "id" not in message:
+            return None
+        msg_id = message["id"]
+        params = message.get("params")
+        params = {} if params is None else params
+        if not isinstance(params, dict):
+            return _error(msg_id, -32602, "params must be an object")
+        if method == "initialize":
+            result = {
+                "protocolVersion": params.get("protocolVersion", PROTOCOL_VERSION),
+                "capabilities": {"tools": {}},
+                "serverInfo": {"name": "aegis-local", "version": "1"},
+            }
+        elif method == "ping":
+            result = {}
+        elif method == "tools/list":
+            result = {"tools": TOOLS}
+        elif method == "tools/call":
+            name = params.get("name")
+            arguments = params.get("arguments")
+            arguments = {} if arguments is None else arguments
+            try:
+                if name == "aegis_compile_context":
+                    problem = self.invalid_arguments(arguments)
+                    if problem:
+                        return _error(msg_id, -32602, problem)
+                    text = self.compile_text(arguments)
+                elif name == "aegis_get_known_tags":
+                    text = json.dumps(self.known_tags(), ensure_ascii=False)
+                else:
+                    return _error(msg_id, -32602, f"unknown tool {name!r}")
+            except (OSError, ValueError, KeyError) as exc:
+                result = {"content": [{"type": "text", "text": f"aegis-local: {exc}"}], "isError": True}
+            else:
+                result = {"content": [{"type": "text", "text": text}], "isError": False}
+        else:
+            return _error(msg_id, -32601, f"method not found: {method}")
+        return {"jsonrpc": "2.0", "id": msg_id, "result": result}
+
+
+def _error(msg_id, code, message):
+    return {"jsonrpc": "2.0", "id": msg_id, "error": {"code": code, "message": message}}
+
+
+def serve(cache_size):
+    server = Server(cache_size)
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            message = json.loads(line)
+        except ValueError:
+            response = _error(None, -32700, "parse error")
+        else:
+            response = server.handle(message) if isinstance(message, dict) else _error(None, -32600, "invalid request")
+        if response is not None:
+            sys.stdout.write(json.dumps(response, ensure_ascii=False) + "\n")
+            sys.stdout.flush()
+
+
+def bench_requests(count, rng):
+    tracked = subprocess.run(["git", "ls-files"], cwd=REPO, capture_output=True, text=True).stdout.split()
+    tags = sorted({m["tag"] for m in json.loads((SHARE / "source/tag-mappings.json").read_text())})
+    # A session asks the same few questions again and again — one per step of
+    # the workflow — not a fresh one each time.
+    distinct = [
+        {
+            "target_files": rng.sample(tracked, rng.randint(1, 12)),
+            "command": rng.choice([None, "scaffold", "refactor", "review"]),
+            "intent_tags": rng.sample(tags, rng.randint(0, 3)),
+            "content_mode": rng.choice(["always", "never"]),
+            "token_budget": rng.choice([None, 2000, 8000]),
+        }
+        for _ in range(max(1, count // 20))
+    ]
+    for _ in range(count):
+        yield rng.choice(distinct)
+
+
+def bench(count, seed):
+    print(f"{'cache':>6s} {'requests':>8s} {'p50 ms':>8s} {'p95 ms':>8s} {'max ms':>8s} {'req/s':>8s}")
+    for size in (0, 256):
+        proc = subprocess.Popen(
+            [sys.executable, __file__, "--cache-size", str(size)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+
+        def call(msg_id, method, params):
+            proc.stdin.write(json.dumps({"jsonrpc": "2.0", "id": msg_id, "method": method, "params": params}) + "\n")
+            proc.stdin.flush()
+            return json.loads(proc.stdout.readline())
+
+        call(0, "initialize", {"protocolVersion": PROTOCOL_VERSION})
+        latencies = []
+        start = time.perf_counter()
+        for i, args in enumerate(bench_requests(count, random.Random(seed)), 1):
+            t0 = time.perf_counter()
+            reply = call(i, "tools/call", {"name": "aegis_compile_context", "arguments": args})
+            latencies.append((time.perf_counter() - t0) * 1e3)
+            if reply["result"]["isError"]:
+                sys.exit(f"request {i} failed: {reply['result']['content'][0]['text']}")
+        wall = time.perf_counter() - start
+        proc.stdin.close()
+        proc.wait()
+        latencies.sort()
+        print(
+            f"{size:6d} {count:8d} {statistics.median(latencies):8.3f} {latencies[int(0.95 * len(latencies))]:8.3f}"
+            f" {latencies[-1]:8.3f} {count / wall:8.0f}"
+        )
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cache-size", type=int, default=256, help="LRU entries (0 disables the cache)")
+    parser.add_argument("--call", metavar="JSON", help="answer one compile_context request and exit")
+    parser.add_argument("--bench", type=int, metavar="N", help="replay N requests through a server process")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        bench(args.bench, args.seed)
+        return 0
+    if args.call:
+        request = json.loads(args.call)
+        problem = Server.invalid_arguments(request)
+        if problem:
+            parser.error(f"--call: {problem}")
+        print(json.dumps(Server(0).compile_context(request), indent=2, ensure_ascii=False))
+        return 0
+    serve(args.cache_size)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
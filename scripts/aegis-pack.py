@@ -0,0 +1,360 @@
+"""Write and read `aegis-share/canonical.pack`, an offset-indexed form of the bundle.
+
+```
+python3 scripts/aegis-pack.py                 # (re)write canonical.pack, record it in manifest.json
+python3 scripts/aegis-pack.py --check         # the pack matches canonical.json and the manifest
+python3 scripts/aegis-pack.py --bench         # load time and memory against json.load, 31 → 5000 docs
+```
+
+`canonical.json` is about 218 KB, almost all of it the `content` of the ADRs, and
+anything that wants only the edges or the tag mappings has to parse every body to
+reach them. The pack holds the same bundle split in two:
+
+    b"AEGISPK\\x01"  4-byte little-endian header length  header JSON  content
+
+The header carries everything except the bodies — `snapshot_id`,
+`knowledge_version`, the `bundle_sha256` of the `canonical.json` it was made
+from, the edges, layer rules and tag mappings, and per document its metadata plus
+the byte offset and length of its body in the content section. The content
+section is the bodies' UTF-8, concatenated in document order. `Pack` maps the
+file, parses only the header, and decodes a body when that document is asked
+for; a lookup that returns three ADRs decodes three.
+
+Each document's metadata also holds its section index (`sections`, pack format
+2): one entry per `#` / `##` heading — the preamble under the title is the first —
+with the section's byte range within the body and an approximate token count, a
+quarter of its characters. Deeper headings stay inside their section, and a `#`
+inside a fenced block is not a heading. A caller with a token budget can take a
+document's Decision without decoding its Context (`scripts/aegis-local-server.py`
+does).
+
+The header's `supersession` table (pack format 3) is the lineage the ADRs state
+only in prose: for each document whose status line reads `superseded by NNNN`,
+its `chain` of successors and the live `successor` at the end of it, so a chain
+of replacements resolves to the last. Live documents are absent, and a consumer
+checks a document with one dictionary lookup instead of parsing Markdown and
+chasing the chain at query time. A chain that loops or ends at a document the
+bundle lacks has `successor: null`: there is nothing live to redirect to, and
+consumers keep the document. A partial status such as "mechanism superseded by
+0015" does not count; that ADR is still accepted.
+
+The pack is derived data and `canonical.json` stays the bundle: the Aegis share
+pipeline reads and writes only that (docs/agent-workflow.md), so rewriting the
+bundle through it drops the pack's two manifest keys (`pack_file`, `pack_sha256`)
+and leaves a stale pack behind. Re-run this afterwards; `--check` says when it is
+needed, because a pack whose `bundle_sha256` is not the manifest's describes a
+bundle that no longer exists. Output is deterministic: the same `canonical.json`
+always gives the same bytes.
+
+Other scripts load this file with `importlib` and use `Pack`, `write_pack` and
+`pack_bytes`; nothing here depends on them.
+"""
+
+import argparse
+import gc
+import hashlib
+import json
+import mmap
+import pathlib
+import re
+import struct
+import sys
+import tempfile
+import time
+import tracemalloc
+
+REPO = pathlib.Path(__file__).resolve().parent.parent
+SHARE = REPO / "aegis-share"
+BUNDLE = SHARE / "canonical.json"
+MANIFEST = SHARE / "manifest.json"
+PACK = SHARE / "canonical.pack"
+MAGIC = b"AEGISPK\x01"
+PACK_FORMAT = 3
+HEADING = re.compile(r"#{1,2} \S")
+SUPERSEDED = re.compile(r"^- Status: superseded by (\d{4})\b", re.M)
+DOC_KEYS = (
+    "doc_id",
+    "title",
+    "kind",
+    "content",
+    "content_hash",
+    "ownership",
+    "template_origin",
+    "source_path",
+    "source_refs_json",
+)
+
+
+def file_sha256(path):
+    """sha256 of a file, read in chunks rather than whole."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def section_index(body):
+    """[{heading, start, end, tokens}] for a body's top-level sections; offsets are UTF-8 bytes."""
+    sections = []
+    offset = 0
+    fenced = False
+    for line in body.splitlines(keepends=True):
+        if line.startswith(("```", "~~~")):
+            fenced = not fenced
+        if sections and not fenced and HEADING.match(line):
+            sections[-1]["end"] = offset
+            sections.append({"heading": line.strip(), "start": offset})
+        elif not sections:
+            sections.append({"heading": line.strip() if HEADING.match(line) else "", "start": 0})
+        offset += len(line.encode("utf-8"))
+    if not sections:
+        return []
+    sections[-1]["end"] = offset
+    raw = body.encode("utf-8")
+    for section in sections:
+        chars = len(raw[section["start"] : section["end"]].decode("utf-8"))
+        section["tokens"] = -(-chars // 4)
+    return sections
+
+
+def supersession(documents):
+    """{doc_id: {"successor", "chain"}} for every superseded document in `documents`."""
+    direct = {}
+    for doc in documents:
+        found = SUPERSEDED.search(doc["content"])
+        if found:
+            direct[doc["doc_id"]] = f"adr-{found.group(1)}"
+    known = {doc["doc_id"] for doc in documents}
+    table = {}
+    for doc_id in sorted(direct):
+        chain = [direct[doc_id]]
+        while chain[-1] in direct and direct[chain[-1]] not in chain and direct[chain[-1]] != doc_id:
+            chain.append(direct[chain[-1]])
+        live = chain[-1] not in direct and chain[-1] in known
+        table[doc_id] = {"successor": chain[-1] if live else None, "chain": chain}
+    return table
+
+
+def pack_bytes(bundle, bundle_sha256, extra=None):
+    """The pack for a parsed bundle. `extra` adds header keys (later index tables)."""
+    docs = []
+    bodies = []
+    offset = 0
+    for doc in bundle["documents"]:
+        body = doc["content"].encode("utf-8")
+        meta = {k: doc.get(k) for k in DOC_KEYS if k != "content"}
+        meta["offset"] = offset
+        meta["length"] = len(body)
+        meta["sections"] = section_index(doc["content"])
+        docs.append(meta)
+        bodies.append(body)
+        offset += len(body)
+    header = {
+        "pack_format": PACK_FORMAT,
+        "format_version": bundle["format_version"],
+        "snapshot_id": bundle["snapshot_id"],
+        "knowledge_version": bundle["knowledge_version"],
+        "bundle_sha256": bundle_sha256,
+        "documents": docs,
+        "edges": bundle["edges"],
+        "layer_rules": bundle["layer_rules"],
+        "tag_mappings": bundle["tag_mappings"],
+        "supersession": supersession(bundle["documents"]),
+    }
+    header.update(extra or {})
+    raw = json.dumps(header, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return MAGIC + struct.pack("<I", len(raw)) + raw + b"".join(bodies)
+
+
+def write_pack(bundle_path=BUNDLE, pack_path=PACK, extra=None):
+    """Write the pack for `bundle_path`; returns its sha256."""
+    bundle_path = pathlib.Path(bundle_path)
+    data = pack_bytes(json.loads(bundle_path.read_text()), file_sha256(bundle_path), extra)
+    tmp = pathlib.Path(f"{pack_path}.tmp")
+    tmp.write_bytes(data)
+    tmp.replace(pack_path)
+    return hashlib.sha256(data).hexdigest()
+
+
+class Pack:
+    """A memory-mapped pack. Only the header is parsed on open.
+
+    `documents` is the metadata list (no bodies), `edges`, `layer_rules` and
+    `tag_mappings` are as in `canonical.json`, `supersession` is the closure table,
+    and `content(doc_id)` / `doc(doc_id)` decode one body on demand.
+    """
+
+    def __init__(self, path=PACK):
+        self._fh = open(path, "rb")
+        self._buf = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._buf[: len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{path}: not an Aegis pack")
+        (length,) = struct.unpack_from("<I", self._buf, len(MAGIC))
+        start = len(MAGIC) + 4
+        self.header = json.loads(self._buf[start : start + length])
+        self._base = start + length
+        self.documents = self.header["documents"]
+        self.edges = self.header["edges"]
+        self.layer_rules = self.header["layer_rules"]
+        self.tag_mappings = self.header["tag_mappings"]
+        self.snapshot_id = self.header["snapshot_id"]
+        self._by_id = {d["doc_id"]: d for d in self.documents}
+        if "supersession" in self.header:
+            self.supersession = self.header["supersession"]
+        else:
+            self.supersession = supersession([self.doc(d["doc_id"]) for d in self.documents])
+
+    def meta(self, doc_id):
+        return self._by_id.get(doc_id)
+
+    def sections(self, doc_id):
+        meta = self._by_id[doc_id]
+        return meta["sections"] if "sections" in meta else section_index(self.content(doc_id))
+
+    def content(self, doc_id, start=0, end=None):
+        """A document's body, or the byte range [start, end) of it, decoded."""
+        meta = self._by_id[doc_id]
+        end = meta["length"] if end is None else end
+        lo = self._base + meta["offset"]
+        return self._buf[lo + start : lo + end].decode("utf-8")
+
+    def doc(self, doc_id):
+        """A document exactly as it appears in `canonical.json`."""
+        meta = self._by_id[doc_id]
+        return {k: (self.content(doc_id) if k == "content" else meta[k]) for k in DOC_KEYS}
+
+    def close(self):
+        self._buf.close()
+        self._fh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def check(pack_path=PACK, bundle_path=BUNDLE, manifest_path=MANIFEST):
+    """Problems with the pack, as a list of sentences; empty when it is current."""
+    manifest = json.loads(pathlib.Path(manifest_path).read_text())
+    if not pathlib.Path(pack_path).exists():
+        return [f"{pathlib.Path(pack_path).name} is missing; run scripts/aegis-pack.py"]
+    problems = []
+    if manifest.get("pack_file") != pathlib.Path(pack_path).name:
+        problems.append("manifest.json does not record the pack (pack_file)")
+    if manifest.get("pack_sha256") != file_sha256(pack_path):
+        problems.append("pack_sha256 in manifest.json does not match the pack on disk")
+    bundle = json.loads(pathlib.Path(bundle_path).read_text())
+    with Pack(pack_path) as pack:
+        if pack.header["bundle_sha256"] != manifest.get("bundle_sha256"):
+            problems.append("the pack was built from a different canonical.json; run scripts/aegis-pack.py")
+            return problems
+        for key in ("snapshot_id", "knowledge_version", "edges", "layer_rules", "tag_mappings"):
+            if pack.header[key] != bundle[key]:
+                problems.append(f"{key} differs from canonical.json")
+        if pack.supersession != supersession(bundle["documents"]):
+            problems.append("supersession table differs from the documents' status lines")
+        if [d["doc_id"] for d in pack.documents] != [d["doc_id"] for d in bundle["documents"]]:
+            problems.append("document list differs from canonical.json")
+        else:
+            for doc in bundle["documents"]:
+                if pack.doc(doc["doc_id"]) != {k: doc.get(k) for k in DOC_KEYS}:
+                    problems.append(f"{doc['doc_id']} differs from canonical.json")
+    return problems
+
+
+def record_in_manifest(pack_sha256, manifest_path=MANIFEST):
+    """Add or update `pack_file` / `pack_sha256`, keeping the file's own layout."""
+    manifest = json.loads(pathlib.Path(manifest_path).read_text())
+    manifest["pack_file"] = PACK.name
+    manifest["pack_sha256"] = pack_sha256
+    pathlib.Path(manifest_path).write_text(json.dumps(manifest, indent=2, ensure_ascii=False) + "\n")
+
+
+def synthetic_bundle(base, count):
+    """`base` grown to `count` documents by copying its own, with ids and edges to match."""
+    docs, edges = [], []
+    for i in range(count):
+        src = base["documents"][i % len(base["documents"])]
+        docs.append({**src, "doc_id": f"{src['doc_id']}-{i:05d}"})
+    for i, doc in enumerate(docs):
+        edge = base["edges"][i % len(base["edges"])]
+        edges.append({**edge, "edge_id": f"{edge['edge_id'][:-5]}{i:05d}", "target_doc_id": doc["doc_id"]})
+    return {**base, "documents": docs, "edges": edges}
+
+
+def _measure(fn):
+    gc.collect()
+    t0 = time.perf_counter()
+    kept = fn()
+    seconds = time.perf_counter() - t0
+    del kept
+    gc.collect()
+    tracemalloc.start()
+    kept = fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del kept
+    return seconds, peak
+
+
+def bench(counts):
+    base = json.loads(BUNDLE.read_text())
+    print(f"{'docs':>6s} {'json MB':>8s} {'json.load':>10s} {'peak':>8s} {'pack open':>10s} {'+3 docs':>9s} {'peak':>8s}")
+    with tempfile.TemporaryDirectory(prefix="aegis-pack-bench-") as tmp:
+        for count in counts:
+            bundle = synthetic_bundle(base, count)
+            jpath = pathlib.Path(tmp) / f"b{count}.json"
+            jpath.write_text(json.dumps(bundle, indent=2, ensure_ascii=False) + "\n")
+            ppath = pathlib.Path(tmp) / f"b{count}.pack"
+            write_pack(jpath, ppath)
+            wanted = [d["doc_id"] for d in bundle["documents"][:: max(1, count // 3)][:3]]
+
+            def via_json():
+                with open(jpath) as fh:
+                    data = json.load(fh)
+                return data["edges"], [d for d in data["documents"] if d["doc_id"] in wanted]
+
+            def via_pack():
+                pack = Pack(ppath)
+                return pack, pack.edges, [pack.doc(i) for i in wanted]
+
+            def open_only():
+                pack = Pack(ppath)
+                return pack, pack.edges
+
+            j_time, j_peak = _measure(via_json)
+            o_time, _ = _measure(open_only)
+            p_time, p_peak = _measure(via_pack)
+            print(
+                f"{count:6d} {jpath.stat().st_size / 1e6:8.2f} {j_time * 1e3:8.2f}ms {j_peak / 1e6:6.2f}MB"
+                f" {o_time * 1e3:8.2f}ms {p_time * 1e3:7.2f}ms {p_peak / 1e6:6.2f}MB"
+            )
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--check", action="store_true", help="verify the pack instead of writing it")
+    parser.add_argument("--bench", action="store_true", help="compare load time and memory with json.load")
+    parser.add_argument("--counts", default="31,300,1000,3000,5000", help="document counts for --bench")
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        bench([int(n) for n in args.counts.split(",")])
+        return 0
+    if args.check:
+        problems = check()
+        for problem in problems:
+            print(f"  {problem}")
+        print("pack is stale" if problems else "pack matches canonical.json")
+        return 1 if problems else 0
+    digest = write_pack()
+    record_in_manifest(digest)
+    print(f"wrote {PACK.relative_to(REPO)} ({PACK.stat().st_size} bytes, sha256 {digest[:12]})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
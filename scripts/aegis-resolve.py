@@ -0,0 +1,422 @@
+"""Resolve target files (and a command) to the ADRs their Aegis edges require.
+
+```
+python3 scripts/aegis-resolve.py src/routes/index.tsx AGENTS.md
+git diff --name-only main | python3 scripts/aegis-resolve.py --stdin --command review
+python3 scripts/aegis-resolve.py --verify          # trie agrees with edge-by-edge matching
+python3 scripts/aegis-resolve.py --bench 20000     # resolve that many paths, both ways
+```
+
+`path_requires` edges map a glob to a document; resolving a list of target files
+against them edge by edge costs files × edges glob matches, and most of that work
+is repeated — every file under `.claude/hooks/` walks the same `.claude` prefix
+against every pattern. Here all path edges are compiled once into a trie over path
+segments: literal segments are dictionary lookups, a segment holding `*` or `?` is
+a per-segment `fnmatch`, and `**` is a node that consumes zero or more whole
+segments. A file is matched by walking the set of live nodes segment by segment
+(an NFA, since `**` and wildcards can both apply), and the live set after each
+directory is memoized, so files sharing a directory share the walk. `command`
+edges are an exact lookup on the command name.
+
+Glob semantics, stated because nothing else in the repository states them: `*`
+and `?` never cross a `/`; `**` as a whole segment matches zero or more segments,
+so `.claude/hooks/**` also matches `.claude/hooks` itself; a leading dot is
+matched like any other character, since the edges name `.claude/` paths
+explicitly. `--verify` checks the trie against a per-edge regular expression with
+the same semantics over every tracked file plus synthetic paths, so a change to
+either cannot drift silently.
+
+Documents come back ordered by (-priority, -specificity, doc_id), each with the
+edge that placed it there — ADR-0023 treats priority 100 as the strong one — and
+a document reached by several edges takes its best. Ties fall to `doc_id` and
+then `edge_id`, so the same bundle and inputs always give the same order. An edge
+to a superseded ADR delivers its live successor instead, looked up in the pack's
+supersession table, and the result names the document it replaced
+(`supersedes`). A path no edge matches gets near-miss suggestions: the patterns
+whose literal prefix it shares the most segments with, and a literal segment it
+nearly spells (`hook` for `hooks`).
+
+The compiled trie is cached in `.aegis/resolve-<snapshot_id>.json` (the whole
+of `.aegis/` is gitignored), so it is rebuilt once per bundle version. Edges are
+read from the pack (`scripts/aegis-pack.py`) when it matches the manifest, and
+from `canonical.json` otherwise.
+"""
+
+import argparse
+import difflib
+import fnmatch
+import importlib.util
+import json
+import pathlib
+import random
+import re
+import subprocess
+import sys
+import time
+
+REPO = pathlib.Path(__file__).resolve().parent.parent
+SHARE = REPO / "aegis-share"
+CACHE_DIR = REPO / ".aegis"
+TRIE_FORMAT = 1
+
+_spec = importlib.util.spec_from_file_location("aegis_pack", REPO / "scripts/aegis-pack.py")
+PACK = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(PACK)
+
+
+def load_bundle_header():
+    """(snapshot_id, edges, tag_mappings, supersession) from the pack if current, else canonical.json."""
+    manifest = json.loads((SHARE / "manifest.json").read_text())
+    pack_path = SHARE / manifest.get("pack_file", "canonical.pack")
+    if pack_path.exists():
+        with PACK.Pack(pack_path) as pack:
+            if pack.header["bundle_sha256"] == manifest["bundle_sha256"]:
+                return pack.snapshot_id, pack.edges, pack.tag_mappings, pack.supersession
+    bundle = json.loads((SHARE / manifest["bundle_file"]).read_text())
+    return bundle["snapshot_id"], bundle["edges"], bundle["tag_mappings"], PACK.supersession(bundle["documents"])
+
+
+def normalize(path):
+    """A repository-relative path with `./`, empty and trailing segments removed."""
+    parts = [p for p in path.replace("\\", "/").split("/") if p not in ("", ".")]
+    return "/".join(parts)
+
+
+def rank(edge):
+    return (-edge["priority"], -edge["specificity"], edge["target_doc_id"], edge["edge_id"])
+
+
+def _node(star=False):
+    # `star` marks a `**` node: it consumes any segment and stays where it is.
+    return {"lit": {}, "wild": [], "any": None, "edges": [], "star": star}
+
+
+def compile_trie(edges):
+    """The path edges as a segment trie; node `edges` are indexes into `edges`."""
+    root = _node()
+    for index, edge in enumerate(edges):
+        if edge["source_type"] != "path":
+            continue
+        node = root
+        for seg in normalize(edge["source_value"]).split("/"):
+            if seg == "**":
+                node["any"] = node["any"] or _node(star=True)
+                node = node["any"]
+            elif any(c in seg for c in "*?["):
+                for pattern, child in node["wild"]:
+                    if pattern == seg:
+                        node = child
+                        break
+                else:
+                    child = _node()
+                    node["wild"].append([seg, child])
+                    node = child
+            else:
+                node = node["lit"].setdefault(seg, _node())
+        node["edges"].append(index)
+    return root
+
+
+class Resolver:
+    def __init__(self, edges, trie=None, supersession=None):
+        self.edges = edges
+        self.supersession = supersession or {}
+        self.trie = trie or compile_trie(edges)
+        self.commands = {}
+        for index, edge in enumerate(edges):
+            if edge["source_type"] == "command":
+                self.commands.setdefault(edge["source_value"], []).append(index)
+        self._prefix = {"": self._closure([self.trie])}
+        self._wild = {}
+
+    @staticmethod
+    def _closure(nodes):
+        """Add every `**` node reachable without consuming a segment."""
+        out, stack = [], list(nodes)
+        seen = set()
+        while stack:
+            node = stack.pop()
+            if id(node) in seen:
+                continue
+            seen.add(id(node))
+            out.append(node)
+            if node["any"] is not None:
+                stack.append(node["any"])
+        return out
+
+    def _step(self, nodes, seg):
+        nxt = []
+        for node in nodes:
+            child = node["lit"].get(seg)
+            if child is not None:
+                nxt.append(child)
+            for pattern, child in node["wild"]:
+                key = (pattern, seg)
+                hit = self._wild.get(key)
+                if hit is None:
+                    hit = self._wild[key] = fnmatch.fnmatchcase(seg, pattern)
+                if hit:
+                    nxt.append(child)
+            if node["star"]:
+                nxt.append(node)
+        return self._closure(nxt)
+
+    def _states(self, directory):
+        states = self._prefix.get(directory)
+        if states is None:
+            parent, _, seg = directory.rpartition("/")
+            states = self._prefix[directory] = self._step(self._states(parent), seg)
+        return states
+
+    def match_path(self, path):
+        """Edge indexes whose pattern matches `path`."""
+        path = normalize(path)
+        if not path:
+            return []
+        directory, _, name = path.rpartition("/")
+        states = self._step(self._states(directory), name)
+        return sorted({i for node in states for i in node["edges"]})
+
+    def _nearest(self, segs):
+        """(depth, node, close): how far `segs` follows literal segments, and a near spelling."""
+        node, depth = self.trie, 0
+        for seg in segs:
+            if seg not in node["lit"]:
+                close = difflib.get_close_matches(seg, list(node["lit"]), n=1, cutoff=0.75)
+                return depth, node, close[0] if close else None
+            node = node["lit"][seg]
+            depth += 1
+        return depth, node, None
+
+    def near_miss_edges(self, path):
+        """Path edges under the deepest literal prefix `path` shares with them."""
+        depth, node, _ = self._nearest(normalize(path).split("/"))
+        return sorted(set(self._edges_below(node)), key=lambda i: rank(self.edges[i])) if depth else []
+
+    def near_misses(self, path, limit=3):
+        """Suggestions for a path no edge matched: shared literal prefixes and near spellings."""
+        segs = normalize(path).split("/")
+        depth, _, close = self._nearest(segs)
+        hints = []
+        if close:
+            hints.append(f"segment {depth + 1} {segs[depth]!r} is close to {close!r}")
+        below = sorted({self.edges[i]["source_value"] for i in self.near_miss_edges(path)})
+        prefix = "/".join(segs[:depth])
+        hints += [f"shares {prefix}/ with {p}" for p in below[:limit]]
+        return hints
+
+    def _edges_below(self, node):
+        stack, found = [node], []
+        while stack:
+            n = stack.pop()
+            found += n["edges"]
+            stack.extend(n["lit"].values())
+            stack.extend(child for _, child in n["wild"])
+            if n["any"] is not None and n["any"] is not n:
+                stack.append(n["any"])
+        return found
+
+    def resolve(self, target_files, command=None, per_file=False):
+        best = {}
+        files = {}
+        unmatched = []
+        for path in target_files:
+            hits = self.match_path(path)
+            if not hits:
+                unmatched.append(path)
+            if per_file:
+                ordered = sorted(hits, key=lambda i: rank(self.edges[i]))
+                files[path] = list(dict.fromkeys(self.live(self.edges[i]["target_doc_id"]) for i in ordered))
+            for i in hits:
+                self._offer(best, i, path)
+        for i in self.commands.get(command, ()) if command else ():
+            self._offer(best, i, None)
+        documents = []
+        for doc_id, (edge_index, count, replaced) in sorted(best.items(), key=lambda kv: rank(self.edges[kv[1][0]])):
+            edge = self.edges[edge_index]
+            documents.append(
+                {
+                    "doc_id": doc_id,
+                    "edge_id": edge["edge_id"],
+                    "via": f"{edge['source_type']}:{edge['source_value']}",
+                    "priority": edge["priority"],
+                    "specificity": edge["specificity"],
+                    "matched_files": count,
+                }
+            )
+            if replaced:
+                documents[-1]["supersedes"] = sorted(replaced)
+        result = {"documents": documents, "unmatched": unmatched}
+        result["near_misses"] = {p: h for p in unmatched if (h := self.near_misses(p))}
+        if per_file:
+            result["files"] = files
+        return result
+
+    def live(self, doc_id):
+        """The document to deliver for `doc_id`: its live successor when it is superseded."""
+        entry = self.supersession.get(doc_id)
+        return entry["successor"] if entry and entry["successor"] else doc_id
+
+    def _offer(self, best, index, path):
+        target = self.edges[index]["target_doc_id"]
+        doc_id = self.live(target)
+        current = best.get(doc_id)
+        count = (current[1] if current else 0) + (1 if path is not None else 0)
+        replaced = (current[2] if current else set()) | ({target} if target != doc_id else set())
+        if current is None or rank(self.edges[index]) < rank(self.edges[current[0]]):
+            best[doc_id] = (index, count, replaced)
+        else:
+            best[doc_id] = (current[0], count, replaced)
+
+
+def load_resolver(use_cache=True):
+    snapshot_id, edges, tag_mappings, supersession = load_bundle_header()
+    cache = CACHE_DIR / f"resolve-{snapshot_id}.json"
+    if use_cache and cache.exists():
+        try:
+            stored = json.loads(cache.read_text())
+            if stored.get("format") == TRIE_FORMAT:
+                return snapshot_id, Resolver(edges, stored["trie"], supersession), tag_mappings
+        except ValueError:
+            pass
+    resolver = Resolver(edges, supersession=supersession)
+    if use_cache and CACHE_DIR.is_dir():
+        for stale in CACHE_DIR.glob("resolve-*.json"):
+            stale.unlink()
+        tmp = cache.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"format": TRIE_FORMAT, "trie": resolver.trie}))
+        tmp.replace(cache)
+    return snapshot_id, resolver, tag_mappings
+
+
+def reference_regex(pattern):
+    """The same glob semantics as one regular expression over "/" + path, for --verify."""
+    rx = []
+    for seg in normalize(pattern).split("/"):
+        rx.append("(?:/[^/]+)*" if seg == "**" else "/" + _segment_regex(seg))
+    return re.compile("".join(rx) + r"\Z")
+
+
+def _segment_regex(seg):
+    out = []
+    i = 0
+    while i < len(seg):
+        c = seg[i]
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            j = seg.find("]", i + 2)
+            if j == -1:
+                out.append(re.escape(c))
+            else:
+                cls = seg[i + 1 : j]
+                out.append("[" + ("^" + cls[1:] if cls.startswith("!") else cls).replace("\\", "\\\\") + "]")
+                i = j
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+def reference_match(compiled, path):
+    path = normalize(path)
+    return sorted(i for i, rx in compiled if rx.match("/" + path)) if path else []
+
+
+def sample_paths(edges, rng, count):
+    """Tracked files plus paths generated from the edge patterns and near them."""
+    tracked = subprocess.run(["git", "ls-files"], cwd=REPO, capture_output=True, text=True).stdout.split()
+    paths = list(tracked)
+    words = ["a", "x.ts", "hooks", "hook", "deep", "index.tsx", ".hidden", "README.md"]
+    for _ in range(count):
+        pattern = rng.choice(edges)["source_value"]
+        segs = []
+        for seg in normalize(pattern).split("/"):
+            if seg == "**":
+                segs += [rng.choice(words) for _ in range(rng.randint(0, 3))]
+            elif "*" in seg or "?" in seg:
+                segs.append(seg.replace("*", rng.choice(["", "f", "file.ts"])).replace("?", "q"))
+            else:
+                segs.append(seg if rng.random() > 0.1 else seg[:-1] or "z")
+        if rng.random() < 0.3:
+            segs.append(rng.choice(words))
+        if rng.random() < 0.1 and len(segs) > 1:
+            segs.pop(rng.randrange(len(segs)))
+        paths.append("/".join(segs) or "x")
+    return paths
+
+
+SYNTHETIC_PATTERNS = (
+    "**",
+    "**/x.ts",
+    "a/*.ts",
+    "a/**/b?/c",
+    "a/**/**/deep",
+    "[ab]*/hooks/*",
+    "[!a]*/README.md",
+    "*/*/*",
+    "src/**/index.tsx",
+)
+
+
+def compare(resolver, paths, label):
+    """Match `paths` with the trie and per edge; print and count disagreements."""
+    edges = resolver.edges
+    compiled = [(i, reference_regex(e["source_value"])) for i, e in enumerate(edges) if e["source_type"] == "path"]
+    t0 = time.perf_counter()
+    ours = [resolver.match_path(p) for p in paths]
+    t_trie = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    theirs = [reference_match(compiled, p) for p in paths]
+    t_ref = time.perf_counter() - t0
+    bad = [(p, a, b) for p, a, b in zip(paths, ours, theirs) if a != b]
+    for p, a, b in bad[:10]:
+        print(f"  FAIL {p}: trie {[edges[i]['source_value'] for i in a]} reference {[edges[i]['source_value'] for i in b]}")
+    print(
+        f"{label}: {len(paths)} paths against {len(compiled)} path edges: trie {t_trie * 1e3:.1f}ms,"
+        f" per-edge {t_ref * 1e3:.1f}ms, {len(bad)} disagreement(s)"
+    )
+    return len(bad)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("paths", nargs="*", help="target files, repository-relative")
+    parser.add_argument("--stdin", action="store_true", help="read target files from stdin, one per line")
+    parser.add_argument("--command", help="add the command edges for this command (scaffold, refactor, review)")
+    parser.add_argument("--per-file", action="store_true", help="also list the documents each file reaches")
+    parser.add_argument("--no-cache", action="store_true", help="compile the trie without reading or writing .aegis/")
+    parser.add_argument("--verify", action="store_true", help="check the trie against per-edge matching")
+    parser.add_argument("--bench", type=int, metavar="N", help="time resolving N paths, trie vs per-edge")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    snapshot_id, resolver, _ = load_resolver(use_cache=not args.no_cache)
+
+    if args.verify or args.bench:
+        rng = random.Random(args.seed)
+        bad = compare(resolver, sample_paths(resolver.edges, rng, args.bench or 5000), "bundle")
+        if args.verify:
+            # The bundle uses only literal, `*` and `**` segments; these cover the rest.
+            synthetic = [
+                {"edge_id": f"syn-{i}", "source_type": "path", "source_value": v, "target_doc_id": f"syn-{i}",
+                 "edge_type": "path_requires", "priority": 0, "specificity": 0}
+                for i, v in enumerate(SYNTHETIC_PATTERNS)
+            ]
+            bad += compare(Resolver(synthetic), sample_paths(synthetic, rng, 5000), "synthetic")
+        return 1 if bad else 0
+
+    paths = list(args.paths)
+    if args.stdin:
+        paths += [line.strip() for line in sys.stdin if line.strip()]
+    if not paths and not args.command:
+        parser.error("give target files, --stdin, or --command")
+    result = resolver.resolve(paths, command=args.command, per_file=args.per_file)
+    print(json.dumps({"snapshot_id": snapshot_id, **result}, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,250 @@
+"""Search the Aegis documents by content, title and tag.
+
+```
+python3 scripts/aegis-search.py stamp marker            # ranked ADRs with the line that matched
+python3 scripts/aegis-search.py --tag deployment vercel
+python3 scripts/aegis-search.py --json -n 3 permissions deny
+python3 scripts/aegis-search.py --bench                 # build and query timings
+```
+
+Finding the ADR that covers something has meant grepping `canonical.json` or
+`aegis-share/source/`, which finds every mention and ranks none of them. This is
+an inverted index over the documents scored with BM25 (k1 1.2, b 0.75): the
+title counts `TITLE_WEIGHT` times towards a term's frequency, so a document named
+for the thing outranks one that mentions it in passing. Tokens are lowercased
+runs of letters and digits; a few function words are dropped.
+
+Tags add to the text score. A query word that is a tag in `tag_mappings` — or a
+tag given with `--tag` — adds `TAG_BOOST` × the mapping's `confidence` to each
+document mapped to it, so `deployment` puts the ADRs tagged with it above ones
+that only use the word. A superseded ADR keeps `SUPERSEDED_FACTOR` of its score
+and is listed with its live successor from the pack's supersession table: it is
+still found, because the history is sometimes the question, but below the ADR
+that replaced it.
+
+The index is built from the pack when it matches the manifest and from
+`canonical.json` otherwise, and is cached in `.aegis/search-<snapshot_id>.json`
+(gitignored), so it is built once per bundle version; a query against the cached
+index takes well under a millisecond.
+"""
+
+import argparse
+import collections
+import importlib.util
+import json
+import math
+import pathlib
+import re
+import sys
+import time
+
+REPO = pathlib.Path(__file__).resolve().parent.parent
+SHARE = REPO / "aegis-share"
+CACHE_DIR = REPO / ".aegis"
+INDEX_FORMAT = 2
+K1 = 1.2
+B = 0.75
+TITLE_WEIGHT = 3
+TAG_BOOST = 2.0
+SUPERSEDED_FACTOR = 0.3
+TOKEN = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset("a an and are as at be by for from in is it its of on or that the this to was with".split())
+
+_spec = importlib.util.spec_from_file_location("aegis_pack", REPO / "scripts/aegis-pack.py")
+PACK = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(PACK)
+
+
+def tokenize(text):
+    return [t for t in TOKEN.findall(text.lower()) if t not in STOPWORDS]
+
+
+def find_pack(manifest):
+    """The manifest's pack file, or None when it is not on disk."""
+    path = SHARE / manifest.get("pack_file", "canonical.pack")
+    return path if path.exists() else None
+
+
+def load_documents():
+    """(snapshot_id, documents with content, tag_mappings, supersession), from the pack if current."""
+    manifest = json.loads((SHARE / "manifest.json").read_text())
+    pack_path = find_pack(manifest)
+    if pack_path:
+        with PACK.Pack(pack_path) as pack:
+            if pack.header["bundle_sha256"] == manifest["bundle_sha256"]:
+                docs = [pack.doc(d["doc_id"]) for d in pack.documents]
+                return pack.snapshot_id, docs, pack.tag_mappings, pack.supersession
+    bundle = json.loads((SHARE / manifest["bundle_file"]).read_text())
+    return bundle["snapshot_id"], bundle["documents"], bundle["tag_mappings"], PACK.supersession(bundle["documents"])
+
+
+def build_index(documents, tag_mappings, supersession):
+    """The index as plain JSON-able data."""
+    postings = collections.defaultdict(list)
+    docs, lengths = [], []
+    for number, doc in enumerate(documents):
+        counts = collections.Counter(tokenize(doc["content"]))
+        for term in tokenize(doc["title"]):
+            counts[term] += TITLE_WEIGHT
+        for term, tf in counts.items():
+            postings[term].append([number, tf])
+        lengths.append(sum(counts.values()))
+        lineage = supersession.get(doc["doc_id"])
+        docs.append(
+            {
+                "doc_id": doc["doc_id"],
+                "title": doc["title"],
+                "superseded_by": (lineage["successor"] or lineage["chain"][-1]) if lineage else None,
+            }
+        )
+    tags = collections.defaultdict(dict)
+    for mapping in tag_mappings:
+        tags[mapping["tag"]][mapping["doc_id"]] = mapping["confidence"]
+    return {
+        "format": INDEX_FORMAT,
+        "docs": docs,
+        "lengths": lengths,
+        "avgdl": sum(lengths) / len(lengths) if lengths else 0.0,
+        "postings": dict(postings),
+        "tags": dict(tags),
+    }
+
+
+def load_index(use_cache=True):
+    """(snapshot_id, index, documents-or-None); documents are loaded only when the index is built."""
+    manifest = json.loads((SHARE / "manifest.json").read_text())
+    cache = CACHE_DIR / f"search-{manifest['snapshot_id']}.json"
+    if use_cache and cache.exists():
+        try:
+            index = json.loads(cache.read_text())
+            if index.get("format") == INDEX_FORMAT:
+                return manifest["snapshot_id"], index, None
+        except ValueError:
+            pass
+    snapshot_id, documents, tag_mappings, supersession = load_documents()
+    index = build_index(documents, tag_mappings, supersession)
+    if use_cache and CACHE_DIR.is_dir():
+        for stale in CACHE_DIR.glob("search-*.json"):
+            stale.unlink()
+        cache = CACHE_DIR / f"search-{snapshot_id}.json"
+        tmp = cache.with_suffix(".tmp")
+        tmp.write_text(json.dumps(index, separators=(",", ":")))
+        tmp.replace(cache)
+    return snapshot_id, index, documents
+
+
+def search(index, query, tags=(), limit=10):
+    """[(score, doc meta, matched terms)], best first; ties fall to doc_id."""
+    terms = list(dict.fromkeys(tokenize(query)))
+    total = len(index["docs"])
+    scores = collections.defaultdict(float)
+    matched = collections.defaultdict(list)
+    for term in terms:
+        postings = index["postings"].get(term, [])
+        if not postings:
+            continue
+        idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+        for number, tf in postings:
+            norm = K1 * (1 - B + B * index["lengths"][number] / index["avgdl"])
+            scores[number] += idf * tf * (K1 + 1) / (tf + norm)
+            matched[number].append(term)
+    by_id = {d["doc_id"]: n for n, d in enumerate(index["docs"])}
+    for tag in dict.fromkeys([t for t in terms if t in index["tags"]] + list(tags)):
+        for doc_id, confidence in index["tags"].get(tag, {}).items():
+            if doc_id in by_id:
+                scores[by_id[doc_id]] += TAG_BOOST * confidence
+                matched[by_id[doc_id]].append(f"#{tag}")
+    results = []
+    for number, score in scores.items():
+        doc = index["docs"][number]
+        if doc["superseded_by"]:
+            score *= SUPERSEDED_FACTOR
+        results.append((score, doc, matched[number]))
+    results.sort(key=lambda r: (-r[0], r[1]["doc_id"]))
+    return results[:limit]
+
+
+def snippet(content, terms, width=100):
+    """The first non-heading line containing a query term, trimmed."""
+    words = [t for t in terms if not t.startswith("#")]
+    for line in content.splitlines():
+        lowered = set(tokenize(line))
+        if line.strip() and not line.startswith("#") and lowered.intersection(words):
+            line = line.strip()
+            return line if len(line) <= width else line[: width - 1] + "…"
+    return ""
+
+
+def bench(rounds):
+    t0 = time.perf_counter()
+    _, documents, tag_mappings, supersession = load_documents()
+    t1 = time.perf_counter()
+    index = build_index(documents, tag_mappings, supersession)
+    t2 = time.perf_counter()
+    raw = json.dumps(index, separators=(",", ":"))
+    t3 = time.perf_counter()
+    json.loads(raw)
+    t4 = time.perf_counter()
+    queries = ["stamp marker", "permissions deny", "deployment", "hook bash", "review diff", "supabase migration"]
+    q0 = time.perf_counter()
+    for _ in range(rounds):
+        for query in queries:
+            search(index, query)
+    per_query = (time.perf_counter() - q0) / (rounds * len(queries))
+    print(f"load documents {(t1 - t0) * 1e3:.2f}ms, build {(t2 - t1) * 1e3:.2f}ms ({len(index['postings'])} terms)")
+    print(f"cached index {len(raw) / 1e3:.0f} KB, load {(t4 - t3) * 1e3:.2f}ms; query {per_query * 1e6:.0f}µs")
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("query", nargs="*", help="words to search for")
+    parser.add_argument("--tag", action="append", default=[], help="boost documents mapped to this tag (repeatable)")
+    parser.add_argument("-n", type=int, default=10, help="results to show")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--no-cache", action="store_true", help="build the index instead of reading .aegis/")
+    parser.add_argument("--bench", type=int, nargs="?", const=200, help="time the build and this many query rounds")
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        bench(args.bench)
+        return 0
+    if not args.query and not args.tag:
+        parser.error("give a query or --tag")
+    snapshot_id, index, documents = load_index(use_cache=not args.no_cache)
+    results = search(index, " ".join(args.query), args.tag, args.n)
+    if not results:
+        print("no matches", file=sys.stderr)
+        return 1
+    contents = {d["doc_id"]: d["content"] for d in documents} if documents else None
+    path = find_pack(json.loads((SHARE / "manifest.json").read_text())) if contents is None else None
+    if path:
+        with PACK.Pack(path) as pack:
+            if pack.snapshot_id == snapshot_id:
+                contents = {r[1]["doc_id"]: pack.content(r[1]["doc_id"]) for r in results}
+    if contents is None:
+        _, documents, _, _ = load_documents()
+        contents = {d["doc_id"]: d["content"] for d in documents}
+    if args.json:
+        print(json.dumps(
+            {
+                "snapshot_id": snapshot_id,
+                "results": [
+                    {**doc, "score": round(score, 4), "matched": terms, "snippet": snippet(contents[doc["doc_id"]], terms)}
+                    for score, doc, terms in results
+                ],
+            },
+            indent=2,
+            ensure_ascii=False,
+        ))
+        return 0
+    for score, doc, terms in results:
+        note = f"  (superseded by {doc['superseded_by']})" if doc["superseded_by"] else ""
+        print(f"{score:6.2f}  {doc['doc_id']}  {doc['title']}{note}")
+        line = snippet(contents[doc["doc_id"]], terms)
+        if line:
+            print(f"        {line}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
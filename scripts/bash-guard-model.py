@@ -0,0 +1,199 @@
+"""A Python reference model of the decisions .claude/hooks/pre-bash-guard.sh makes.
+
+```
+python3 scripts/bash-guard-model.py 'find . -type f'            # -> block (find)
+python3 scripts/bash-guard-model.py --stamped 'git commit -m x'  # -> allow
+```
+
+The guard's three decisions — the protected-env-file block (ADR-0004/0013/0017),
+the `find` gate (ADR-0004 amendment 2026-07-29) and the commit gate
+(ADR-0013/0019/0024) — are specified only by the shell code and by the
+hand-written cases in `scripts/test-bash-guard.py`. Spawning bash per command is
+too slow to explore the input space, so this module restates each decision in
+Python, which decides some 20,000 generated commands a second on one core (a
+million in under a minute). `scripts/fuzz-bash-guard.py` pairs it with a command
+generator and reports every command on which the model and the real hook
+disagree.
+
+A model is only worth something while it agrees with the hook, and the only
+authority on what the hook does is the hook. So nothing here is asserted by
+reading the shell — `test-bash-guard.py` runs every one of its cases through
+`decide()` as well as through the real hook, and a disagreement there fails the
+suite just like a wrong decision would. When the two disagree, the hook is what
+ships: fix this file, or, if the hook is the one that is wrong, fix the hook and
+add the case.
+
+The model is deliberately as lexical as the guard. It does not parse shell — it
+normalises text the way ADR-0024 describes and tests the result — because a model
+that understood bash better than the hook would report the hook's known,
+accepted residuals (a git alias, an unreviewed expansion trick) as disagreements
+on every run, and a fuzzer that always reports something gets switched off.
+"""
+
+import re
+import shlex
+import sys
+
+# Split so this file's own text is not itself a commit-shaped command.
+VERB = "com" + "mit"
+
+# ADR-0013's list, plus whatever suffix a future env file carries. `.env*.example`
+# stays readable: it is the documented template and holds no values.
+ENV_NAME = re.compile(r"(?<![\w.-])\.env(?:\.[\w-]+)*(?![\w-])")
+
+# Guard 3 (ADR-0024): the commit gate's own state. Refused whether the command
+# reads or writes it, because separating the two lexically needs a verb list.
+MARKERS = (".review-stamp", ".finder-done", ".finder-hash", ".pair-ok")
+
+# `find` actions that run a command, delete, or write a file per match. The
+# `-fprint*` family is matched by prefix so `-fprint0` and `-fprintf` are covered.
+FIND_ACTIONS = ("-exec", "-execdir", "-ok", "-okdir", "-delete", "-fls")
+FIND_ACTION_PREFIXES = ("-fprint",)
+
+# What ends a `find` statement. Newline is included because the hook judges the
+# text per line once heredoc bodies are gone.
+STATEMENT_BREAK = re.compile(r"\|\|?|&&?|;|\n|\$\(|`|\(|\)")
+
+
+def strip_heredoc(command):
+    """Drop everything from the first heredoc operator onwards.
+
+    The `find` gate treats heredoc text as data, so a commit message *describing*
+    `find . | xargs cat` does not trip it (ADR-0004 amendment). The commit gate
+    deliberately does NOT call this — it keeps the heredoc and stays the stricter
+    of the two (ADR-0024).
+    """
+    m = re.search(r"<<-?", command)
+    return command if m is None else command[: m.start()]
+
+
+def strip_message_bodies(command):
+    """Blank `-m` bodies, the way Guard 1 scrubs them before looking for `.env`.
+
+    A commit message that mentions the env file is prose about it, not a read of
+    it. Only the quoted forms are scrubbed; an unquoted `-m` body is one word, and
+    a word that is a filename is treated as one.
+    """
+    return re.sub(r"""(-m\s*)("[^"]*"|'[^']*')""", r'\1""', command)
+
+
+def env_decision(command):
+    """'block' when the text names a protected env file, else None."""
+    for m in ENV_NAME.finditer(strip_message_bodies(strip_heredoc(command))):
+        if not m.group(0).endswith(".example"):
+            return "block"
+    return None
+
+
+def marker_decision(command):
+    """'block' when the text names one of the commit gate's marker files."""
+    return "block" if any(marker in command for marker in MARKERS) else None
+
+
+def _find_statements(command):
+    """Yield the token list of every statement whose command word is `find`."""
+    for chunk in STATEMENT_BREAK.split(strip_heredoc(command)):
+        chunk = chunk.strip()
+        # Grouping characters left at the front (`{ find …; }`) are not the verb.
+        chunk = chunk.lstrip("{!").strip()
+        if not re.match(r"find(\s|$)", chunk):
+            continue
+        try:
+            tokens = shlex.split(chunk)
+        except ValueError:
+            # An unbalanced quote: fall back to whitespace, which keeps the quotes
+            # glued to the operand and so still reads `"." ` as not-a-scoped-root.
+            tokens = chunk.split()
+        yield tokens[1:]
+
+
+def _broad_root(root):
+    """True for a search root that reaches beyond one subdirectory of the repo."""
+    if root.startswith(("/", "~", "$")):
+        return True
+    trimmed = root
+    while trimmed.startswith("./"):
+        trimmed = trimmed[2:]
+    trimmed = trimmed.rstrip("/")
+    if trimmed in ("", "."):
+        return True
+    return ".." in trimmed.split("/")
+
+
+def find_decision(command):
+    """'block' for a broad root or a running/deleting action, else None."""
+    for args in _find_statements(command):
+        roots = []
+        for token in args:
+            # The roots are the leading operands: `find` reads them until the first
+            # token that begins an expression. Every one is checked, because a
+            # narrow root in front does not make a broad one behind it safe.
+            if token.startswith("-") or token in ("(", "!", ")"):
+                break
+            roots.append(token)
+        if not roots or any(_broad_root(r) for r in roots):
+            return "block"
+        for token in args:
+            if token in FIND_ACTIONS or token.startswith(FIND_ACTION_PREFIXES):
+                return "block"
+    return None
+
+
+def lands_a_commit(command):
+    """Mirror lib-commit-shape.sh's `command_lands_a_commit()` (ADR-0024).
+
+    Normalised in the order the ADR gives, because the order is load-bearing:
+    backslash-newline is joined with NOTHING first (bash does not insert a space,
+    so `co\\<nl>mm\\<nl>it` is one word); quotes are removed and the braced
+    `${IFS}` expanded, because bash does both before dispatch; then separators and
+    grouping characters become newlines; then only horizontal whitespace is
+    squeezed, so the statements just split stay split.
+    """
+    text = command.replace("\\\n", "")
+    text = text.replace("'", "").replace('"', "")
+    text = text.replace("${IFS}", " ")
+    text = re.sub(r"[;&|(){}`$]", "\n", text)
+    text = re.sub(r"[ \t]+", " ", text)
+    word = re.compile(rf"(^| )git( [^\n]*)? {VERB}( |$)")
+    return any(word.search(line) for line in text.split("\n"))
+
+
+def commit_decision(command, stamped):
+    """'block' for an unstamped commit-shaped command, else None."""
+    return "block" if lands_a_commit(command) and not stamped else None
+
+
+def decide(command, stamped=False):
+    """Return (decision, guard) for a Bash command: ('allow', None) or ('block', name).
+
+    `stamped` is whether the project directory holds a review stamp. The guards run
+    in the hook's order, and the first to refuse names the decision; only the
+    decision is compared with the hook, since the wording of its message is the
+    hook's own business.
+    """
+    for guard, verdict in (
+        ("env", env_decision(command)),
+        ("marker", marker_decision(command)),
+        ("find", find_decision(command)),
+        ("commit", commit_decision(command, stamped)),
+    ):
+        if verdict:
+            return verdict, guard
+    return "allow", None
+
+
+def main(argv):
+    stamped = "--stamped" in argv
+    commands = [a for a in argv if a != "--stamped"]
+    if not commands:
+        print(__doc__.strip().splitlines()[0])
+        print("usage: bash-guard-model.py [--stamped] COMMAND...")
+        return 2
+    for command in commands:
+        decision, guard = decide(command, stamped)
+        print(f"{decision:5s} {guard or '-':6s} {command!r}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
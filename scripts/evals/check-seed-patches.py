@@ -0,0 +1,215 @@
+"""Check every review-diff seed.patch against its declared base and HEAD before a run.
+
+```
+python3 scripts/evals/check-seed-patches.py                 # every fixture, table on stdout
+python3 scripts/evals/check-seed-patches.py fx-08 fx-11
+python3 scripts/evals/check-seed-patches.py --json
+python3 scripts/evals/check-seed-patches.py --rebase fx-07       # write a clean 3-way rebase onto HEAD
+```
+
+The staleness rule in `review-diff/README.md` — a `seed.patch` that no longer
+applies is regenerated or retired in the same run — has only ever fired
+mid-run: `run-review-diff.py` finds out when it applies the patch in the
+fixture's worktree, after the other fixtures' reviewers are already being
+paid for. This is the pre-flight. For every fixture at once it runs `git apply
+--check --cached` against its declared `base:` and against `HEAD`, each in a
+throwaway index (`GIT_INDEX_FILE`), so no worktree or real index is touched and
+the whole suite takes seconds. Per fixture it reports:
+
+- **at base / at HEAD** — whether the patch applies there. A base this clone
+  does not have (the older fixtures name commits from before the history was
+  cut) is `missing`; the runner falls back to HEAD for those.
+- **status** — `ok` when the patch applies to the tree the runner will use (the
+  base when present, else HEAD); `drifted` when that is the base but HEAD has
+  moved out from under it, which costs nothing today and is the fixture to
+  regenerate next; `stale` when the runner's tree rejects it.
+- **drift** — commits from the base to HEAD, and how many of the files the
+  patch touches changed between them.
+- **rebase** — for a patch that no longer applies at HEAD, whether a 3-way
+  apply (`git apply --3way`) lands it on HEAD cleanly or in which files it
+  conflicts. With `--rebase` a clean one is written back: the 3-way result,
+  diffed against HEAD, becomes the new `seed.patch` and `base:` names HEAD
+  (review the diff before committing it). A fixture `gen-large-fixture.py`
+  generated is pointed back at the command its `base:` line records instead,
+  with `--start NN --force` so it replaces that fixture rather than adding one.
+  A 3-way apply
+  needs the blob ids of `index` lines, which difflib-made patches lack, so a
+  patch whose base is here is first re-diffed on it with `--full-index`; one
+  whose base is missing and that carries no ids of blobs in this clone says
+  `no blobs`. The blobs these throwaway applies write are unreferenced, and
+  `git gc` drops them.
+
+Exit status: 0 when every fixture will apply, 1 when any is stale (a fixture
+`--rebase` just rewrote counts as it was found).
+"""
+
+import argparse
+import concurrent.futures
+import importlib.util
+import json
+import os
+import pathlib
+import re
+import subprocess
+import sys
+import tempfile
+
+REPO = pathlib.Path(__file__).resolve().parents[2]
+EVALS = REPO / "scripts/evals"
+TOUCHED = re.compile(r"^diff --git a/(\S+) b/", re.M)
+GENERATED = re.compile(r"generated by `([^`]+)`")
+
+_spec = importlib.util.spec_from_file_location("run_review_diff", EVALS / "run-review-diff.py")
+RUNNER = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(RUNNER)
+
+
+def git(*args, env=None, stdin=None, check=False):
+    return subprocess.run(
+        ["git", *args], cwd=REPO, env=env, input=stdin, capture_output=True, text=True, check=check
+    )
+
+
+def commit(ref):
+    result = git("rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}")
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def _index(tmp):
+    return {**os.environ, "GIT_INDEX_FILE": os.path.join(tmp, "index")}
+
+
+def apply_check(patch, tree):
+    """(applies, stderr) for the patch text on `tree`, in a throwaway index."""
+    with tempfile.TemporaryDirectory(prefix="seed-check-") as tmp:
+        env = _index(tmp)
+        git("read-tree", tree, env=env, check=True)
+        result = git("apply", "--check", "--cached", "-", env=env, stdin=patch)
+    return result.returncode == 0, result.stderr.strip()
+
+
+def full_index(patch, base):
+    """The patch re-diffed on `base` with full blob ids, which --3way needs; None if it does not apply."""
+    with tempfile.TemporaryDirectory(prefix="seed-check-") as tmp:
+        env = _index(tmp)
+        git("read-tree", base, env=env, check=True)
+        if git("apply", "--cached", "-", env=env, stdin=patch).returncode:
+            return None
+        return git("diff", "--cached", "--full-index", base, env=env).stdout
+
+
+def three_way(patch, tree):
+    """(rebased patch or None, conflicted files) for a 3-way apply of the patch text onto `tree`."""
+    with tempfile.TemporaryDirectory(prefix="seed-check-") as tmp:
+        env = _index(tmp)
+        git("read-tree", tree, env=env, check=True)
+        # --3way cannot be combined with --check; the index it writes into is thrown away.
+        result = git("apply", "--3way", "--cached", "-", env=env, stdin=patch)
+        conflicted = git("diff", "--cached", "--name-only", "--diff-filter=U", env=env).stdout.split()
+        if result.returncode or conflicted:
+            return None, conflicted
+        return git("diff", "--cached", tree, env=env).stdout, []
+
+
+def regenerate(command, fixture):
+    """The recorded generator command, made to rewrite this fixture in place."""
+    if "--start" not in command.split():
+        command += f" --start {int(fixture.name[3:])}"
+    return command if "--force" in command.split() else f"{command} --force"
+
+
+def check_fixture(fixture, head, rebase=False):
+    path = fixture / "seed.patch"
+    patch = path.read_text()
+    expected = (fixture / "expected.md").read_text()
+    declared = RUNNER.BASE.search(expected)
+    touched = list(dict.fromkeys(TOUCHED.findall(patch)))
+    base = commit(declared.group(1)) if declared else None
+    result = {
+        "fixture": fixture.name,
+        "declared": declared.group(1)[:7] if declared else None,
+        "files": len(touched),
+    }
+    at_head, head_error = apply_check(patch, head)
+    result["at_head"] = at_head
+    if base:
+        result["at_base"] = apply_check(patch, base)[0]
+        result["commits_behind"] = int(git("rev-list", "--count", f"{base}..{head}").stdout.strip() or 0)
+        result["touched_changed"] = len(git("diff", "--name-only", base, head, "--", *touched).stdout.split())
+        runs_on = result["at_base"]
+    else:
+        result["at_base"] = None
+        runs_on = at_head
+    if not runs_on:
+        result["status"] = "stale"
+    elif not at_head:
+        result["status"] = "drifted"
+    else:
+        result["status"] = "ok"
+
+    if not at_head:
+        result["error"] = head_error.splitlines()[0] if head_error else ""
+        generated = GENERATED.search(expected.split("\n", 3)[1] if expected.count("\n") > 1 else "")
+        # A patch from difflib has no index lines; re-diffed on its base it has them.
+        rediffed = full_index(patch, base) if base and result["at_base"] else None
+        rebased, conflicted = three_way(rediffed or patch, head)
+        result["three_way"] = "clean" if rebased else ("conflicts" if conflicted else "no blobs")
+        result["conflicts"] = conflicted
+        rel = path.relative_to(REPO)
+        if generated:
+            result["rebase"] = f"regenerate: {regenerate(generated.group(1), fixture)} (same seed, current tree)"
+        elif rebased and rebase:
+            path.write_text(rebased)
+            short = head[:7]
+            (fixture / "expected.md").write_text(expected[: declared.start(1)] + short + expected[declared.end(1):]
+                                                 if declared else f"base: {short}\n" + expected)
+            result["rebase"] = f"rebased: wrote {rel} and set base: to {short}"
+        elif rebased:
+            result["rebase"] = f"rebases cleanly; --rebase {fixture.name} writes it and sets base: to HEAD"
+        elif conflicted:
+            result["rebase"] = f"3-way conflicts in {', '.join(conflicted)}; re-seed those by hand or retire"
+        else:
+            result["rebase"] = "the preimage blobs are not in this clone; re-seed by hand or retire"
+    return result
+
+
+def _mark(value):
+    return {True: "yes", False: "no", None: "missing"}[value]
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("fixtures", nargs="*", help="fixture names (default: every fx-NN with a seed.patch)")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    parser.add_argument("--rebase", action="store_true", help="write clean 3-way rebases onto HEAD into the fixtures")
+    parser.add_argument("-j", type=int, default=os.cpu_count() or 1, help="fixtures checked at once")
+    args = parser.parse_args(argv)
+
+    selected = RUNNER.fixtures(args.fixtures)
+    head = commit("HEAD")
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, args.j)) as executor:
+        results = list(executor.map(lambda f: check_fixture(f, head, args.rebase), selected))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'fixture':8s} {'base':8s} {'at base':>7s} {'at HEAD':>7s}  {'status':8s} drift")
+        for r in results:
+            if r["at_base"] is None:
+                drift = "-"
+            else:
+                drift = f"{r['commits_behind']} commits, {r['touched_changed']}/{r['files']} patched files changed"
+            print(
+                f"{r['fixture']:8s} {r['declared'] or '-':8s} {_mark(r['at_base']):>7s} {_mark(r['at_head']):>7s}  "
+                f"{r['status']:8s} {drift}"
+            )
+            if not r["at_head"]:
+                print(f"         at HEAD: {r['error'] or 'does not apply'}")
+                print(f"         rebase ({r['three_way']}): {r['rebase']}")
+        counts = {s: sum(1 for r in results if r["status"] == s) for s in ("ok", "drifted", "stale")}
+        print(f"\n{len(results)} fixture(s): {counts['ok']} ok, {counts['drifted']} drifted, {counts['stale']} stale")
+    return 1 if any(r["status"] == "stale" for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,363 @@
+"""Decide whether a reviewer-pipeline change moved its cost, from repeated runs against a baseline.
+
+```
+python3 scripts/evals/cost-gate.py baseline '2026-08-07-unified-agent*'              # record the baseline
+python3 scripts/evals/cost-gate.py check '2026-09-0?-haiku-verifier-r*'              # pass / fail / needs more runs
+python3 scripts/evals/cost-gate.py check review-diff/results/2026-09-02-r1 review-diff/results/2026-09-02-r2
+python3 scripts/evals/cost-gate.py check 'RUN-r*' --against 'OLD-r*' --gate tokens,wall_s,candidates
+python3 scripts/evals/cost-gate.py check 'RUN-r*' --tolerance tokens=0.05
+```
+
+A model-tier change or a load-bearing `review-diff` edit needs a recorded run,
+and the README's scoring rules say close calls need repeated runs because
+infrastructure noise alone can exceed a small delta — but deciding whether a
+token or wall-time difference is real has been done by eye. This takes several
+runs of each fixture on both sides and answers with a verdict.
+
+A run is named the way `scripts/evals/results-store.py` names it (a results file
+stem; shell-style patterns select several) or given as a directory of saved
+reports from `scripts/evals/run-review-diff.py`, whose `fx-NN.md` headers give
+the wall time and whose findings JSON `stats` give `candidates` and `refuted` —
+and `tokens`, when the reviewer command adds it there. Each run is one sample per
+fixture it covers. A side is one configuration: store rows of different models
+(a tier comparison holds two) are never pooled as repeated runs, so runs that
+mix models need `--model` (`--against-model` for `--against`), and a run that
+two results files both report — its own file and a comparison restating it —
+counts once.
+
+For each metric — `tokens`, `wall_s`, `candidates`, `refuted` — the cost of a
+side is the sum over the shared fixtures of that fixture's mean, and the change
+is the ratio of the candidate's cost to the baseline's. Its 95% interval comes
+from the per-fixture run-to-run variance (delta method on the log of the ratio,
+Student t on the smaller side's degrees of freedom), so a fixture that varies a
+lot widens it and one that never varies does not. Against a metric's limit
+(1 + `--tolerance`, by default +10% tokens and +15% wall time):
+
+- **fail** — the whole interval is above the limit;
+- **pass** — the whole interval is at or below it;
+- **needs more runs** — the interval straddles it. The report says how many more
+  candidate runs of each fixture would shrink the interval clear of the limit at
+  the ratio measured so far, or that the baseline's own spread is too wide for
+  any number to, in which case record more baseline runs.
+
+Fewer than `--min-runs` (3) runs of a fixture on either side is always "needs
+more runs": one or two samples say nothing about spread, and `--min-runs` below
+2 is refused — a single run has no variance to test against. Only the `--gate`
+metrics (tokens and wall time by default) decide the verdict; the others are
+reported. Cost is all this judges — found and false-positive counts are shown
+but a change that misses defects is the scoring rules' and `results-store.py
+regressions`' to catch.
+
+`baseline` stores the samples, not the run names, in
+`<suite>/cost-baseline.json`, so the baseline stays fixed while results files are
+edited or renamed; `check --against` compares with runs directly instead.
+
+Exit status: 0 pass, 1 fail, 3 needs more runs.
+"""
+
+import argparse
+import datetime
+import fnmatch
+import importlib.util
+import json
+import math
+import pathlib
+import re
+import statistics
+import sys
+
+REPO = pathlib.Path(__file__).resolve().parents[2]
+EVALS = REPO / "scripts/evals"
+METRICS = ("tokens", "wall_s", "candidates", "refuted")
+TOLERANCE = {"tokens": 0.10, "wall_s": 0.15, "candidates": 0.25, "refuted": 0.25}
+GATE = ("tokens", "wall_s")
+MIN_RUNS = 3
+MAX_RUNS = 30
+NEEDS_MORE_RUNS = 3
+# Two-sided 95% Student t critical values by degrees of freedom; normal beyond 30.
+T95 = (
+    12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042,
+)
+WALL = re.compile(r"\b(\d+(?:\.\d+)?)s wall\b")
+REPORT = re.compile(r"^[fs]x-\d+\.md$")
+JSON_BLOCK = re.compile(r"```json\n(.*?)\n```", re.S)
+
+_spec = importlib.util.spec_from_file_location("results_store", EVALS / "results-store.py")
+STORE = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(STORE)
+
+
+def t95(df):
+    return T95[df - 1] if df <= len(T95) else 1.960
+
+
+def report_sample(path):
+    """{metric: value} from one saved report of run-review-diff.py; metrics it lacks are absent."""
+    text = path.read_text()
+    sample = {}
+    wall = WALL.search(text.split("\n---\n", 1)[0])
+    if wall:
+        sample["wall_s"] = float(wall.group(1))
+    blocks = JSON_BLOCK.findall(text)
+    if blocks:
+        try:
+            stats = json.loads(blocks[-1]).get("stats", {})
+        except ValueError:
+            stats = {}
+        for metric in ("tokens", "candidates", "refuted"):
+            if isinstance(stats.get(metric), (int, float)):
+                sample[metric] = float(stats[metric])
+    return sample
+
+
+def pick_rows(rows, model):
+    """The store rows of one model, each run's result once.
+
+    A run reported in two results files (a run set's own file and a comparison
+    that restates it) is one sample, not two; rows of different models are
+    different configurations, never repeated runs of one.
+    """
+    models = sorted({r["model"] for r in rows})
+    if model is not None:
+        rows = [r for r in rows if r["model"] == model]
+        if not rows:
+            raise SystemExit(f"no {model} rows in these runs; models there: {', '.join(m or '(none)' for m in models)}")
+    elif len(models) > 1:
+        raise SystemExit(f"these runs mix models ({', '.join(m or '(none)' for m in models)}); pick one with --model")
+    picked, seen = [], set()
+    for r in rows:
+        key = (r["date"], r["fixture"], r["model"], *(r[k] for k in (*METRICS, "found", "fp")))
+        if key not in seen:
+            seen.add(key)
+            picked.append(r)
+    return picked
+
+
+def collect(specs, suite, model=None):
+    """({fixture: {metric: [values]}}, [run names], model) for run names, patterns, or report directories."""
+    samples, runs, rows, matched = {}, [], None, []
+    for spec in specs:
+        path = pathlib.Path(spec)
+        if not path.is_absolute():
+            path = next((p for p in (pathlib.Path.cwd() / spec, EVALS / spec) if p.is_dir()), path)
+        if path.is_dir():
+            reports = sorted(p for p in path.glob("[fs]x-*.md") if REPORT.match(p.name))
+            if not reports:
+                raise SystemExit(f"{spec}: no fx-NN.md / sx-NN.md reports in it")
+            runs.append(path.name)
+            for report in reports:
+                fixture = samples.setdefault(report.stem, {m: [] for m in METRICS})
+                for metric, value in report_sample(report).items():
+                    fixture[metric].append(value)
+            continue
+        if rows is None:
+            rows, _, _ = STORE.update()
+        found = [r for r in rows if r["suite"] == suite and fnmatch.fnmatchcase(r["run"], spec)]
+        if not found:
+            raise SystemExit(f"{spec}: no {suite} run in the results store matches")
+        matched += [r for r in found if r not in matched]
+    picked = pick_rows(matched, model) if matched else []
+    for r in picked:
+        if r["run"] not in runs:
+            runs.append(r["run"])
+        fixture = samples.setdefault(r["fixture"], {m: [] for m in METRICS})
+        for metric in METRICS:
+            if r[metric] != "":
+                fixture[metric].append(float(r[metric]))
+        if r["found"] != "":
+            fixture.setdefault("found", []).append(int(r["found"]))
+    return samples, runs, picked[0]["model"] if picked else model
+
+
+class Comparison:
+    """One metric's candidate/baseline cost ratio over the fixtures both sides measured."""
+
+    def __init__(self, metric, candidate, baseline):
+        self.metric = metric
+        self.fixtures = sorted(
+            f for f in candidate.keys() & baseline.keys() if candidate[f][metric] and baseline[f][metric]
+        )
+        cand = [candidate[f][metric] for f in self.fixtures]
+        base = [baseline[f][metric] for f in self.fixtures]
+        self.runs = (min(map(len, cand), default=0), min(map(len, base), default=0))
+        self.cost = (sum(map(statistics.fmean, cand)), sum(map(statistics.fmean, base)))
+        # The candidate's variance is kept undivided by its run count so interval() can
+        # ask what more runs would give; the baseline's is what it is.
+        self.spread = (
+            sum(statistics.variance(v) for v in cand if len(v) > 1),
+            sum(statistics.variance(v) / len(v) for v in base if len(v) > 1),
+        )
+
+    @property
+    def ratio(self):
+        c, b = self.cost
+        return c / b if c > 0 and b > 0 else None
+
+    def interval(self, runs=None):
+        """(low, high) of the 95% interval, assuming `runs` candidate runs of each fixture."""
+        runs = runs or self.runs[0]
+        (c, b), (vc, vb) = self.cost, self.spread
+        # The sides' spreads differ, so their degrees of freedom are not pooled.
+        half = t95(min(runs, self.runs[1]) - 1) * math.sqrt(vc / runs / c**2 + vb / b**2)
+        return self.ratio * math.exp(-half), self.ratio * math.exp(half)
+
+    def verdict(self, tolerance, min_runs):
+        """(verdict, extra candidate runs per fixture or None, note)."""
+        if not self.fixtures:
+            return "needs more runs", None, "no fixture measured on both sides"
+        if self.ratio is None:
+            return "n/a", None, "a side's cost is zero, so there is no ratio"
+        short = max(0, min_runs - self.runs[0])
+        if self.runs[1] < min_runs:
+            return "needs more runs", None, f"the baseline has {self.runs[1]} run(s) of some fixture; record {min_runs}"
+        if short:
+            return "needs more runs", short, f"{self.runs[0]} run(s) of some fixture; {min_runs} are the minimum"
+        limit = 1 + tolerance
+        low, high = self.interval()
+        if low > limit:
+            return "fail", None, ""
+        if high <= limit:
+            return "pass", None, ""
+        for runs in range(self.runs[0] + 1, MAX_RUNS + 1):
+            low, high = self.interval(runs)
+            if low > limit or high <= limit:
+                return "needs more runs", runs - self.runs[0], ""
+        floor = t95(self.runs[1] - 1) * math.sqrt(self.spread[1]) / self.cost[1]
+        if self.ratio * math.exp(-floor) <= limit < self.ratio * math.exp(floor):
+            return "needs more runs", None, f"the baseline's own spread (±{floor:.0%}) straddles ×{limit:.2f}; record more baseline runs"
+        return "needs more runs", None, f"even {MAX_RUNS} runs would not separate ×{self.ratio:.2f} from ×{limit:.2f}"
+
+
+def shown(metric, value):
+    if metric == "tokens":
+        return f"{value / 1000:.1f}k"
+    if metric == "wall_s":
+        return f"{value:.0f}s"
+    return f"{value:.1f}"
+
+
+def check(candidate, baseline, gate, tolerance, min_runs):
+    """Print the comparison table; return the overall verdict."""
+    print(f"{'metric':10s} {'baseline':>9s} {'candidate':>9s} {'ratio':>6s}  {'95% interval':13s} {'limit':>6s}  verdict")
+    verdicts = []
+    for metric in METRICS:
+        comparison = Comparison(metric, candidate, baseline)
+        verdict, extra, note = comparison.verdict(tolerance[metric], min_runs)
+        if comparison.ratio is None or min(comparison.runs) < 2:
+            numbers = f"{'-':>6s}  {'-':13s}"
+        else:
+            low, high = comparison.interval()
+            numbers = f"×{comparison.ratio:.2f}  ×{low:.2f}–×{high:.2f}".ljust(22)
+        if metric in gate:
+            limit = f"×{1 + tolerance[metric]:.2f}"
+            verdicts.append((metric, verdict, extra))
+            said = verdict + (f" (+{extra} run{'s' * (extra != 1)} of each fixture)" if extra else "")
+        else:
+            limit, said = "-", "(not gated)"
+        c, b = comparison.cost
+        cost = f"{shown(metric, b):>9s} {shown(metric, c):>9s}" if comparison.fixtures else f"{'-':>9s} {'-':>9s}"
+        print(f"{metric:10s} {cost} {numbers} {limit:>6s}  {said}" + (f" — {note}" if note and metric in gate else ""))
+
+    fixtures = sorted(candidate.keys() & baseline.keys())
+    found = []
+    for side in (baseline, candidate):
+        hits = [v for f in fixtures for v in side[f].get("found", [])]
+        found.append(f"{statistics.fmean(hits):.1f}" if hits else "-")
+    print(f"\nfixtures: {' '.join(fixtures) or '-'}")
+    if fixtures:
+        print(f"mean found per run: baseline {found[0]}, candidate {found[1]} (not judged here)")
+    only = sorted(candidate.keys() ^ baseline.keys())
+    if only:
+        print(f"measured on one side only, left out: {' '.join(only)}")
+
+    if any(v == "fail" for _, v, _ in verdicts):
+        return "fail"
+    if any(v in ("needs more runs", "n/a") for _, v, _ in verdicts):
+        return "needs more runs"
+    return "pass"
+
+
+def _of(model):
+    return f" of {model}" if model else ""
+
+
+def parse_tolerance(items):
+    tolerance = dict(TOLERANCE)
+    for item in items:
+        metric, _, value = item.partition("=")
+        if metric not in METRICS or not value:
+            raise SystemExit(f"--tolerance {item}: expected METRIC=FRACTION with METRIC one of {', '.join(METRICS)}")
+        tolerance[metric] = float(value)
+    return tolerance
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--suite", choices=sorted(STORE.SUITES), default="review-diff")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_base = sub.add_parser("baseline", help="record these runs' samples as the suite's baseline")
+    p_base.add_argument("runs", nargs="+", help="run names or patterns from the results store, or report directories")
+    p_base.add_argument("--model", help="the model whose rows to take, when the runs hold several")
+    p_check = sub.add_parser("check", help="compare these runs against the baseline")
+    p_check.add_argument("runs", nargs="+", help="run names or patterns from the results store, or report directories")
+    p_check.add_argument("--model", help="the candidate runs' model, when they hold several")
+    p_check.add_argument("--against", nargs="+", metavar="RUN", help="baseline runs (default: the recorded baseline)")
+    p_check.add_argument("--against-model", metavar="MODEL", help="the --against runs' model, when they hold several")
+    p_check.add_argument("--gate", default=",".join(GATE), help=f"metrics that decide the verdict (of {', '.join(METRICS)})")
+    p_check.add_argument("--tolerance", action="append", default=[], metavar="METRIC=FRACTION",
+                         help="allowed rise before failing (default: tokens=0.10, wall_s=0.15)")
+    p_check.add_argument("--min-runs", type=int, default=MIN_RUNS, help="runs of each fixture needed on each side")
+    args = parser.parse_args(argv)
+
+    baseline_file = EVALS / args.suite / "cost-baseline.json"
+    if args.command == "baseline":
+        samples, runs, model = collect(args.runs, args.suite, args.model)
+        baseline_file.write_text(
+            json.dumps(
+                {
+                    "suite": args.suite,
+                    "recorded": datetime.date.today().isoformat(),
+                    "model": model,
+                    "runs": runs,
+                    "samples": samples,
+                },
+                indent=1,
+            )
+            + "\n"
+        )
+        counts = sorted({len(v["wall_s"] or v["tokens"]) for v in samples.values()})
+        print(f"{baseline_file.relative_to(REPO)}: {len(runs)} run(s){_of(model)}, {len(samples)} fixture(s), "
+              f"{'/'.join(map(str, counts))} sample(s) per fixture")
+        return 0
+
+    if args.min_runs < 2:
+        parser.error("--min-runs must be at least 2: one run has no spread to judge")
+    gate = [m.strip() for m in args.gate.split(",") if m.strip()]
+    unknown = set(gate) - set(METRICS)
+    if unknown:
+        parser.error(f"--gate: unknown metric(s) {', '.join(sorted(unknown))}")
+    tolerance = parse_tolerance(args.tolerance)
+    candidate, runs, model = collect(args.runs, args.suite, args.model)
+    if args.against:
+        baseline, base_runs, base_model = collect(args.against, args.suite, args.against_model)
+        source = f"{len(base_runs)} run(s){_of(base_model)}"
+    else:
+        try:
+            recorded = json.loads(baseline_file.read_text())
+        except FileNotFoundError:
+            parser.error(f"no {baseline_file.relative_to(REPO)}; record one with `baseline` or pass --against")
+        baseline = recorded["samples"]
+        source = (
+            f"{baseline_file.relative_to(REPO)}, {len(recorded['runs'])} run(s){_of(recorded.get('model'))} "
+            f"recorded {recorded['recorded']}"
+        )
+    print(f"{len(runs)} candidate run(s){_of(model)} against the baseline ({source})\n")
+    verdict = check(candidate, baseline, gate, tolerance, args.min_runs)
+    print(f"\nverdict: {verdict}")
+    return {"pass": 0, "fail": 1}.get(verdict, NEEDS_MORE_RUNS)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,482 @@
+"""Generate seeded large-diff review-diff fixtures: benign edits at scale plus a few known defects.
+
+```
+python3 scripts/evals/gen-large-fixture.py                       # fx-NN for sizes 10, 25, 50 against HEAD
+python3 scripts/evals/gen-large-fixture.py --sizes 20 --defects 3 --seed 7
+python3 scripts/evals/gen-large-fixture.py --sizes 50 --dry-run  # print the plan, write nothing
+python3 scripts/evals/gen-large-fixture.py --sizes 25 --start 10 --force   # regenerate fx-10 in place
+```
+
+fx-08's eight files are the suite's only measure of how review cost grows with
+diff size. This writes fixtures of any size in the existing layout —
+`fx-NN/seed.patch` and `fx-NN/expected.md` — so tokens and wall time can be
+charted against size before a real large PR finds the limit.
+
+A fixture of size N is N edits. `--defects` of them are seeded from the families
+of fx-01..fx-08, each in a file of its own; the rest are benign and spread over
+the other source files in turn, so past one edit per file the diff grows in
+hunks rather than files. Once a fixture is big enough to reach every file a
+benign edit can, its defects go to files that take no benign edit where a
+family allows it (the `boundary` and `render-impurity` sites), since a defect in
+a benign-capable file costs the diff a file. Both counts are recorded in
+`expected.md`. The tree
+bounds the size: `src/` has some forty reviewable files, but most `ui/`
+primitives are a single JSX return with no site for any kind below, and a base
+like today's tops out near 60 edits over 18 files. Asking for more (200, say)
+writes the largest fixture there is and says so; a wider curve needs a larger
+base, not a different generator.
+
+Defect families, found by pattern in the base tree (a family with no site there
+is skipped):
+
+- `boundary` (fx-01, fx-05) — a zod `.min(n, msg)` / `.max(n, msg)` limit moved
+  so it contradicts its own message;
+- `type-escape` (fx-02) — a type annotation or an awaited call's inferred type
+  turned into an `as` assertion;
+- `render-impurity` (fx-03) — `Math.random()` called in a component's render and
+  put into its output;
+- `swallowed-error` (fx-04, fx-08) — a catch block's `{ success: false, … }`
+  turned into `{ success: true }`;
+- `premature-reset` (fx-07) — a state reset moved above the early-return check
+  that guarded it;
+- `inverted-condition` (fx-08) — a comparison in an `if` flipped.
+
+Benign kinds are the ones fx-06, fx-07 and fx-08 used, minus comments: a
+file-wide rename of a local variable (only where no occurrence is a property,
+key, JSX attribute or string), a call's string argument extracted into a
+module-scope constant placed after the imports, and a blank line between two
+statements, which the formatter keeps. fx-08's regeneration note is why there
+are no comment edits: two rounds of "benign" comments asserted something false,
+and the reviewer was right to flag them.
+
+Sites are picked with `random.Random(seed, size)`, so the same arguments on the
+same base give the same patch. Files are read from the base commit, never the
+working tree, and the patch is checked with `git apply --check --cached` against
+that commit in a temporary index before anything is written. A patch that does
+not apply is an error, not a fixture.
+
+`expected.md`'s `base:` line records the command with the fixture's `--start`,
+so re-running it with `--force` on a newer base regenerates that fixture in
+place; without `--force` an existing `fx-NN` is never overwritten.
+"""
+
+import argparse
+import difflib
+import os
+import pathlib
+import random
+import re
+import subprocess
+import sys
+import tempfile
+
+REPO = pathlib.Path(__file__).resolve().parents[2]
+EVAL = REPO / "scripts/evals/review-diff"
+SOURCE = re.compile(r"^src/.*\.tsx?$")
+NOT_REVIEWED = re.compile(r"\.test\.tsx?$|\.d\.ts$|^src/test/|^src/test-setup\.ts$")
+IMPORT_END = re.compile(r"""^(?:import\b.*|\}.*)\bfrom\s+["'][^"']+["'];?\s*$|^import\s+["'][^"']+["'];?\s*$""")
+ENCLOSING = re.compile(r"^\s*(?:export )?(?:const (\w+) = |(?:async )?function (\w+)\()")
+COMPONENT = re.compile(r"^export (?:const ([A-Z]\w*) = \(.*\) => \{|function ([A-Z]\w*)\(.*\) \{)$")
+OPENING_TAG = re.compile(r"^(\s+<[A-Za-z][\w.]*(?:\s[^<>]*)?)>$")
+BOUNDARY = re.compile(r"\.(min|max)\((\d+), (\"[^\"]*\")\)")
+TYPED = re.compile(r"^(\s*(?:export )?(?:const|let) (\w+)): ([^=;]+?) = (.+);$")
+AWAITED = re.compile(r"^(\s*const (\w+)) = await ([\w.]+)\((.*)\);$")
+SWALLOWED = re.compile(r"^(\s*)return \{ success: false, error: .*\};$")
+COMPARISON = re.compile(r"^(\s*if \()([\w.]+) (<=|>=|<|>) ([\w.]+)(\) \{)$")
+RESET = re.compile(r"^(\s*)(set\w+)\((null|undefined|false|\[\]|\"\"|0)\);$")
+LOCAL = re.compile(r"^\s+(?:const|let) (\w+) = ")
+CALL_LITERAL = re.compile(r"(?<![\w.])([A-Za-z_][\w.]*)\(\"([A-Za-z][^\"\\]{5,58})\"")
+TEXT_ATTRIBUTE = re.compile(r"\s(?:placeholder|title|alt|aria-label)=\"([A-Za-z][^\"\\]{3,58})\"")
+TYPE_MEMBER = re.compile(r"^\s*[\w$]+\??: ")
+FLIP = {"<": ">", ">": "<", "<=": ">=", ">=": "<="}
+RENAMES = (("Url", "Src"), ("Result", "Response"), ("Data", "Payload"), ("File", "Upload"), ("Label", "Text"), ("List", "Items"))
+NOT_EXTRACTED = frozenset({"cn", "describe", "it", "test", "expect", "import", "require"})
+
+
+def git(*args, **kwargs):
+    return subprocess.run(["git", *args], cwd=REPO, capture_output=True, text=True, check=True, **kwargs).stdout
+
+
+def source_files(base):
+    names = git("ls-tree", "-r", "--name-only", base, "src/").split()
+    files = {}
+    for name in names:
+        if SOURCE.match(name) and not NOT_REVIEWED.search(name):
+            text = git("show", f"{base}:{name}")
+            if text.endswith("\n"):
+                files[name] = text.splitlines(keepends=True)
+    return files
+
+
+def enclosing(lines, index):
+    for line in reversed(lines[:index]):
+        match = ENCLOSING.match(line)
+        if match and not line.startswith((" ", "\t")):
+            return match.group(1) or match.group(2)
+    return "module scope"
+
+
+def replaced(lines, index, *new):
+    return lines[:index] + list(new) + lines[index + 1:]
+
+
+# Defect families: each returns [(new lines, expected finding's nature, severity floor)].
+
+
+def boundary(lines):
+    sites = []
+    for i, line in enumerate(lines):
+        for m in BOUNDARY.finditer(line):
+            kind, limit, message = m.group(1), int(m.group(2)), m.group(3)
+            if kind == "min" and limit == 0:
+                continue
+            moved = limit - 1 if kind == "min" else limit * 10
+            new = line[: m.start()] + f".{kind}({moved}, {message})" + line[m.end():]
+            nature = (
+                f"`.{kind}({moved}, …)` contradicts its own message {message} (was {limit}) — "
+                f"limit/message mismatch at the validation boundary."
+            )
+            sites.append((replaced(lines, i, new), nature, "minor"))
+    return sites
+
+
+def type_escape(lines):
+    sites = []
+    for i, line in enumerate(lines):
+        body = line.rstrip("\n")
+        typed, awaited = TYPED.match(body), AWAITED.match(body)
+        if typed and "as const" not in body:
+            decl, name, annotation, value = typed.groups()
+            value = value if re.fullmatch(r"[\w.]+", value) else f"({value})"
+            new = f"{decl} = {value} as {annotation};\n"
+        elif awaited:
+            decl, name, call, args = awaited.groups()
+            new = f"{decl} = (await {call}({args})) as Awaited<ReturnType<typeof {call}>>;\n"
+        else:
+            continue
+        nature = (
+            f"banned `as` type assertion added on `{name}` in {enclosing(lines, i)} — AGENTS.md "
+            f"\"Never escape the type system\" (only `as const` is allowed); the rule must be cited."
+        )
+        sites.append((replaced(lines, i, new), nature, "minor"))
+    return sites
+
+
+def render_impurity(lines):
+    if any("renderKey" in line for line in lines):
+        return []
+    sites = []
+    for i, line in enumerate(lines):
+        component = COMPONENT.match(line.rstrip("\n"))
+        if not component:
+            continue
+        name = component.group(1) or component.group(2)
+        for j in range(i + 1, len(lines)):
+            if lines[j].startswith("}"):
+                break
+            if lines[j].rstrip("\n") == "  return (" and j + 1 < len(lines):
+                tag = OPENING_TAG.match(lines[j + 1].rstrip("\n"))
+                if tag:
+                    new = lines[: i + 1] + ["  const renderKey = Math.random().toString(36).slice(2, 7);\n"]
+                    new += lines[i + 1: j + 1] + [f"{tag.group(1)} data-render-key={{renderKey}}>\n"] + lines[j + 2:]
+                    nature = (
+                        f"Math.random() called during render in {name} — violates react.md purity "
+                        f"(idempotent render); `data-render-key` changes on every re-render. The react.md "
+                        f"rule (or Rules of React purity) must be referenced."
+                    )
+                    sites.append((new, nature, "minor"))
+                break
+    return sites
+
+
+def swallowed_error(lines):
+    sites = []
+    for i, line in enumerate(lines):
+        match = SWALLOWED.match(line.rstrip("\n"))
+        if match and any("catch" in lines[k] for k in range(max(0, i - 3), i)):
+            nature = (
+                f"{enclosing(lines, i)}'s catch now returns {{ success: true }} — the failure is "
+                f"swallowed and reported as success (integrity)."
+            )
+            sites.append((replaced(lines, i, f"{match.group(1)}return {{ success: true }};\n"), nature, "major"))
+    return sites
+
+
+def premature_reset(lines):
+    sites = []
+    for i, line in enumerate(lines):
+        match = RESET.match(line.rstrip("\n"))
+        if not match or i < 3 or lines[i - 1].rstrip("\n") != f"{match.group(1)}}}":
+            continue
+        indent = match.group(1)
+        for k in range(i - 2, 0, -1):
+            if lines[k].startswith(f"{indent}if (") and lines[k].rstrip("\n").endswith("{"):
+                if any(lines[r].strip() == "return;" for r in range(k + 1, i - 1)):
+                    new = lines[:k] + [line] + lines[k:i] + lines[i + 1:]
+                    nature = (
+                        f"{match.group(2)}({match.group(3)}) moved BEFORE the early-return check in "
+                        f"{enclosing(lines, i)} — on the failure path the state is reset before bailing "
+                        f"out, so a retry runs without it."
+                    )
+                    sites.append((new, nature, "minor"))
+                break
+            if not lines[k].startswith(indent + " ") and lines[k].strip():
+                break
+    return sites
+
+
+def inverted_condition(lines):
+    sites = []
+    for i, line in enumerate(lines):
+        match = COMPARISON.match(line.rstrip("\n"))
+        if match:
+            head, left, op, right, tail = match.groups()
+            new = f"{head}{left} {FLIP[op]} {right}{tail}\n"
+            nature = (
+                f"condition inverted in {enclosing(lines, i)} (`{left} {op} {right}` → "
+                f"`{left} {FLIP[op]} {right}`) — the branch now runs exactly when it should not."
+            )
+            sites.append((replaced(lines, i, new), nature, "major"))
+    return sites
+
+
+DEFECTS = {
+    "boundary": boundary,
+    "type-escape": type_escape,
+    "render-impurity": render_impurity,
+    "swallowed-error": swallowed_error,
+    "premature-reset": premature_reset,
+    "inverted-condition": inverted_condition,
+}
+
+
+# Benign kinds: each returns [(new lines, description)].
+
+
+def renamed(name):
+    for old, new in RENAMES:
+        if name.endswith(old) and name != old:
+            return name[: -len(old)] + new
+    return name + "Value"
+
+
+def rename(lines, generated):
+    text = "".join(lines)
+    sites = []
+    for name in dict.fromkeys(m.group(1) for m in map(LOCAL.match, lines) if m):
+        new = renamed(name)
+        if name in generated or re.search(rf"\b{new}\b", text):
+            continue
+        unsafe = re.compile(
+            rf"(?:\.|\?\.)\s*{name}\b|\b{name}\??:|[{{,]\s*{name}\s*[,}}]|\s{name}=[{{\"]|[\"'`][^\"'`]*\b{name}\b"
+        )
+        if any(unsafe.search(line) for line in lines if re.search(rf"\b{name}\b", line)):
+            continue
+        new_lines = [re.sub(rf"\b{name}\b", new, line) for line in lines]
+        sites.append((new_lines, f"local rename `{name}` → `{new}`", new))
+    return sites
+
+
+def extract_constant(lines, generated):
+    ends = [i for i, line in enumerate(lines) if IMPORT_END.match(line)]
+    if not ends:
+        return []
+    text = "".join(lines)
+    sites = []
+    for i, line in enumerate(lines):
+        if not line.startswith(" ") or line.lstrip().startswith("import"):
+            continue
+        spans = [
+            (m.start(2) - 1, m.end(2) + 1, m.group(2), "{}")
+            for m in CALL_LITERAL.finditer(line)
+            if m.group(1).split(".")[-1] not in NOT_EXTRACTED and " " in m.group(2)
+        ]
+        spans += [(m.start(1) - 1, m.end(1) + 1, m.group(1), "{{{}}}") for m in TEXT_ATTRIBUTE.finditer(line)]
+        for start, end, literal, use in spans:
+            name = "_".join(w.upper() for w in re.findall(r"[A-Za-z]+", literal)[:4])
+            if re.search(rf"\b{name}\b", text):
+                continue
+            new = line[:start] + use.format(name) + line[end:]
+            at = ends[-1] + 1
+            new_lines = lines[:at] + ["\n", f'const {name} = "{literal}";\n'] + replaced(lines, i, new)[at:]
+            sites.append((new_lines, f"string literal extracted to module-scope `{name}`", name))
+    return sites
+
+
+def blank_line(lines, generated):
+    sites = []
+    for i in range(len(lines) - 1):
+        here, after = lines[i], lines[i + 1]
+        indent = len(here) - len(here.lstrip())
+        if (
+            indent
+            and here.lstrip()[:1].isalpha()
+            and not TYPE_MEMBER.match(here)
+            and here.rstrip().endswith(";")
+            and after.lstrip()[:1].isalpha()
+            and len(after) - len(after.lstrip()) == indent
+            and not after.lstrip().startswith(("case ", "default:"))
+        ):
+            sites.append((lines[: i + 1] + ["\n"] + lines[i + 1:], "blank line between statements", None))
+    return sites
+
+
+BENIGN = {"rename": rename, "extract-constant": extract_constant, "blank-line": blank_line}
+
+
+def plan(files, size, defects, rng):
+    """(edited {path: lines}, [(path, family, nature, severity)], {path: [benign descriptions]})."""
+    edited = dict(files)
+    found = []
+    by_family = {}
+    # A defect's file takes no benign edits, so defects go where benign edits cannot
+    # when they can: every file with a benign site stays free to widen the diff.
+    spreads = {path for path in files if any(finder(files[path], set()) for finder in BENIGN.values())}
+    for family, finder in DEFECTS.items():
+        sites = [(path, new, nature, floor) for path in sorted(files) for new, nature, floor in finder(files[path])]
+        if sites:
+            rng.shuffle(sites)
+            sites.sort(key=lambda site: site[0] in spreads)
+            by_family[family] = sites
+    families = sorted(by_family)
+    rng.shuffle(families)
+    if size >= len(spreads):
+        # Benign edits will reach every file they can, so a defect family that can sit
+        # elsewhere goes first: each defect in a benign file costs the diff a file.
+        families.sort(key=lambda family: by_family[family][0][0] in spreads)
+    used = set()
+    while len(found) < defects and families:
+        for family in list(families):
+            site = next((s for s in by_family[family] if s[0] not in used), None)
+            if site is None:
+                families.remove(family)
+                continue
+            path, new, nature, floor = site
+            edited[path] = new
+            used.add(path)
+            found.append((path, family, nature, floor))
+            if len(found) == defects:
+                break
+
+    benign = {path: [] for path in sorted(files) if path not in used}
+    generated = set()
+    rotation = list(benign)
+    rng.shuffle(rotation)
+    remaining = size - len(found)
+    while remaining > 0 and rotation:
+        for path in list(rotation):
+            if remaining == 0:
+                break
+            options = [
+                (kind, site) for kind, finder in BENIGN.items() for site in finder(edited[path], generated)
+            ]
+            if not options:
+                rotation.remove(path)
+                continue
+            kinds = sorted({kind for kind, _ in options})
+            kind = rng.choice(kinds)
+            new, description, name = rng.choice([site for k, site in options if k == kind])
+            edited[path] = new
+            benign[path].append(description)
+            if name:
+                generated.add(name)
+            remaining -= 1
+    return edited, found, {path: edits for path, edits in benign.items() if edits}
+
+
+def make_patch(files, edited):
+    parts = []
+    for path in sorted(files):
+        if edited[path] != files[path]:
+            parts.append(f"diff --git a/{path} b/{path}\n")
+            parts.extend(difflib.unified_diff(files[path], edited[path], f"a/{path}", f"b/{path}"))
+    return "".join(parts)
+
+
+def applies(patch, base):
+    """Whether the patch applies to the base commit, checked in a throwaway index."""
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {**os.environ, "GIT_INDEX_FILE": os.path.join(tmp, "index")}
+        git("read-tree", base, env=env)
+        result = subprocess.run(
+            ["git", "apply", "--check", "--cached", "-"], cwd=REPO, input=patch, env=env, capture_output=True, text=True
+        )
+    return result.returncode == 0, result.stderr.strip()
+
+
+def expected(number, size, seed, base, found, benign):
+    files = len({path for path, *_ in found} | set(benign))
+    edits = len(found) + sum(map(len, benign.values()))
+    lines = [
+        f"# fx-{number:02d} (synthetic large diff — {edits} edits over {files} files)",
+        f"base: {base} (generated by `scripts/evals/gen-large-fixture.py --sizes {size} --defects {len(found)} --seed {seed} --start {number}`)",
+        "",
+        f"{edits - len(found)} benign edits and {len(found)} seeded defect(s). Measures how review cost grows",
+        "with diff size, and detection and FP resistance inside a diff this noisy.",
+        "",
+        "## Expected findings",
+    ]
+    for path, family, nature, floor in sorted(found):
+        lines += [f"- file: {path}", f"  nature: {nature}", f"  family: {family}", f"  severity-floor: {floor}"]
+    if not found:
+        lines.append("- none.")
+    lines += ["", "## Must NOT be flagged (each counts as an FP if a CONFIRMED finding survives)"]
+    for path, edits in sorted(benign.items()):
+        counts = {}
+        for edit in edits:
+            kind = edit.split(" `")[0]
+            counts[kind] = counts.get(kind, 0) + 1
+        lines.append(f"- {path} ({', '.join(f'{k} ×{n}' if n > 1 else k for k, n in counts.items())})")
+    lines += ["", "## Acceptable extras", "- none", ""]
+    return "\n".join(lines)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="10,25,50", help="comma-separated edit counts, one fixture each")
+    parser.add_argument("--defects", type=int, default=2, help="seeded defects per fixture")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--base", default="HEAD", help="commit the patches are made against")
+    parser.add_argument("--start", type=int, help="first fixture number (default: the next free fx-NN)")
+    parser.add_argument("--force", action="store_true", help="overwrite fixtures that already exist")
+    parser.add_argument("--dry-run", action="store_true", help="print the plan, write nothing")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    base = git("rev-parse", "--verify", f"{args.base}^{{commit}}").strip()
+    files = source_files(base)
+    numbers = [int(p.name[3:]) for p in EVAL.glob("fx-[0-9]*") if p.name[3:].isdigit()]
+    number = args.start or max(numbers, default=0) + 1
+    for size in sizes:
+        if size <= args.defects:
+            parser.error(f"size {size} leaves no room for benign edits beside {args.defects} defect(s)")
+        edited, found, benign = plan(files, size, args.defects, random.Random(f"{args.seed}-{size}"))
+        patch = make_patch(files, edited)
+        ok, error = applies(patch, base)
+        if not ok:
+            print(f"size {size}: the generated patch does not apply to {base[:7]}: {error}", file=sys.stderr)
+            return 1
+        edits = len(found) + sum(map(len, benign.values()))
+        changed = len({path for path, *_ in found} | set(benign))
+        families = ", ".join(sorted(family for _, family, _, _ in found)) or "none"
+        target = EVAL / f"fx-{number:02d}"
+        note = f"{edits} edits over {changed} files, defects: {families}, {patch.count(chr(10))} patch lines"
+        if edits < size:
+            note += f" (asked for {size}; the tree ran out of sites)"
+        if args.dry_run:
+            print(f"fx-{number:02d}: {note}")
+        else:
+            if target.exists() and not args.force:
+                print(f"{target.relative_to(REPO)} exists; pass --start to number past it or --force to replace it",
+                      file=sys.stderr)
+                return 1
+            target.mkdir(exist_ok=True)
+            (target / "seed.patch").write_text(patch)
+            (target / "expected.md").write_text(expected(number, size, args.seed, base[:7], found, benign))
+            print(f"{target.relative_to(REPO)}: {note}; applies to {base[:7]}")
+        number += 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
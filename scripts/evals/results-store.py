@@ -0,0 +1,384 @@
+"""Collect the eval results tables into one dataset and query cost trends across runs.
+
+```
+python3 scripts/evals/results-store.py                       # update .cache/eval-results.csv, summarize
+python3 scripts/evals/results-store.py trend                 # tokens / wall per fixture, run by run
+python3 scripts/evals/results-store.py trend fx-01 --suite review-diff
+python3 scripts/evals/results-store.py regressions           # runs whose cost per found defect rose
+python3 scripts/evals/results-store.py regressions --threshold 1.05
+```
+
+Every run's numbers — tokens, wall time, candidates, refuted, found, false
+positives — live in the Markdown tables of `review-diff/results/*.md` and
+`verify-spec/results/*.md`, and every comparison between runs (the "against the
+baseline" tables) has been assembled by hand from them. This reads those tables
+into rows of one CSV, `.cache/eval-results.csv`, one row per (run, fixture,
+model):
+
+    suite, run, date, model, fixture, expected, found, fp, candidates, refuted,
+    tokens, wall_s, source_sha
+
+Three table layouts are read:
+
+- a fixture column and exactly one tokens column — one row per `fx-NN` /
+  `sx-NN` the fixture cell names, so totals rows are left out;
+- the same with a `base → now` tokens column (a re-run set beside the run it
+  repeats): each `a → b` cell is read as its `b`, this run's, and the `a` side
+  is not stored again, being the compared run's own row in its own file;
+- a two-column `metric | result` table, one run of the fixture that the heading
+  above it, else the file's title, names: its tokens and wall time rows, a
+  false-positives row, and every other row is a seeded defect found or missed.
+
+Cells are read the way the files write them: `1/1 CONFIRMED` is one found of one
+expected, `42.4k + 37.0k = **79.4k**` is 79,400 tokens, `56s + 93s` is 149
+seconds, and a result cell saying `FP = 1` counts where there is no FP column.
+The model is the table's `tier` column, else the one the file's title or
+introduction gives the agents; the parent session's model is not the measured
+one and is ignored. A field the file does not give is left empty rather than
+guessed.
+
+Not read, and so not in the store: side-by-side tables of two runs of one
+fixture with no fixture column (the delta-mode halves in
+`2026-07-10-delta-mode.md` and `2026-07-12-fx08-large-diff.md`, a retired mode),
+and per-fixture tables without a tokens column (`2026-07-12-noise-suppression.md`
+records false positives only).
+
+The CSV is kept up to date incrementally: each row carries the sha256 of its
+source file, and only files whose hash changed (or that are new) are parsed
+again. Files with no table read here are listed as skipped.
+
+`regressions` walks each (suite, model)'s runs in date order — runs of the same
+day in the order their files were committed — and compares each
+to the previous one on the fixtures both ran: cost per found defect is their
+total tokens over their total found defects, so a clean-diff probe's tokens count
+and its (zero) findings do not. A run is flagged when that ratio exceeds the
+previous run's by more than `--threshold`, or when it found nothing the previous
+run did find.
+"""
+
+import argparse
+import collections
+import csv
+import hashlib
+import pathlib
+import re
+import subprocess
+import sys
+
+REPO = pathlib.Path(__file__).resolve().parents[2]
+SUITES = {"review-diff": REPO / "scripts/evals/review-diff/results", "verify-spec": REPO / "scripts/evals/verify-spec/results"}
+STORE = REPO / ".cache/eval-results.csv"
+COLUMNS = (
+    "suite", "run", "date", "model", "fixture", "expected", "found", "fp",
+    "candidates", "refuted", "tokens", "wall_s", "source_sha",
+)
+FIXTURE = re.compile(r"^\**((?:fx|sx)-\d+)\b")
+NAMED_FIXTURE = re.compile(r"\b((?:fx|sx)-\d+)\b")
+MODEL = re.compile(r"\b(opus|sonnet|haiku)\b", re.I)
+AGENT_MODEL = re.compile(r"\b(?:agents?|agent is|agents are)\s+(opus|sonnet|haiku)\b", re.I)
+RATIO = re.compile(r"(\d+)\s*/\s*(\d+)")
+AMOUNT = re.compile(r"(\d[\d,]*(?:\.\d+)?)\s*(k)?", re.I)
+
+
+def _plain(cell):
+    return cell.replace("*", "").strip()
+
+
+def parse_tokens(cell):
+    """79.4k, 34,755, or `a + b = **c**` (the total); None when there is no number."""
+    text = _plain(cell)
+    if "=" in text:
+        text = text.rsplit("=", 1)[1]
+    total = 0.0
+    found = False
+    for number, k in AMOUNT.findall(text):
+        value = float(number.replace(",", ""))
+        total += value * 1000 if k else value
+        found = True
+    return round(total) if found else None
+
+
+def parse_seconds(cell):
+    """`163s`, `56s + 93s`, `546s*`; None when there is none."""
+    values = re.findall(r"(\d+(?:\.\d+)?)\s*s\b", _plain(cell))
+    return round(sum(float(v) for v in values)) if values else None
+
+
+def parse_count(cell):
+    match = re.match(r"\d+", _plain(cell))
+    return int(match.group()) if match else None
+
+
+def parse_found(cell):
+    """(found, expected) from a result cell; (None, None) when it says neither."""
+    text = _plain(cell).lower()
+    ratio = RATIO.search(text)
+    if ratio:
+        return int(ratio.group(1)), int(ratio.group(2))
+    if text.startswith("n/a") or text.startswith("0 findings"):
+        return 0, 0
+    if "missed" in text or "not found" in text:
+        return 0, 1
+    if "found" in text:
+        return 1, 1
+    return None, None
+
+
+def tables(text):
+    """Each Markdown table as (header cells, [row cells], the heading above it)."""
+    found, current, heading = [], None, ""
+    for line in text.splitlines():
+        if line.startswith("#"):
+            heading = line.lstrip("#").strip()
+        if line.startswith("|"):
+            cells = [c.strip() for c in line.strip().strip("|").split("|")]
+            if current is None:
+                current = (cells, [], heading)
+                found.append(current)
+            elif not all(set(c) <= set("-: ") for c in cells):
+                current[1].append(cells)
+        else:
+            current = None
+    return found
+
+
+def file_model(text):
+    title = text.splitlines()[0] if text else ""
+    match = MODEL.search(title)
+    if match:
+        return match.group(1).lower()
+    intro = text.split("\n## ", 1)[0]
+    match = AGENT_MODEL.search(intro)
+    return match.group(1).lower() if match else ""
+
+
+def metric_table(body):
+    """Row fields from a `metric | result` table of one fixture's run."""
+    fields = {"expected": 0, "found": 0, "fp": None, "candidates": None, "refuted": None, "tokens": None,
+              "wall_s": None}
+    for cells in body:
+        if len(cells) != 2:
+            continue
+        metric, result = _plain(cells[0]).lower(), cells[1]
+        if metric.startswith("tokens"):
+            fields["tokens"] = parse_tokens(result)
+        elif metric.startswith("wall"):
+            fields["wall_s"] = parse_seconds(result)
+        elif metric.startswith(("false positive", "fp")):
+            fields["fp"] = parse_count(result)
+        elif metric.startswith(("candidates", "refuted")):
+            fields[metric.split()[0]] = parse_count(result)
+        else:
+            found, expected = parse_found(result)
+            if expected:
+                fields["found"] += found
+                fields["expected"] += expected
+    if not fields["expected"]:
+        fields["found"] = fields["expected"] = None
+    return fields
+
+
+def parse_results(suite, path, text):
+    """Rows (dicts keyed by COLUMNS) for one results file."""
+    sha = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    date = re.match(r"\d{4}-\d{2}-\d{2}", path.stem)
+    default_model = file_model(text)
+    title = text.splitlines()[0] if text else ""
+    rows = {}
+
+    def add(fixture, model, fields):
+        row = {"suite": suite, "run": path.stem, "date": date.group() if date else "", "model": model,
+               "fixture": fixture, **fields, "source_sha": sha}
+        rows.setdefault((fixture, model), row)
+
+    for header, body, heading in tables(text):
+        names = [h.lower() for h in header]
+        if names == ["metric", "result"]:
+            named = NAMED_FIXTURE.search(heading) or NAMED_FIXTURE.search(title)
+            if named:
+                add(named.group(1), default_model, metric_table(body))
+            continue
+        token_cols = [i for i, n in enumerate(names) if n.startswith("tokens")]
+        if "fixture" not in names or len(token_cols) != 1:
+            continue
+        paired = "→" in names[token_cols[0]]
+        col = {n.split(" (")[0]: i for i, n in reversed(list(enumerate(names)))}
+        for cells in body:
+            if len(cells) != len(header):
+                continue
+            fixture = FIXTURE.match(_plain(cells[col["fixture"]]))
+            if not fixture:
+                continue
+            if paired:
+                cells = [c.rsplit("→", 1)[1] if "→" in c else c for c in cells]
+
+            def cell(*keys):
+                for key in keys:
+                    if key in col:
+                        return cells[col[key]]
+                return ""
+
+            result_cell = cell("found", "result", "expected ce", "re-run")
+            found, expected = parse_found(result_cell)
+            declared = parse_count(cell("expected")) if "expected" in col else None
+            if declared is not None:
+                expected = declared
+                if found is None and declared == 0:
+                    found = 0
+            fp = parse_count(cell("fp", "fps")) if ("fp" in col or "fps" in col) else None
+            if fp is None:
+                stated = re.search(r"FP\s*=\s*(\d+)", _plain(result_cell))
+                fp = int(stated.group(1)) if stated else (0 if "0 false positives" in result_cell else None)
+            add(fixture.group(1), _plain(cell("tier")).lower() or default_model, {
+                "expected": expected,
+                "found": found,
+                "fp": fp,
+                "candidates": parse_count(cell("candidates")) if "candidates" in col else None,
+                "refuted": parse_count(cell("refuted")) if "refuted" in col else None,
+                "tokens": parse_tokens(cells[token_cols[0]]),
+                "wall_s": parse_seconds(cell("wall", "wall time")),
+            })
+    return list(rows.values())
+
+
+def load_store():
+    try:
+        with open(STORE, newline="") as fh:
+            return list(csv.DictReader(fh))
+    except FileNotFoundError:
+        return []
+
+
+def update():
+    """(rows, parsed files, skipped files): the store brought up to date with the results files.
+
+    A file with no per-fixture table stores no rows, so it is read again on every
+    update; there are few, and they are short.
+    """
+    stored = collections.defaultdict(list)
+    for row in load_store():
+        stored[(row["suite"], row["run"])].append(row)
+    rows, parsed, skipped = [], [], []
+    for suite, directory in SUITES.items():
+        for path in sorted(directory.glob("*.md")):
+            raw = path.read_bytes()
+            sha = hashlib.sha256(raw).hexdigest()
+            previous = stored.get((suite, path.stem))
+            if previous and previous[0]["source_sha"] == sha:
+                rows += previous
+                continue
+            fresh = parse_results(suite, path, raw.decode("utf-8"))
+            (parsed if fresh else skipped).append(f"{suite}/{path.name}")
+            rows += [{k: ("" if v is None else v) for k, v in r.items()} for r in fresh]
+    STORE.parent.mkdir(exist_ok=True)
+    tmp = STORE.with_suffix(".tmp")
+    with open(tmp, "w", newline="") as fh:
+        writer = csv.DictWriter(fh, fieldnames=COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+    tmp.replace(STORE)
+    return rows, parsed, skipped
+
+
+def _int(value):
+    return int(value) if value not in ("", None) else None
+
+
+def trend(rows, fixture=None, suite=None):
+    selected = [r for r in rows if (not fixture or r["fixture"] == fixture) and (not suite or r["suite"] == suite)]
+    selected.sort(key=lambda r: (r["suite"], r["fixture"], r["date"], r["run"], r["model"]))
+    print(f"{'fixture':8s} {'date':10s} {'model':7s} {'tokens':>8s} {'wall':>6s} {'found':>6s} {'fp':>3s}  run")
+    last = None
+    for r in selected:
+        if last and last != r["fixture"]:
+            print()
+        last = r["fixture"]
+        tokens = f"{int(r['tokens']) / 1000:.1f}k" if r["tokens"] else "-"
+        wall = f"{r['wall_s']}s" if r["wall_s"] else "-"
+        found = f"{r['found']}/{r['expected']}" if r["found"] != "" and r["expected"] != "" else "-"
+        print(
+            f"{r['fixture']:8s} {r['date']:10s} {r['model'] or '-':7s} {tokens:>8s} {wall:>6s} {found:>6s}"
+            f" {r['fp'] if r['fp'] != '' else '-':>3}  {r['run']}"
+        )
+
+
+def added_at():
+    """{results file stem: unix time of the commit that added it}, to order runs of one day."""
+    log = subprocess.run(
+        ["git", "log", "--diff-filter=A", "--format=@%ct", "--name-only", "--", *map(str, SUITES.values())],
+        cwd=REPO, capture_output=True, text=True,
+    ).stdout
+    stamps, when = {}, 0
+    for line in log.splitlines():
+        if line.startswith("@"):
+            when = int(line[1:])
+        elif line.endswith(".md"):
+            stamps.setdefault(pathlib.Path(line).stem, when)
+    return stamps
+
+
+def regressions(rows, threshold):
+    """[(suite, model, run, previous, ratio or None, reason)] for flagged runs."""
+    order = added_at()
+    runs = collections.defaultdict(lambda: collections.defaultdict(dict))
+    for r in rows:
+        runs[(r["suite"], r["model"])][(r["date"], order.get(r["run"], 0), r["run"])][r["fixture"]] = r
+    flagged = []
+    for (suite, model), by_run in sorted(runs.items()):
+        ordered = sorted(by_run)
+        for before, after in zip(ordered, ordered[1:]):
+            shared = [f for f in by_run[after] if f in by_run[before]]
+            cost = []
+            for key in (before, after):
+                picked = [by_run[key][f] for f in shared]
+                tokens = [_int(r["tokens"]) for r in picked]
+                found = [_int(r["found"]) for r in picked]
+                if None in tokens or None in found:
+                    cost = None
+                    break
+                cost.append((sum(tokens), sum(found)))
+            if not shared or cost is None:
+                continue
+            (t0, f0), (t1, f1) = cost
+            if f0 and not f1:
+                flagged.append((suite, model, after[-1], before[-1], None, f"found 0 where {before[-1]} found {f0}"))
+            elif f0 and f1:
+                ratio = (t1 / f1) / (t0 / f0)
+                if ratio > threshold:
+                    reason = f"{t1 / f1 / 1000:.1f}k per found defect vs {t0 / f0 / 1000:.1f}k on {', '.join(sorted(shared))}"
+                    flagged.append((suite, model, after[-1], before[-1], ratio, reason))
+    return flagged
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    sub = parser.add_subparsers(dest="command")
+    p_trend = sub.add_parser("trend", help="tokens and wall time per fixture across runs")
+    p_trend.add_argument("fixture", nargs="?")
+    p_trend.add_argument("--suite", choices=sorted(SUITES))
+    p_reg = sub.add_parser("regressions", help="runs whose cost per found defect rose against the previous run")
+    p_reg.add_argument("--threshold", type=float, default=1.10, help="flag ratios above this (default 1.10)")
+    args = parser.parse_args(argv)
+
+    rows, parsed, skipped = update()
+    if args.command == "trend":
+        trend(rows, args.fixture, args.suite)
+    elif args.command == "regressions":
+        flagged = regressions(rows, args.threshold)
+        for suite, model, run, previous, ratio, reason in flagged:
+            shown = f"×{ratio:.2f}" if ratio else "lost"
+            print(f"{suite} [{model or '?'}] {run}: {shown} vs {previous} — {reason}")
+        if not flagged:
+            print(f"no run's cost per found defect rose more than ×{args.threshold:.2f}")
+        return 1 if flagged else 0
+    else:
+        runs = {(r["suite"], r["run"]) for r in rows}
+        print(f"{len(rows)} rows from {len(runs)} run(s) in {STORE.relative_to(REPO)}"
+              f" ({len(parsed)} file(s) parsed, the rest unchanged)")
+        for name in skipped:
+            print(f"  skipped (no table read here): {name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,262 @@
+"""Run review-diff fixtures concurrently, each in its own git worktree with its own stamp.
+
+```
+python3 scripts/evals/run-review-diff.py --label unified-agent --reviewer 'CMD'          # every fixture
+python3 scripts/evals/run-review-diff.py --label probe --reviewer stub fx-01 fx-06       # plumbing only
+python3 scripts/evals/run-review-diff.py --label unified-agent --reviewer 'CMD' -j 4 --date 2026-08-07
+```
+
+The run protocol in `review-diff/README.md` applies each `seed.patch` to the one
+working tree, dispatches the reviewer, and reverts — so fixtures ran strictly one
+after another (557 s of wall time for four on 2026-08-07), and the last dispatch
+left a stamp on the real commit gate that someone had to ask to have cleared.
+Here every fixture gets a detached `git worktree` of its base commit:
+
+- Worktrees are pooled by base. A fixture takes a free worktree for its base (or
+  adds one), applies its patch, runs the reviewer, and hands the worktree back
+  reset to the base commit and cleaned, so eight fixtures on two bases under
+  `-j 4` create at most four worktrees. A base that is not in this clone — the
+  older fixtures name commits from before the history was cut — falls back to
+  `HEAD`, and is reported as such; a patch that no longer applies there marks the
+  fixture `stale`, the README's staleness rule, rather than failing the run.
+- The reviewer runs with the worktree as its working directory and
+  `CLAUDE_PROJECT_DIR`, so the hooks keep their markers — the review stamp
+  included — in the worktree's `.claude/`, which goes away with it. The real
+  commit gate never sees an eval's stamp.
+- `--reviewer` is any shell command. It receives `EVAL_FIXTURE` and
+  `EVAL_WORKTREE` in its environment and must print its final report on stdout;
+  a dispatch prompt it builds must still forbid reading `scripts/evals/`, which
+  is checked out in the worktree like everything else. `--reviewer stub` is a
+  stand-in that reports the files the patch touched and writes a stamp, for
+  testing this script rather than a reviewer.
+
+Each report is written verbatim to `review-diff/results/<date>-<label>/fx-NN.md`
+under a short header naming the fixture, base, reviewer and wall time; the
+run set's own `<date>-<label>.md` (scores, narrative) is still written by hand
+from those files. Worktrees are removed when the run ends, however it ends.
+
+Reports are written to a staging directory beside `results/<date>-<label>/` and
+moved into place only when the run finishes with at least one report, so
+`--force` replaces the previous run's reports whole — a fixture this run skipped
+or failed leaves no old `fx-NN.md` behind to be scored as part of it — while an
+interrupted run, or one in which every reviewer failed, leaves them as they were.
+"""
+
+import argparse
+import concurrent.futures
+import datetime
+import json
+import os
+import pathlib
+import re
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+REPO = pathlib.Path(__file__).resolve().parents[2]
+EVAL = REPO / "scripts/evals/review-diff"
+RESULTS = EVAL / "results"
+BASE = re.compile(r"^base:\s*([0-9a-f]{7,40})\b", re.M)
+
+
+def git(*args, cwd=REPO, check=True):
+    return subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True, check=check)
+
+
+def fixtures(names):
+    found = sorted(p for p in EVAL.glob("fx-*") if (p / "seed.patch").is_file())
+    if names:
+        wanted = set(names)
+        unknown = wanted - {p.name for p in found}
+        if unknown:
+            raise SystemExit(f"unknown fixture(s): {', '.join(sorted(unknown))}")
+        found = [p for p in found if p.name in wanted]
+    return found
+
+
+def resolve_base(fixture):
+    """(commit, note): the fixture's declared base, or HEAD when this clone lacks it."""
+    declared = BASE.search((fixture / "expected.md").read_text())
+    if declared:
+        result = git("rev-parse", "--verify", "--quiet", f"{declared.group(1)}^{{commit}}", check=False)
+        if result.returncode == 0:
+            return result.stdout.strip(), declared.group(1)[:7]
+    head = git("rev-parse", "HEAD").stdout.strip()
+    return head, f"HEAD ({declared.group(1)[:7]} not in this clone)" if declared else "HEAD (no base declared)"
+
+
+class WorktreePool:
+    """Detached worktrees under one temporary directory, reused per base commit."""
+
+    def __init__(self):
+        self.root = pathlib.Path(tempfile.mkdtemp(prefix="review-diff-"))
+        self.free = {}
+        self.all = []
+        self.lock = threading.Lock()
+
+    def acquire(self, commit):
+        with self.lock:
+            if self.free.get(commit):
+                return self.free[commit].pop()
+            path = self.root / f"wt-{len(self.all):02d}"
+            self.all.append(path)
+        git("worktree", "add", "--detach", "--quiet", str(path), commit)
+        return path
+
+    def release(self, commit, path):
+        git("reset", "--hard", "--quiet", commit, cwd=path)
+        git("clean", "-fdxq", cwd=path)
+        with self.lock:
+            self.free.setdefault(commit, []).append(path)
+
+    def close(self):
+        for path in self.all:
+            git("worktree", "remove", "--force", str(path), check=False)
+        shutil.rmtree(self.root, ignore_errors=True)
+        git("worktree", "prune", check=False)
+
+
+def run_fixture(pool, fixture, reviewer, timeout):
+    commit, base_note = resolve_base(fixture)
+    result = {"fixture": fixture.name, "base": base_note}
+    path = pool.acquire(commit)
+    try:
+        patch = str(fixture / "seed.patch")
+        if git("apply", "--check", patch, cwd=path, check=False).returncode:
+            return {**result, "status": "stale", "detail": "seed.patch does not apply to the base"}
+        git("apply", patch, cwd=path)
+        (path / ".claude").mkdir(exist_ok=True)
+        env = {**os.environ, "CLAUDE_PROJECT_DIR": str(path), "EVAL_FIXTURE": fixture.name, "EVAL_WORKTREE": str(path)}
+        if reviewer == "stub":
+            command = [sys.executable, str(pathlib.Path(__file__).resolve()), "--stub-review"]
+        else:
+            command = ["bash", "-c", reviewer]
+        t0 = time.perf_counter()
+        # Its own process group, so a timeout takes the reviewer's children with it.
+        proc = subprocess.Popen(
+            command, cwd=path, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+            start_new_session=True,
+        )
+        try:
+            stdout, stderr = proc.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            os.killpg(proc.pid, signal.SIGKILL)
+            proc.communicate()
+            return {**result, "status": "timeout", "wall": time.perf_counter() - t0}
+        wall = time.perf_counter() - t0
+        status = "ok" if proc.returncode == 0 and stdout.strip() else "error"
+        return {
+            **result,
+            "status": status,
+            "exit": proc.returncode,
+            "wall": wall,
+            "report": stdout,
+            "stderr": stderr[-2000:],
+            "stamped": (path / ".claude/.review-stamp").exists(),
+        }
+    finally:
+        pool.release(commit, path)
+
+
+def save(result, out_dir, date, reviewer):
+    header = (
+        f"# {result['fixture']} — returned report, {date}\n\n"
+        f"Verbatim stdout of the reviewer for this fixture, saved by\n"
+        f"`scripts/evals/run-review-diff.py` (base {result['base']}, reviewer `{reviewer}`,\n"
+        f"exit {result['exit']}, {result['wall']:.0f}s wall).\n\n---\n\n"
+    )
+    (out_dir / f"{result['fixture']}.md").write_text(header + result["report"])
+
+
+def publish(staging, out_dir):
+    """Move a finished run's reports into place, replacing any previous ones; False if it wrote none."""
+    if not any(staging.iterdir()):
+        return False
+    shutil.rmtree(out_dir, ignore_errors=True)
+    staging.rename(out_dir)
+    return True
+
+
+def stub_review():
+    """A deterministic stand-in reviewer: names the changed files, reports no findings, stamps."""
+    changed = subprocess.run(
+        ["git", "diff", "--name-only"], capture_output=True, text=True, check=True
+    ).stdout.split()
+    project = pathlib.Path(os.environ.get("CLAUDE_PROJECT_DIR", "."))
+    (project / ".claude").mkdir(exist_ok=True)
+    (project / ".claude/.review-stamp").touch()
+    print("## Review Report\n")
+    print(f"**Stage A (candidates found):** 0\n\nStub reviewer; the diff touches {len(changed)} file(s):\n")
+    for name in changed:
+        print(f"- `{name}`")
+    print("\n```json")
+    print(json.dumps({"effort": "stub", "findings": [], "stats": {"candidates": 0, "refuted": 0}}, indent=2))
+    print("```")
+    return 0
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("fixtures", nargs="*", help="fixture names (default: every fx-NN with a seed.patch)")
+    parser.add_argument("--label", help="run-set label, as in results/<date>-<label>/")
+    parser.add_argument("--reviewer", help="shell command run in each worktree, or 'stub'")
+    parser.add_argument("--date", default=datetime.date.today().isoformat())
+    parser.add_argument("-j", type=int, default=min(4, os.cpu_count() or 1), help="fixtures run at once")
+    parser.add_argument("--timeout", type=float, default=1800, help="seconds per fixture")
+    parser.add_argument("--force", action="store_true", help="replace an existing results directory")
+    parser.add_argument("--stub-review", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.stub_review:
+        return stub_review()
+    if not args.label or not args.reviewer:
+        parser.error("--label and --reviewer are required")
+    selected = fixtures(args.fixtures)
+    out_dir = RESULTS / f"{args.date}-{args.label}"
+    if out_dir.exists() and not args.force:
+        parser.error(f"{out_dir.relative_to(REPO)} exists; pick another --label or pass --force")
+
+    pool = WorktreePool()
+    RESULTS.mkdir(parents=True, exist_ok=True)
+    staging = pathlib.Path(tempfile.mkdtemp(prefix=f".{out_dir.name}-", dir=RESULTS))
+    results = []
+    start = time.perf_counter()
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, args.j)) as executor:
+            futures = [executor.submit(run_fixture, pool, f, args.reviewer, args.timeout) for f in selected]
+            for future in concurrent.futures.as_completed(futures):
+                result = future.result()
+                results.append(result)
+                if result.get("report"):
+                    save(result, staging, args.date, args.reviewer)
+        published = publish(staging, out_dir)
+    finally:
+        pool.close()
+        shutil.rmtree(staging, ignore_errors=True)
+    wall = time.perf_counter() - start
+
+    results.sort(key=lambda r: r["fixture"])
+    print(f"{'fixture':8s} {'status':8s} {'wall':>7s} {'stamp':>5s}  base")
+    for r in results:
+        shown = f"{r['wall']:6.1f}s" if "wall" in r else "      -"
+        stamp = "yes" if r.get("stamped") else "-"
+        print(f"{r['fixture']:8s} {r['status']:8s} {shown} {stamp:>5s}  {r['base']}")
+        if r["status"] == "error" and r.get("stderr"):
+            print("         " + r["stderr"].strip().splitlines()[-1])
+    serial = sum(r.get("wall", 0) for r in results)
+    print(f"\n{len(results)} fixture(s) in {wall:.1f}s wall ({serial:.1f}s if run one at a time)")
+    if published:
+        print(f"reports in {out_dir.relative_to(REPO)}/")
+    elif out_dir.exists():
+        print(f"no reports; {out_dir.relative_to(REPO)}/ left as it was")
+    if (REPO / ".claude/.review-stamp").exists():
+        print("note: .claude/.review-stamp exists in the main tree; it was not written by this run")
+    return 0 if all(r["status"] in ("ok", "stale") for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,335 @@
+"""Run verify-spec fixtures concurrently, each against a sandbox holding only its spec file.
+
+```
+python3 scripts/evals/run-verify-spec.py --label unified-agent --verifier 'CMD'            # every fixture
+python3 scripts/evals/run-verify-spec.py --label probe --verifier stub sx-01 sx-03         # plumbing only
+python3 scripts/evals/run-verify-spec.py --label tier-check --verifier 'CMD' --model sonnet --date 2026-09-02
+```
+
+The verify-spec fixtures are self-contained spec documents — nothing is applied
+to or reverted from the working tree — yet `verify-spec/README.md` ran them one
+at a time, each dispatch waiting on the last. Here they are dispatched together
+(`-j`, default every fixture at once):
+
+- Each fixture gets a fresh temporary directory containing a copy of its
+  `*.spec.md` and nothing else, and the verifier runs there, with that directory
+  as its working directory and `CLAUDE_PROJECT_DIR`. The README's read
+  restriction — the spec file itself, not its `expected.md`, sibling fixtures or
+  the README — is then what the verifier can reach by relative path: there is
+  no `../expected.md` to wander into. A command that reads absolute paths can
+  still leave the sandbox, so the dispatch prompt it builds must still forbid it.
+- `--verifier` is any shell command. It receives `EVAL_FIXTURE`, `EVAL_SPEC` (the
+  spec's file name in the sandbox) and `EVAL_METRICS` in its environment and
+  must print its final return — `{ machine, ambiguities, counterexamples,
+  incomplete }` in a fenced JSON block — on stdout. It may write
+  `{"tokens": N, "candidates": N, "refuted": N}` to `EVAL_METRICS` (outside the
+  sandbox) for what only the dispatcher knows, such as the subagent's token
+  total; a `stats` object in the returned JSON is read the same way.
+  `--verifier stub` is a stand-in that formalizes the spec's states and actions,
+  lists what the sandbox let it see and confirms nothing, for testing this
+  script rather than a verifier.
+
+Each return is written verbatim to `verify-spec/results/<date>-<label>/sx-NN.md`
+under a short header naming the fixture, verifier and wall time, with the
+recorded metrics in a closing `stats` block (the shape
+`scripts/evals/cost-gate.py` reads). The run set's `<date>-<label>.md` is written
+too, with the per-fixture table — candidates, refuted, survivors, tokens, wall —
+that `scripts/evals/results-store.py` reads; its result column says "to score"
+until someone scores the returns against each `expected.md` and writes the
+narrative. Sandboxes are removed when the run ends, however it ends.
+
+Returns are written to a staging directory beside `results/<date>-<label>/` and
+moved into place, with the run set written after them, only when the run
+finishes with at least one return. So `--force` replaces the previous run set
+whole — a fixture left out of the new run leaves no old report behind to be
+read as part of it — while an interrupted run, or one in which every verifier
+failed, leaves the previous reports and the run set naming them as they were.
+"""
+
+import argparse
+import concurrent.futures
+import datetime
+import json
+import os
+import pathlib
+import re
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO = pathlib.Path(__file__).resolve().parents[2]
+EVAL = REPO / "scripts/evals/verify-spec"
+RESULTS = EVAL / "results"
+FENCE = re.compile(r"^```[\w-]*\n(.*?)^```", re.M | re.S)
+METRICS = ("candidates", "refuted", "tokens")
+
+
+def fixtures(names):
+    found = sorted(p for p in EVAL.glob("sx-*") if len(list(p.glob("*.spec.md"))) == 1)
+    if names:
+        wanted = set(names)
+        unknown = wanted - {p.name for p in found}
+        if unknown:
+            raise SystemExit(f"unknown fixture(s): {', '.join(sorted(unknown))}")
+        found = [p for p in found if p.name in wanted]
+    return found
+
+
+def parse_return(stdout):
+    """The last fenced JSON block carrying the verifier's return keys, or None."""
+    for block in reversed(FENCE.findall(stdout)):
+        try:
+            data = json.loads(block)
+        except ValueError:
+            continue
+        if isinstance(data, dict) and "counterexamples" in data:
+            return data
+    return None
+
+
+def read_metrics(returned, metrics_file):
+    """{metric: int} from the return's `stats`, then the metrics file, which wins."""
+    metrics = {}
+    for source in ((returned or {}).get("stats"), _load(metrics_file)):
+        if isinstance(source, dict):
+            metrics.update({k: int(source[k]) for k in METRICS if isinstance(source.get(k), (int, float))})
+    return metrics
+
+
+def _load(path):
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def run_fixture(root, fixture, verifier, timeout):
+    spec = next(fixture.glob("*.spec.md"))
+    work = root / fixture.name
+    sandbox = work / "sandbox"
+    sandbox.mkdir(parents=True)
+    shutil.copy2(spec, sandbox / spec.name)
+    metrics_file = work / "metrics.json"
+    env = {
+        **os.environ,
+        "CLAUDE_PROJECT_DIR": str(sandbox),
+        "EVAL_FIXTURE": fixture.name,
+        "EVAL_SPEC": spec.name,
+        "EVAL_METRICS": str(metrics_file),
+    }
+    if verifier == "stub":
+        command = [sys.executable, str(pathlib.Path(__file__).resolve()), "--stub-verify"]
+    else:
+        command = ["bash", "-c", verifier]
+    result = {"fixture": fixture.name, "spec": spec.name}
+    t0 = time.perf_counter()
+    # Its own process group, so a timeout takes the verifier's children with it.
+    proc = subprocess.Popen(
+        command, cwd=sandbox, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+        start_new_session=True,
+    )
+    try:
+        stdout, stderr = proc.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        os.killpg(proc.pid, signal.SIGKILL)
+        proc.communicate()
+        return {**result, "status": "timeout", "wall": time.perf_counter() - t0}
+    wall = time.perf_counter() - t0
+    returned = parse_return(stdout)
+    if proc.returncode == 0 and returned is not None:
+        status = "ok"
+    else:
+        status = "error" if proc.returncode or not stdout.strip() else "no-return"
+    survivors = [
+        c for c in (returned or {}).get("counterexamples") or []
+        if isinstance(c, dict) and str(c.get("verdict", "")).upper() != "REFUTED"
+    ]
+    return {
+        **result,
+        "status": status,
+        "exit": proc.returncode,
+        "wall": wall,
+        "report": stdout,
+        "stderr": stderr[-2000:],
+        "returned": returned,
+        "survivors": len(survivors) if returned is not None else None,
+        "incomplete": (returned or {}).get("incomplete"),
+        **read_metrics(returned, metrics_file),
+    }
+
+
+def save(result, out_dir, date, verifier):
+    header = (
+        f"# {result['fixture']} — returned spec verification, {date}\n\n"
+        f"Verbatim stdout of the verifier for this fixture, saved by\n"
+        f"`scripts/evals/run-verify-spec.py` (spec `{result['spec']}`, verifier `{verifier}`,\n"
+        f"exit {result['exit']}, {result['wall']:.0f}s wall).\n\n---\n\n"
+    )
+    stats = {k: result[k] for k in METRICS if k in result}
+    footer = (
+        "\n\n---\n\nRecorded by the runner (the return's `stats` and the verifier's metrics file):\n\n"
+        f"```json\n{json.dumps({'stats': stats}, indent=2)}\n```\n"
+    )
+    (out_dir / f"{result['fixture']}.md").write_text(header + result["report"].rstrip("\n") + footer)
+
+
+def _cell(value):
+    return "-" if value is None else str(value)
+
+
+def _tokens(value):
+    if value is None:
+        return "-"
+    return f"{value / 1000:.1f}k" if value >= 1000 else str(value)
+
+
+def save_run_set(results, path, date, label, verifier, model, wall):
+    title = f"# {label} — verify-spec run, {date}" + (f" ({model})" if model else "")
+    lines = [
+        title,
+        "",
+        f"Dispatched by `scripts/evals/run-verify-spec.py` with verifier `{verifier}`, "
+        f"{len(results)} fixture(s) at once in {wall:.0f}s wall; each verifier saw only its spec file.",
+        f"The verbatim returns are in `{path.stem}/`. Score them against each fixture's",
+        "`expected.md` per `../README.md` and replace \"to score\" with the result.",
+        "",
+        "## Per fixture",
+        "",
+        "| fixture | result | candidates | refuted | survivors | tokens | wall time |",
+        "|---|---|---|---|---|---|---|",
+    ]
+    for r in results:
+        result = "to score" if r["status"] == "ok" else f"not scored — {r['status']}"
+        if r.get("incomplete"):
+            result += " (incomplete)"
+        wall_cell = f"{r['wall']:.0f}s" if "wall" in r else "-"
+        lines.append(
+            f"| {r['fixture']} | {result} | {_cell(r.get('candidates'))} | {_cell(r.get('refuted'))} "
+            f"| {_cell(r.get('survivors'))} | {_tokens(r.get('tokens'))} | {wall_cell} |"
+        )
+    path.write_text("\n".join(lines) + "\n")
+
+
+def publish(staging, out_dir):
+    """Move a finished run's returns into place, replacing any previous ones; False if it wrote none."""
+    if not any(staging.iterdir()):
+        return False
+    shutil.rmtree(out_dir, ignore_errors=True)
+    staging.rename(out_dir)
+    return True
+
+
+def stub_verify():
+    """A deterministic stand-in verifier: formalizes states and actions, confirms nothing."""
+    spec = pathlib.Path(os.environ["EVAL_SPEC"])
+    text = spec.read_text()
+    states = re.search(r"^## States\n-\s*([^\n(]+)", text, re.M)
+    initial = re.search(r"^## Initial state\n(\S+)", text, re.M)
+    actions = [
+        {"name": cells[0], "from": cells[1], "to": cells[2]}
+        for cells in (
+            [c.strip() for c in line.strip().strip("|").split("|")]
+            for line in text.split("## Actions", 1)[-1].split("\n## ", 1)[0].splitlines()
+            if line.startswith("|")
+        )
+        if len(cells) >= 3 and cells[0] != "action" and not set(cells[0]) <= set("-: ")
+    ]
+    machine = {
+        "states": [s.strip() for s in states.group(1).split(",")] if states else [],
+        "initial": initial.group(1) if initial else None,
+        "actions": actions,
+    }
+    visible = sorted(str(p) for p in pathlib.Path(".").rglob("*") if p.is_file())
+    metrics = os.environ.get("EVAL_METRICS")
+    if metrics:
+        pathlib.Path(metrics).write_text(json.dumps({"tokens": 0}))
+    print("## Spec Verification Report\n")
+    print(f"Stub verifier; the sandbox holds {len(visible)} file(s):\n")
+    for name in visible:
+        print(f"- `{name}`")
+    print("\n```json")
+    print(json.dumps(
+        {
+            "machine": machine,
+            "ambiguities": [],
+            "counterexamples": [],
+            "incomplete": False,
+            "stats": {"candidates": 0, "refuted": 0},
+        },
+        indent=2,
+    ))
+    print("```")
+    return 0
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("fixtures", nargs="*", help="fixture names (default: every sx-NN with one *.spec.md)")
+    parser.add_argument("--label", help="run-set label, as in results/<date>-<label>.md")
+    parser.add_argument("--verifier", help="shell command run in each sandbox, or 'stub'")
+    parser.add_argument("--model", help="the verifier's model, named in the run set's title")
+    parser.add_argument("--date", default=datetime.date.today().isoformat())
+    parser.add_argument("-j", type=int, default=0, help="fixtures run at once (default: all)")
+    parser.add_argument("--timeout", type=float, default=1800, help="seconds per fixture")
+    parser.add_argument("--force", action="store_true", help="replace an existing run set and its reports")
+    parser.add_argument("--stub-verify", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.stub_verify:
+        return stub_verify()
+    if not args.label or not args.verifier:
+        parser.error("--label and --verifier are required")
+    selected = fixtures(args.fixtures)
+    if not selected:
+        parser.error("no fixtures")
+    run_set = RESULTS / f"{args.date}-{args.label}.md"
+    out_dir = RESULTS / f"{args.date}-{args.label}"
+    if (run_set.exists() or out_dir.exists()) and not args.force:
+        parser.error(f"{run_set.relative_to(REPO)} exists; pick another --label or pass --force")
+    replacing = run_set.exists()
+
+    root = pathlib.Path(tempfile.mkdtemp(prefix="verify-spec-"))
+    RESULTS.mkdir(parents=True, exist_ok=True)
+    staging = pathlib.Path(tempfile.mkdtemp(prefix=f".{out_dir.name}-", dir=RESULTS))
+    results = []
+    start = time.perf_counter()
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=args.j if args.j > 0 else len(selected)) as executor:
+            futures = [executor.submit(run_fixture, root, f, args.verifier, args.timeout) for f in selected]
+            for future in concurrent.futures.as_completed(futures):
+                result = future.result()
+                results.append(result)
+                if result.get("report"):
+                    save(result, staging, args.date, args.verifier)
+        published = publish(staging, out_dir)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+        shutil.rmtree(staging, ignore_errors=True)
+    wall = time.perf_counter() - start
+
+    results.sort(key=lambda r: r["fixture"])
+    if published or not replacing:
+        save_run_set(results, run_set, args.date, args.label, args.verifier, args.model, wall)
+    print(f"{'fixture':8s} {'status':9s} {'wall':>7s} {'cand':>5s} {'refuted':>7s} {'surv':>5s} {'tokens':>7s}")
+    for r in results:
+        shown = f"{r['wall']:6.1f}s" if "wall" in r else "      -"
+        print(
+            f"{r['fixture']:8s} {r['status']:9s} {shown} {_cell(r.get('candidates')):>5s} "
+            f"{_cell(r.get('refuted')):>7s} {_cell(r.get('survivors')):>5s} {_tokens(r.get('tokens')):>7s}"
+        )
+        if r["status"] == "error" and r.get("stderr"):
+            print("         " + r["stderr"].strip().splitlines()[-1])
+    serial = sum(r.get("wall", 0) for r in results)
+    print(f"\n{len(results)} fixture(s) in {wall:.1f}s wall ({serial:.1f}s if run one at a time)")
+    if published or not replacing:
+        print(f"run set in {run_set.relative_to(REPO)}")
+    else:
+        print(f"no returns; {run_set.relative_to(REPO)} and its reports left as they were")
+    return 0 if all(r["status"] == "ok" for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
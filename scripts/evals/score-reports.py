@@ -0,0 +1,299 @@
+"""Score saved review-diff reports against each fixture's expected.md: found, missed, false positive.
+
+```
+python3 scripts/evals/score-reports.py scripts/evals/review-diff/results/2026-08-07-unified-agent
+python3 scripts/evals/score-reports.py results/2026-09-02-r1 results/2026-09-02-r2 --json
+python3 scripts/evals/score-reports.py results/2026-09-02-r1 -v      # every finding and why it scored so
+```
+
+Scoring has been done by hand, fixture by fixture, by reading each report against
+`fx-NN/expected.md` — which caps how many repeated runs anyone can afford to
+score, and the scoring rules ask for repeated runs on close calls. This scores a
+whole results directory (`results/<date>-<label>/fx-NN.md`, as
+`scripts/evals/run-review-diff.py` saves them) at once, by the rules in
+`review-diff/README.md`:
+
+- A report's findings are the last fenced JSON block with a `findings` list in
+  it (the unified agent's Stage D return). Findings whose verdict is `REFUTED`
+  are dropped; CONFIRMED and PLAUSIBLE survive, and both can score as false
+  positives (fx-06's rule).
+- An expected finding is **found** when a surviving finding names the same file
+  and its title and description cover enough of the expected `nature`: the share
+  of the nature's content words (lowercased, lightly stemmed, function words
+  dropped) that appear in the finding, at least `MATCH`. Each finding matches at
+  most one expected entry, best pairs first.
+- A surviving finding nothing matched is an **acceptable extra** when it is on a
+  file the "Acceptable extras" list names, and a **false positive** otherwise —
+  including on a "Must NOT be flagged" file, which is what those lists are for.
+
+Some calls are left to a human rather than guessed, and listed under "needs a
+human": a finding on an expected file whose similarity falls between `REVIEW`
+and `MATCH` (the defect described in other words, or a different defect in the
+same file), a match whose severity is below the entry's `severity-floor`, and a
+second finding that matches an entry another finding already took (a duplicate
+Stage B let through — one defect, or two that read alike).
+Until someone decides, such a finding counts as neither found nor FP, and the
+expected entry as missed. A report with no findings block at all is an error for
+that fixture, not a clean sheet.
+
+Exit status: 0 when everything was decided, 1 when anything needs a human or a
+report could not be read.
+"""
+
+import argparse
+import json
+import pathlib
+import re
+import sys
+
+REPO = pathlib.Path(__file__).resolve().parents[2]
+EVAL = REPO / "scripts/evals/review-diff"
+MATCH = 0.35
+REVIEW = 0.12
+REPORT = re.compile(r"^(fx-\d+)\.md$")
+FENCE = re.compile(r"^```[\w-]*\n(.*?)^```", re.M | re.S)
+WORD = re.compile(r"[a-z0-9]+")
+PATH = re.compile(r"(?<![\w./-])((?:src|scripts|docs|tools|\.claude)/[\w./$@()\[\]-]+\.\w+)")
+SEVERITY = {"nit": 0, "suggestion": 0, "minor": 1, "major": 2, "critical": 3}
+STOPWORDS = frozenset(
+    """a an and are as at be been but by can does for from has have in into is it its
+    it's no not now of on or so such than that the their them then there these this
+    to was were which while with without must any all only one same""".split()
+)
+
+
+def _stem(word):
+    for suffix in ("ing", "ed", "es", "s"):
+        if len(word) > len(suffix) + 3 and word.endswith(suffix):
+            return word[: -len(suffix)]
+    return word
+
+
+def words(text):
+    return {_stem(w) for w in WORD.findall(text.lower()) if w not in STOPWORDS and len(w) > 1}
+
+
+def similarity(nature, finding):
+    """The share of the nature's content words that the finding's title and description use."""
+    wanted = words(nature)
+    said = words(f"{finding.get('title', '')} {finding.get('description', '')}")
+    return len(wanted & said) / len(wanted) if wanted else 0.0
+
+
+def _sections(text):
+    """{heading (lowercased, as far as its first parenthesis): body} for the ## sections."""
+    found = {}
+    for part in re.split(r"^## ", text, flags=re.M)[1:]:
+        heading, _, body = part.partition("\n")
+        found[heading.split("(")[0].strip().lower()] = body
+    return found
+
+
+def parse_expected(path):
+    """{base, expected: [{file, nature, severity_floor}], must_not: [files], extras: [{file, text}]}."""
+    text = path.read_text()
+    base = re.search(r"^base:\s*([0-9a-f]{7,40})\b", text, re.M)
+    sections = _sections(text)
+    expected = []
+    for item in re.split(r"^- ", sections.get("expected findings", ""), flags=re.M)[1:]:
+        fields = {}
+        key = None
+        for line in item.splitlines():
+            match = re.match(r"^\s*(file|nature|severity-floor|family):\s*(.*)$", line)
+            if match:
+                key = match.group(1)
+                fields[key] = match.group(2).strip()
+            elif key and line.strip():
+                fields[key] += " " + line.strip()
+        if "file" in fields:
+            expected.append(
+                {"file": fields["file"], "nature": fields.get("nature", ""), "severity_floor": fields.get("severity-floor")}
+            )
+    must_not = []
+    for heading, body in sections.items():
+        if heading.startswith("must not be flagged"):
+            must_not += [p for p in PATH.findall(body) if p not in must_not]
+    extras = []
+    for item in re.split(r"^- ", sections.get("acceptable extras", ""), flags=re.M)[1:]:
+        item = " ".join(item.split())
+        for file in PATH.findall(item):
+            extras.append({"file": file, "text": item})
+    return {"base": base.group(1) if base else None, "expected": expected, "must_not": must_not, "extras": extras}
+
+
+def parse_report(path):
+    """(findings, stats) from the last fenced JSON block with a findings list; ValueError if none."""
+    for block in reversed(FENCE.findall(path.read_text())):
+        try:
+            data = json.loads(block)
+        except ValueError:
+            continue
+        if isinstance(data, dict) and isinstance(data.get("findings"), list):
+            return data["findings"], data.get("stats") or {}
+    raise ValueError("no fenced JSON block with a findings list")
+
+
+def _file(value):
+    return str(value or "").strip().removeprefix("./")
+
+
+def score(spec, findings):
+    """Score one report's findings against one parsed expected.md."""
+    surviving = [f for f in findings if str(f.get("verdict", "")).upper() != "REFUTED"]
+    pairs = sorted(
+        (
+            (similarity(e["nature"], f), i, j)
+            for i, e in enumerate(spec["expected"])
+            for j, f in enumerate(surviving)
+            if _file(f.get("file")) == e["file"]
+        ),
+        reverse=True,
+    )
+    matched, used, review = {}, set(), []
+    for sim, i, j in pairs:
+        if sim < MATCH or i in matched or j in used:
+            continue
+        floor = SEVERITY.get(str(spec["expected"][i]["severity_floor"] or "").lower())
+        given = SEVERITY.get(str(surviving[j].get("severity", "")).lower())
+        if floor is not None and given is not None and given < floor:
+            review.append((j, f"matches {spec['expected'][i]['file']} ({sim:.2f}) but is {surviving[j].get('severity')}, "
+                              f"below the {spec['expected'][i]['severity_floor']} floor"))
+            used.add(j)
+            continue
+        matched[i] = (j, sim)
+        used.add(j)
+
+    open_files = {spec["expected"][i]["file"] for i in range(len(spec["expected"])) if i not in matched}
+    found_files = {spec["expected"][i]["file"] for i in matched}
+    extras_files = {x["file"] for x in spec["extras"]}
+    verdicts = []
+    for j, finding in enumerate(surviving):
+        file = _file(finding.get("file"))
+        best = max((sim for sim, _, jj in pairs if jj == j), default=0.0)
+        if j in used:
+            mine = [(i, sim) for i, (jj, sim) in matched.items() if jj == j]
+            if mine:
+                verdicts.append((finding, "found", f"{spec['expected'][mine[0][0]]['file']} ({mine[0][1]:.2f})"))
+            else:
+                verdicts.append((finding, "review", next(r for jj, r in review if jj == j)))
+        elif file in open_files and best >= REVIEW:
+            reason = f"on an expected file, similarity {best:.2f} is between {REVIEW} and {MATCH}"
+            review.append((j, reason))
+            verdicts.append((finding, "review", reason))
+        elif file in found_files and best >= MATCH:
+            reason = f"repeats an expected finding already matched on {file} ({best:.2f})"
+            review.append((j, reason))
+            verdicts.append((finding, "review", reason))
+        elif file in extras_files:
+            verdicts.append((finding, "extra", "an acceptable extra's file"))
+        else:
+            note = "a must-not-flag file" if file in spec["must_not"] else "not in expected.md"
+            verdicts.append((finding, "fp", note))
+    return {
+        "expected": len(spec["expected"]),
+        "found": len(matched),
+        "missed": [e for i, e in enumerate(spec["expected"]) if i not in matched],
+        "fp": sum(1 for _, v, _ in verdicts if v == "fp"),
+        "extras": sum(1 for _, v, _ in verdicts if v == "extra"),
+        "review": len(review),
+        "verdicts": verdicts,
+    }
+
+
+def score_directory(directory):
+    """[(fixture, result or None, error or None)] for every fx-NN.md in `directory`."""
+    scored = []
+    for report in sorted(directory.iterdir()):
+        name = REPORT.match(report.name)
+        if not name:
+            continue
+        fixture = name.group(1)
+        expected = EVAL / fixture / "expected.md"
+        if not expected.is_file():
+            scored.append((fixture, None, f"no {expected.relative_to(REPO)}"))
+            continue
+        try:
+            findings, stats = parse_report(report)
+        except ValueError as exc:
+            scored.append((fixture, None, str(exc)))
+            continue
+        result = score(parse_expected(expected), findings)
+        result["candidates"], result["refuted"] = stats.get("candidates"), stats.get("refuted")
+        scored.append((fixture, result, None))
+    return scored
+
+
+def _shown(value):
+    return "-" if value is None else str(value)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("directories", nargs="+", type=pathlib.Path, help="results/<date>-<label>/ directories")
+    parser.add_argument("--json", action="store_true", help="print the scores as JSON")
+    parser.add_argument("-v", "--verbose", action="store_true", help="list every surviving finding's verdict")
+    args = parser.parse_args(argv)
+
+    undecided = 0
+    everything = {}
+    for directory in args.directories:
+        if not directory.is_dir():
+            candidate = EVAL / directory
+            if not candidate.is_dir():
+                parser.error(f"{directory}: not a directory")
+            directory = candidate
+        scored = score_directory(directory)
+        if not scored:
+            parser.error(f"{directory}: no fx-NN.md reports")
+        everything[directory.name] = scored
+        undecided += sum(1 for _, result, error in scored if error or result["review"])
+
+    if args.json:
+        print(json.dumps(
+            {
+                run: {
+                    fixture: {"error": error} if error else {
+                        **{k: v for k, v in result.items() if k not in ("verdicts", "missed")},
+                        "missed": [e["file"] for e in result["missed"]],
+                        "findings": [
+                            {"file": f.get("file"), "line": f.get("line"), "title": f.get("title"), "score": v, "why": why}
+                            for f, v, why in result["verdicts"]
+                        ],
+                    }
+                    for fixture, result, error in scored
+                }
+                for run, scored in everything.items()
+            },
+            indent=2,
+        ))
+        return 1 if undecided else 0
+
+    for run, scored in everything.items():
+        print(f"{run}\n")
+        print(f"{'fixture':8s} {'expected':>8s} {'found':>6s} {'FP':>3s} {'extras':>6s} {'cand':>5s} {'refuted':>7s}  needs a human")
+        totals = [0, 0, 0, 0]
+        for fixture, result, error in scored:
+            if error:
+                print(f"{fixture:8s} {'-':>8s} {'-':>6s} {'-':>3s} {'-':>6s} {'-':>5s} {'-':>7s}  unreadable: {error}")
+                continue
+            totals = [a + b for a, b in zip(totals, (result["expected"], result["found"], result["fp"], result["extras"]))]
+            print(
+                f"{fixture:8s} {result['expected']:8d} {result['found']:>4d}/{result['expected']} {result['fp']:3d} "
+                f"{result['extras']:6d} {_shown(result['candidates']):>5s} {_shown(result['refuted']):>7s}  "
+                f"{result['review'] or '-'}"
+            )
+            for finding, verdict, why in result["verdicts"]:
+                if args.verbose or verdict == "review":
+                    where = f"{finding.get('file')}:{finding.get('line', '?')}"
+                    print(f"         {verdict:6s} {where} — {why}")
+            if args.verbose:
+                for missed in result["missed"]:
+                    print(f"         missed {missed['file']}")
+        print(f"{'total':8s} {totals[0]:8d} {totals[1]:>4d}/{totals[0]} {totals[2]:3d} {totals[3]:6d}\n")
+    if undecided:
+        print(f"{undecided} fixture(s) need a human before these scores are final")
+    return 1 if undecided else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,276 @@
+"""Split a reviewer's transcript into Stages A–D and attribute tokens, tool calls, reads and time to each.
+
+```
+python3 scripts/evals/stage-breakdown.py TRANSCRIPT                       # table on stdout
+python3 scripts/evals/stage-breakdown.py TRANSCRIPT --report results/2026-08-07-unified-agent/fx-01.md
+python3 scripts/evals/stage-breakdown.py TRANSCRIPT --agent a1b2c3 --json
+```
+
+The results files give one token total and one wall time per fixture, and the
+question the 2026-08-07 run was meant to answer — does Stage C still refute, now
+that one `code-reviewer` runs Stages A find → B dedup → C refute → D return in a
+single context (ADR-0029) — is about one stage of that. This reads the run's
+transcript (JSONL, the shape `scripts/transcript-index.py` reads) and splits it
+where the agent says a stage begins: an assistant text block with a line that
+opens with `Stage X` — as a heading, in bold or plain, `Stage A/B` counting as
+B. Stages only move forward, so a recap of earlier stages re-enters none of
+them. Everything before the first marker is Stage A, which starts at dispatch,
+and the final message — the returned report, with no tool call after it — is
+Stage D whatever it says: the reports open with a Stage A/B/C tally and rarely
+name D. Tool results and thinking are never read for markers; a file the agent
+reads may well say "Stage C".
+
+Per stage:
+
+- **context tokens** — how much the agent's context grew during the stage
+  (input + cache reads + cache writes + output of its last turn, less the
+  previous stage's), so the stages sum to the context at the end, which is the
+  total the results tables record; **output tokens** and **turns** beside it.
+  A transcript writes one record per content block of a message, each carrying
+  the message's usage, so usage is counted once per message id.
+- **tool calls** by tool name, and **files read** — `Read` paths, relative to the
+  agent's working directory.
+- **elapsed** — from the stage's first record to the next stage's first (the
+  last record for Stage D), from record timestamps; `-` when there are none.
+
+The split is only as fine as the agent's own stage headings. An agent that works
+silently and writes one report at the end yields "A: everything, D: the report";
+the output says when fewer than four stages were announced rather than inventing
+boundaries.
+
+A transcript holding several agents' sidechains (a parent session's, with the
+subagents inline) is narrowed with `--agent`; with one sidechain agent it is
+picked, and with none the whole file is the agent's. With `--report
+results/<date>-<label>/fx-NN.md` the breakdown is written next to that verbatim
+report as `fx-NN.stages.md`.
+"""
+
+import argparse
+import collections
+import datetime
+import json
+import pathlib
+import re
+import sys
+
+REPO = pathlib.Path(__file__).resolve().parents[2]
+STAGES = {"A": "find", "B": "dedup", "C": "refute", "D": "return"}
+MARKER = re.compile(r"^\s*(?:#{1,6}\s*|\*\*|[-*]\s+)?Stage\s+([A-D])(?:\s*/\s*([A-D]))?\b", re.M)
+READ_TOOLS = ("Read",)
+
+
+def records(path):
+    """Parsed records; lines that do not parse (a torn last line) are skipped."""
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict):
+                yield record
+
+
+def _blocks(record, kind):
+    message = record.get("message")
+    content = message.get("content") if isinstance(message, dict) else None
+    if not isinstance(content, list):
+        return []
+    return [b for b in content if isinstance(b, dict) and b.get("type") == kind]
+
+
+def select_agent(all_records, agent):
+    """The records of one agent: `agent`'s sidechain, the only sidechain, or the whole file."""
+    sidechain = [r for r in all_records if r.get("isSidechain")]
+    if not sidechain:
+        if agent:
+            raise SystemExit(f"no sidechain records, so no agent {agent}")
+        return all_records, None
+    agents = list(dict.fromkeys(r.get("agentId") for r in sidechain))
+    if agent:
+        chosen = [r for r in sidechain if r.get("agentId") == agent]
+        if not chosen:
+            raise SystemExit(f"no agent {agent}; agents here: {', '.join(map(str, agents))}")
+        return chosen, agent
+    if len(agents) > 1:
+        raise SystemExit(f"{len(agents)} agents in this transcript; pick one with --agent ({', '.join(map(str, agents))})")
+    return sidechain, agents[0]
+
+
+def marker(record):
+    """The latest stage an assistant text block announces, or None."""
+    if record.get("type") != "assistant":
+        return None
+    found = []
+    for block in _blocks(record, "text"):
+        for m in MARKER.finditer(block.get("text", "")):
+            found.append(m.group(2) or m.group(1))
+    return max(found) if found else None
+
+
+def timestamp(record):
+    value = record.get("timestamp")
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def context_size(usage):
+    return sum(
+        usage.get(k) or 0
+        for k in ("input_tokens", "cache_read_input_tokens", "cache_creation_input_tokens", "output_tokens")
+    )
+
+
+def breakdown(agent_records):
+    """[{stage, ...metrics}] in stage order, for the stages that occur."""
+    stages = {}
+    current = "A"
+    cwd = None
+    messages = {}
+    report = None
+    for i, record in enumerate(agent_records):
+        if _blocks(record, "tool_use"):
+            report = None
+        elif report is None and record.get("type") == "assistant" and _blocks(record, "text"):
+            report = i
+    for i, record in enumerate(agent_records):
+        cwd = cwd or record.get("cwd")
+        announced = "D" if i == report else marker(record)
+        if announced and announced > current:
+            current = announced
+        stage = stages.setdefault(
+            current,
+            {"stage": current, "tools": collections.Counter(), "files": [], "first": None, "last": None, "records": 0},
+        )
+        stage["records"] += 1
+        when = timestamp(record)
+        if when:
+            stage["first"] = stage["first"] or when
+            stage["last"] = when
+        message = record.get("message") if isinstance(record.get("message"), dict) else {}
+        if record.get("type") == "assistant" and isinstance(message.get("usage"), dict):
+            # Later records of one message repeat its usage; the stage it ends in owns it.
+            messages[message.get("id") or id(record)] = (current, message["usage"])
+        for use in _blocks(record, "tool_use"):
+            stage["tools"][use.get("name", "?")] += 1
+            path = (use.get("input") or {}).get("file_path")
+            if use.get("name") in READ_TOOLS and isinstance(path, str):
+                if cwd and path.startswith(cwd.rstrip("/") + "/"):
+                    path = path[len(cwd.rstrip("/")) + 1:]
+                if path not in stage["files"]:
+                    stage["files"].append(path)
+
+    by_stage = collections.defaultdict(list)
+    for stage, usage in messages.values():
+        by_stage[stage].append(usage)
+    ordered = [stages[s] for s in sorted(stages)]
+    previous = 0
+    for i, stage in enumerate(ordered):
+        usages = by_stage.get(stage["stage"], [])
+        end = context_size(usages[-1]) if usages else previous
+        stage["context_tokens"] = end - previous
+        stage["output_tokens"] = sum(u.get("output_tokens") or 0 for u in usages)
+        stage["turns"] = len(usages)
+        previous = end
+        following = ordered[i + 1]["first"] if i + 1 < len(ordered) else None
+        finish = following or stage["last"]
+        stage["elapsed_s"] = (finish - stage["first"]).total_seconds() if stage["first"] and finish else None
+    return ordered
+
+
+def _tokens(value):
+    return f"{value / 1000:.1f}k" if value >= 1000 else str(value)
+
+
+def render(stages, source, agent, fixture=None, date=None):
+    title = f"# {fixture} — per-stage breakdown" + (f", {date}" if date else "") if fixture else "# Per-stage breakdown"
+    lines = [
+        title,
+        "",
+        f"Derived by `scripts/evals/stage-breakdown.py` from `{source}`" + (f" (agent {agent})" if agent else "") + ".",
+    ]
+    if fixture:
+        lines.append(f"The verbatim report is `{fixture}.md`.")
+    lines += [
+        "Context tokens are the growth of the agent's context during the stage and sum to the run's total.",
+        "",
+        "| stage | context tokens | output tokens | turns | tool calls | files read | elapsed |",
+        "|---|---|---|---|---|---|---|",
+    ]
+    for s in stages:
+        tools = sum(s["tools"].values())
+        named = ", ".join(f"{name} {n}" for name, n in s["tools"].most_common())
+        elapsed = f"{s['elapsed_s']:.0f}s" if s["elapsed_s"] is not None else "-"
+        lines.append(
+            f"| {s['stage']} — {STAGES[s['stage']]} | {_tokens(s['context_tokens'])} | {_tokens(s['output_tokens'])} "
+            f"| {s['turns']} | {tools}{f' ({named})' if named else ''} | {len(s['files'])} | {elapsed} |"
+        )
+    total_elapsed = [s["elapsed_s"] for s in stages if s["elapsed_s"] is not None]
+    lines.append(
+        f"| **total** | **{_tokens(sum(s['context_tokens'] for s in stages))}** "
+        f"| {_tokens(sum(s['output_tokens'] for s in stages))} | {sum(s['turns'] for s in stages)} "
+        f"| {sum(sum(s['tools'].values()) for s in stages)} | {len({f for s in stages for f in s['files']})} "
+        f"| {f'{sum(total_elapsed):.0f}s' if total_elapsed else '-'} |"
+    )
+    missing = [k for k in STAGES if k not in {s["stage"] for s in stages}]
+    if missing:
+        lines += [
+            "",
+            f"Stage{'s' * (len(missing) > 1)} {', '.join(missing)} {'were' if len(missing) > 1 else 'was'} never "
+            "announced, so its work is counted in the stage before it.",
+        ]
+    if any(s["files"] for s in stages):
+        lines += ["", "## Files read", ""]
+        for s in stages:
+            if s["files"]:
+                lines.append(f"- **{s['stage']}**: " + ", ".join(f"`{f}`" for f in s["files"]))
+    return "\n".join(lines) + "\n"
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("transcript", type=pathlib.Path)
+    parser.add_argument("--agent", help="the sidechain agentId to read, when the transcript has several")
+    parser.add_argument("--report", type=pathlib.Path, help="a verbatim fx-NN.md report; write fx-NN.stages.md beside it")
+    parser.add_argument("--json", action="store_true", help="print the breakdown as JSON")
+    args = parser.parse_args(argv)
+
+    agent_records, agent = select_agent(list(records(args.transcript)), args.agent)
+    if not agent_records:
+        parser.error(f"{args.transcript}: no records")
+    stages = breakdown(agent_records)
+    if args.json:
+        print(json.dumps(
+            [
+                {
+                    **{k: v for k, v in s.items() if k not in ("first", "last", "tools")},
+                    "name": STAGES[s["stage"]],
+                    "tools": dict(s["tools"]),
+                }
+                for s in stages
+            ],
+            indent=2,
+        ))
+        return 0
+    if args.report:
+        if not args.report.is_file():
+            parser.error(f"{args.report}: no such report")
+        date = re.match(r"\d{4}-\d{2}-\d{2}", args.report.parent.name)
+        text = render(stages, args.transcript.name, agent, args.report.stem, date.group() if date else None)
+        out = args.report.with_name(f"{args.report.stem}.stages.md")
+        out.write_text(text)
+        print(f"wrote {out}")
+        return 0
+    sys.stdout.write(render(stages, args.transcript.name, agent))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
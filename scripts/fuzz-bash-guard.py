@@ -0,0 +1,310 @@
+"""Differential fuzzing of .claude/hooks/pre-bash-guard.sh against its Python model.
+
+```
+python3 scripts/fuzz-bash-guard.py                    # 2000 commands, seed 0
+python3 scripts/fuzz-bash-guard.py -n 20000 --seed 7  # more, elsewhere
+python3 scripts/fuzz-bash-guard.py --model-only -n 1000000  # model throughput
+```
+
+Generates shell commands from a small grammar built out of the shapes
+`scripts/test-bash-guard.py` already pins — `find` roots and actions, env-file
+readers, every spelling of a commit the guard has been shown to miss — glued
+together with separators, subshells, substitutions and heredocs. Each command is
+put to `scripts/bash-guard-model.py` and to the real hook, in both stamp states,
+and every disagreement is shrunk to a minimal reproducer before it is reported.
+
+A disagreement means one of two things, and this tool cannot tell which: the model
+is wrong about the hook, or the hook is wrong about the shell. Either way the
+reproducer belongs in `test-bash-guard.py` as a pinned case, with the expected
+decision taken from what bash really does with the command — not from the model,
+and not from the hook.
+
+The hook has no batch mode: it reads one payload and exits. Hook calls are
+therefore fanned out across a thread pool (`-j`), each one its own bash process;
+the model runs in-process and is never the bottleneck. Nothing in the repository
+is touched — the two project directories the hook is pointed at, one stamped and
+one not, are created under the system temp directory and removed at exit, and no
+generated command is ever executed. Exits non-zero when any disagreement is found.
+"""
+
+import argparse
+import atexit
+import concurrent.futures
+import importlib.util
+import json
+import os
+import pathlib
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO = pathlib.Path(__file__).resolve().parent.parent
+HOOK = REPO / ".claude/hooks/pre-bash-guard.sh"
+
+_spec = importlib.util.spec_from_file_location("bash_guard_model", REPO / "scripts/bash-guard-model.py")
+MODEL = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(MODEL)
+
+# Split so this file's own text is not itself a commit-shaped command.
+VERB = "com" + "mit"
+LAND = "git " + VERB
+
+# --- the grammar ---------------------------------------------------------------
+#
+# A command is a tree so that shrinking can remove whole pieces of it:
+#   ("seq", [(node, separator), ...])   statements, each followed by its separator
+#   ("wrap", kind, node)                a grouping construct around a sub-command
+#   ("word", [token, ...])              one simple statement, already shell text
+#   ("heredoc", [token, ...], body)     a statement carrying a heredoc; always last
+
+FIND_ROOTS = (
+    "src", "docs", "./src/lib", "node_modules/vitest", "src/components",
+    ".", "./", "..", "/", "~", "$HOME", '"$HOME"', "'.'", '"."', '".."',
+    "src/../", "/tmp", "~/src", "./.", "src/..",
+)
+FIND_PREDICATES = (
+    "-type f", "-type d", "-name '*.ts'", "-newer README.md", "-maxdepth 1",
+    "-name '../x'", "( -name a -o -name b )", "! -name '*.md'",
+    "-delete", "'-delete'", "-exec cat {} ;", '"-exec" cat {} +', "-execdir ls {} ;",
+    "-ok rm {} ;", "-okdir rm {} ;", "-fls /tmp/out", "-fprint /tmp/out", "-fprint0 /tmp/out",
+    "-print", "-print0",
+)
+FILES = (
+    ".env", ".env.local", ".env.local.example", ".env.production", ".env.development",
+    ".env.example", ".envrc", "config/.env", "README.md", "src/lib/utils.ts",
+    "my.env", ".env-backup", "docs/.env.sample",
+)
+READERS = ("cat", "grep SECRET", "head", "tail -n 5", "ls -la", "wc -l", "less")
+COMMIT_SHAPES = (
+    f"{LAND} -m x",
+    f"{LAND}",
+    f"git '{VERB}' -m x",
+    f'git "{VERB}"',
+    f"git${{IFS}}{VERB} -m x",
+    f"git $IFS{VERB} -m x",
+    "git co\\\nmm\\\nit -m x",
+    f"git -C sub {VERB} -m x",
+    f"git --no-pager {VERB}",
+    f"{LAND} --amend --no-edit",
+    f"{LAND} -m 'mention .env in prose'",
+    f"{LAND} -m \"find . -type f\"",
+)
+NON_COMMIT_GIT = (
+    "git status",
+    f"git log --grep={VERB}",
+    f"git checkout -b feature/{VERB}-fix",
+    "git add -A",
+    "git diff HEAD",
+    f"git show '{VERB}'",
+    f"echo {VERB}",
+    f"echo git {VERB}",
+)
+TAILS = ("xargs cat", "xargs grep -l useState", "sort", "head -n 3", "wc -l", "true")
+SEPARATORS = (" ; ", ";", " && ", "&&", " || ", " | ", "|", "\n", " & ")
+WRAPS = ("subshell", "dollar", "backtick", "brace", "if", "cd")
+HEREDOC_BODIES = (
+    "refuse find . -type f | xargs cat and -delete",
+    "find / -delete",
+    f"run {LAND} when ready",
+    "cat .env.local",
+    "plain prose",
+)
+
+
+def gen_word(rng):
+    kind = rng.random()
+    if kind < 0.35:
+        tokens = ["find"] + rng.sample(FIND_ROOTS, rng.choice((0, 1, 1, 1, 2)))
+        tokens += rng.sample(FIND_PREDICATES, rng.choice((0, 1, 1, 2)))
+        return ("word", tokens)
+    if kind < 0.55:
+        return ("word", [rng.choice(READERS), rng.choice(FILES)])
+    if kind < 0.75:
+        return ("word", [rng.choice(COMMIT_SHAPES)])
+    if kind < 0.9:
+        return ("word", [rng.choice(NON_COMMIT_GIT)])
+    return ("word", [rng.choice(TAILS)])
+
+
+def gen_node(rng, depth=0):
+    statements = []
+    for _ in range(rng.choice((1, 1, 2, 2, 3))):
+        if depth < 2 and rng.random() < 0.2:
+            node = ("wrap", rng.choice(WRAPS), gen_node(rng, depth + 1))
+        else:
+            node = gen_word(rng)
+        statements.append((node, rng.choice(SEPARATORS)))
+    if depth == 0 and rng.random() < 0.15:
+        opener = rng.choice(("cat", f"{LAND} -F -", "git add x && " + LAND + " -F -"))
+        statements.append((("heredoc", [opener], rng.choice(HEREDOC_BODIES)), ""))
+    return ("seq", statements)
+
+
+def render(node):
+    tag = node[0]
+    if tag == "word":
+        return " ".join(node[1])
+    if tag == "heredoc":
+        return f"{' '.join(node[1])} <<'EOF'\n{node[2]}\nEOF"
+    if tag == "wrap":
+        inner = render(node[2])
+        return {
+            "subshell": f"({inner})",
+            "dollar": f"$({inner})",
+            "backtick": f"`{inner}`",
+            "brace": f"{{ {inner}; }}",
+            "if": f"if true; then {inner}; fi",
+            "cd": f"(cd sub && {inner})",
+        }[node[1]]
+    parts = []
+    for i, (child, sep) in enumerate(node[1]):
+        parts.append(render(child))
+        if i < len(node[1]) - 1:
+            parts.append(sep)
+    return "".join(parts)
+
+
+def reductions(node):
+    """Yield every tree one step smaller than `node`, simplest steps first."""
+    tag = node[0]
+    if tag == "seq":
+        children = node[1]
+        if len(children) > 1:
+            for i in range(len(children)):
+                yield ("seq", children[:i] + children[i + 1 :])
+        for i, (child, sep) in enumerate(children):
+            if sep not in (" ; ", ""):
+                yield ("seq", children[:i] + [(child, " ; ")] + children[i + 1 :])
+            for smaller in reductions(child):
+                yield ("seq", children[:i] + [(smaller, sep)] + children[i + 1 :])
+    elif tag == "wrap":
+        yield node[2]
+        for smaller in reductions(node[2]):
+            yield ("wrap", node[1], smaller)
+    elif tag == "word" and len(node[1]) > 1:
+        # Keep the command word; every other token may go.
+        for i in range(1, len(node[1])):
+            yield ("word", node[1][:i] + node[1][i + 1 :])
+    elif tag == "heredoc":
+        yield ("word", node[1])
+
+
+# --- running the hook ----------------------------------------------------------
+
+_TMP = tempfile.TemporaryDirectory(prefix="bash-guard-fuzz-")
+atexit.register(_TMP.cleanup)
+PROJECTS = {False: pathlib.Path(_TMP.name) / "unstamped", True: pathlib.Path(_TMP.name) / "stamped"}
+for _project in PROJECTS.values():
+    (_project / ".claude").mkdir(parents=True)
+(PROJECTS[True] / ".claude/.review-stamp").touch()
+
+
+def hook_decision(command, stamped):
+    """The real hook's decision, read the way test-bash-guard.py reads it."""
+    payload = {"tool_name": "Bash", "tool_input": {"command": command}}
+    out = subprocess.run(
+        ["bash", str(HOOK)],
+        input=json.dumps(payload),
+        capture_output=True,
+        text=True,
+        env={**os.environ, "CLAUDE_PROJECT_DIR": str(PROJECTS[stamped])},
+    ).stdout.strip()
+    if not out:
+        return "allow"
+    parsed = json.loads(out)
+    if parsed.get("decision") == "block":
+        return "block"
+    return parsed.get("hookSpecificOutput", {}).get("permissionDecision") or "allow"
+
+
+def disagrees(pool, cases):
+    """Map each (command, stamped) case to True when model and hook differ."""
+    hooked = pool.map(lambda case: hook_decision(*case), cases)
+    return [MODEL.decide(c, s)[0] != h for (c, s), h in zip(cases, hooked)]
+
+
+def shrink(pool, node, stamped):
+    """Greedy reduction: take the first one-step-smaller tree that still disagrees.
+
+    Candidates for one step are judged in parallel, so a step costs one round of
+    hook calls rather than one call per candidate.
+    """
+    while True:
+        candidates = list(dict.fromkeys(render(n) for n in reductions(node)))
+        if not candidates:
+            return node
+        verdicts = disagrees(pool, [(c, stamped) for c in candidates])
+        by_text = {render(n): n for n in reductions(node)}
+        for text, bad in zip(candidates, verdicts):
+            if bad:
+                node = by_text[text]
+                break
+        else:
+            return node
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", type=int, default=2000, help="commands to generate")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-j", type=int, default=os.cpu_count() or 4, help="concurrent hook processes")
+    parser.add_argument("--max-reports", type=int, default=10, help="disagreements to shrink and print")
+    parser.add_argument("--model-only", action="store_true", help="time the model alone; no hook is run")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    trees = [(tree, stamped) for tree in (gen_node(rng) for _ in range(args.n)) for stamped in (False, True)]
+
+    if args.model_only:
+        start = time.perf_counter()
+        blocked = sum(MODEL.decide(render(t), s)[0] == "block" for t, s in trees)
+        elapsed = time.perf_counter() - start
+        print(
+            f"model: {args.n} commands x 2 stamp states in {elapsed:.2f}s "
+            f"({len(trees) / elapsed:,.0f}/s), {blocked} blocked"
+        )
+        return 0
+
+    if not HOOK.exists():
+        print(f"{os.path.relpath(HOOK, REPO)} not found — nothing to compare the model against")
+        return 2
+
+    # Distinct (command, stamp) pairs only: the grammar repeats itself a lot, and
+    # a repeat costs a bash process while telling us nothing new.
+    unique = {}
+    for tree, stamped in trees:
+        unique.setdefault((render(tree), stamped), tree)
+    cases = list(unique)
+
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=args.j) as pool:
+        verdicts = disagrees(pool, cases)
+        elapsed = time.perf_counter() - start
+        found = [case for case, bad in zip(cases, verdicts) if bad]
+        print(
+            f"{len(cases)} distinct (command, stamp) cases ({args.n} generated, seed {args.seed}) "
+            f"in {elapsed:.1f}s, {len(cases) / elapsed:,.0f}/s with -j {args.j}"
+        )
+        if not found:
+            print("model and hook agree on every command")
+            return 0
+
+        print(f"\nDisagreements: {len(found)} (shrinking the first {min(len(found), args.max_reports)})")
+        reported = set()
+        for command, stamped in found[: args.max_reports]:
+            minimal = render(shrink(pool, unique[(command, stamped)], stamped))
+            if (minimal, stamped) in reported:
+                continue
+            reported.add((minimal, stamped))
+            decision, guard = MODEL.decide(minimal, stamped)
+            print(f"  {'stamped  ' if stamped else 'unstamped'} {minimal!r}")
+            print(f"      hook: {hook_decision(minimal, stamped):5s}  model: {decision} ({guard or 'no guard'})")
+    print("\nPin each reproducer in scripts/test-bash-guard.py with the decision bash")
+    print("itself justifies, then fix whichever of the hook or the model was wrong.")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,19 @@
+#!/usr/bin/env bash
+# Opt-in traffic recorder in front of a registered hook (see scripts/hook-traffic.py).
+#
+# Registered as a prefix to a hook's command in .claude/settings.json:
+#
+#   "$CLAUDE_PROJECT_DIR/scripts/hook-record.sh" "$CLAUDE_PROJECT_DIR/.claude/hooks/pre-bash-guard.sh"
+#
+# With HOOK_RECORD unset this is one `exec` and the hook runs exactly as it would
+# have — same stdin, same arguments, same exit status — so leaving the prefix in
+# place costs nothing measurable. With HOOK_RECORD set to a log path, the Python
+# recorder runs the hook instead and appends the payload, the decision and the
+# duration to that log. Recording is therefore chosen per session, at launch, and
+# never by anything the session itself can write.
+set -eu
+
+if [ -z "${HOOK_RECORD:-}" ]; then
+  exec "$@"
+fi
+exec python3 "$(dirname "$0")/hook-traffic.py" record "$@"
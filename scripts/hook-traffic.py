@@ -0,0 +1,353 @@
+"""Record real hook traffic, and replay it against the current hooks.
+
+```
+HOOK_RECORD=.claude/.hook-traffic.ndjson.gz claude      # record a session
+python3 scripts/hook-traffic.py summary .claude/.hook-traffic.ndjson.gz
+python3 scripts/hook-traffic.py replay .claude/.hook-traffic.ndjson.gz
+python3 scripts/hook-traffic.py replay LOG --against HEAD  # old hooks vs new, same machine
+```
+
+The harnesses drive the hooks with synthetic payloads — `dispatch()`, `stop()`,
+`session_start()` — each shaped after a capture someone made by hand. Real sessions
+send richer payloads, thousands of them, and a hook edit is currently judged against
+a few dozen. This records the real ones and replays them.
+
+**Recording** is opt-in twice over: a hook's registration must be prefixed with
+`scripts/hook-record.sh`, and the session must be launched with `HOOK_RECORD` set
+to a log path (relative paths resolve against `$CLAUDE_PROJECT_DIR`). Each call
+appends one gzip member holding one NDJSON line: the hook (its path relative to
+the project, so a `.cursor/hooks/` hook replays as itself and not as the
+`.claude/hooks/` one of the same name), its arguments, the raw stdin payload,
+stdout, exit status, wall time, and which `.claude/.*` marker files existed
+before and after — a stamping hook's decision *is* its effect on those
+files, so stdout alone would say nothing about it. Concatenated gzip members are a
+valid gzip stream, so concurrent hooks append under `flock` without ever rewriting
+the file. The log holds prompt text and command lines verbatim: keep it where the
+markers live, untracked, and do not attach it to anything.
+
+**Replay** copies `.claude/` and `.cursor/` into throwaway git repositories under
+the system temp directory, one per worker, and runs each recorded call there with
+the marker files set to what they were before the original call. It reports every call whose
+decision or marker effect now differs, and each hook whose median or p95 latency
+regressed. Recorded durations come from whatever machine recorded them, so a
+latency comparison against them is only indicative; `--against REF` replays the
+same traffic through the hooks as they were at `REF` on this machine and compares
+the two replays instead, which is the comparison a hook edit should be judged on.
+
+What replay cannot reproduce is named rather than hidden: a payload's
+`transcript_path` and `cwd` point at the recording machine, and any state outside
+`.claude/.*` (the git tree the Stop gate inspects, the network) is whatever the
+sandbox has. Differences that trace back to those are the sandbox, not the edit.
+Exits non-zero when any decision differs or any latency regressed.
+"""
+
+import argparse
+import concurrent.futures
+import fcntl
+import gzip
+import json
+import os
+import pathlib
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO = pathlib.Path(__file__).resolve().parent.parent
+HOOK_TREES = (".claude", ".cursor")
+
+
+def markers(project_dir):
+    """The `.claude/.*` marker files present in `project_dir`, sorted."""
+    root = pathlib.Path(project_dir) / ".claude"
+    if not root.is_dir():
+        return []
+    return sorted(p.name for p in root.iterdir() if p.name.startswith(".") and p.is_file())
+
+
+def decision(stdout):
+    """Reduce a hook's stdout to the decision it expresses.
+
+    The same reading the harnesses use: an empty stdout stays out of the way, and
+    `decision: block` or a PreToolUse `permissionDecision` is the verdict. Anything
+    else a hook prints (a `systemMessage`, a `followup_message`) is kept as
+    'message', so a hook that starts or stops talking is a visible difference.
+    """
+    text = stdout.strip()
+    if not text:
+        return "allow"
+    try:
+        parsed = json.loads(text)
+    except ValueError:
+        return "message"
+    if not isinstance(parsed, dict):
+        return "message"
+    if parsed.get("decision") == "block":
+        return "block"
+    permission = parsed.get("hookSpecificOutput", {}).get("permissionDecision")
+    return permission or "message"
+
+
+def hook_name(project, command):
+    """The hook's path relative to the project (`.cursor/hooks/x.sh`), or as given outside it."""
+    path = pathlib.Path(command)
+    try:
+        return path.resolve().relative_to(project.resolve()).as_posix()
+    except ValueError:
+        return command
+
+
+def hook_file(root, name):
+    """Where a recorded hook lives under `root`; a bare name is a log from before paths were kept."""
+    return root / (name if "/" in name else f".claude/hooks/{name}")
+
+
+def record(argv):
+    """Run the hook in `argv` as-is, pass its output through, and log the call."""
+    project = pathlib.Path(os.environ.get("CLAUDE_PROJECT_DIR", os.getcwd()))
+    log = pathlib.Path(os.environ["HOOK_RECORD"])
+    if not log.is_absolute():
+        log = project / log
+    payload = sys.stdin.buffer.read()
+
+    before = markers(project)
+    start = time.perf_counter_ns()
+    run = subprocess.run(argv, input=payload, capture_output=True)
+    duration_ns = time.perf_counter_ns() - start
+    after = markers(project)
+
+    # The hook's output is delivered before anything is logged, and a logging
+    # failure is swallowed: a recorder that broke a gate would be worse than no
+    # recording at all.
+    sys.stdout.buffer.write(run.stdout)
+    sys.stderr.buffer.write(run.stderr)
+    sys.stdout.flush()
+    sys.stderr.flush()
+    try:
+        entry = {
+            "ts": time.time(),
+            "hook": hook_name(project, argv[0]),
+            "args": argv[1:],
+            "payload": payload.decode("utf-8", "replace"),
+            "stdout": run.stdout.decode("utf-8", "replace"),
+            "exit": run.returncode,
+            "decision": decision(run.stdout.decode("utf-8", "replace")),
+            "duration_ms": duration_ns / 1e6,
+            "markers_before": before,
+            "markers_after": after,
+        }
+        member = gzip.compress((json.dumps(entry, ensure_ascii=False) + "\n").encode())
+        log.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(log, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            os.write(fd, member)
+        finally:
+            os.close(fd)
+    except Exception as exc:  # noqa: BLE001 — see above: never fail the hook
+        print(f"hook-traffic: not recorded ({exc})", file=sys.stderr)
+    return run.returncode
+
+
+def read_log(path):
+    with gzip.open(path, "rt", encoding="utf-8") as fh:
+        return [json.loads(line) for line in fh if line.strip()]
+
+
+def make_sandbox(hooks_source):
+    """A throwaway git repository holding a copy of `.claude/` and `.cursor/` minus their markers.
+
+    `hooks_source` is a directory to copy from, or a git ref whose hook
+    directories are exported with `git archive` so `--against` needs no checkout.
+    """
+    sandbox = pathlib.Path(tempfile.mkdtemp(prefix="hook-replay-"))
+    if isinstance(hooks_source, pathlib.Path):
+        for tree in HOOK_TREES:
+            if (hooks_source / tree).is_dir():
+                shutil.copytree(
+                    hooks_source / tree,
+                    sandbox / tree,
+                    ignore=lambda _d, names: [n for n in names if n.startswith(".")],
+                )
+    else:
+        present = subprocess.run(
+            ["git", "-C", str(REPO), "ls-tree", "--name-only", hooks_source, *HOOK_TREES],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.split()
+        if present:
+            archive = subprocess.run(
+                ["git", "-C", str(REPO), "archive", hooks_source, *present],
+                capture_output=True,
+                check=True,
+            ).stdout
+            subprocess.run(["tar", "-x", "-C", str(sandbox)], input=archive, check=True)
+    (sandbox / ".claude").mkdir(exist_ok=True)
+    quiet = {"capture_output": True, "cwd": sandbox}
+    subprocess.run(["git", "init", "-q", "."], check=True, **quiet)
+    subprocess.run(["git", "-c", "user.email=replay@example.com", "-c", "user.name=replay",
+                    "commit", "-q", "--allow-empty", "-m", "replay"], check=True, **quiet)
+    return sandbox
+
+
+def replay_one(sandbox, entry):
+    """Run one recorded call in `sandbox` from its recorded marker state."""
+    claude = sandbox / ".claude"
+    for name in markers(sandbox):
+        (claude / name).unlink()
+    for name in entry["markers_before"]:
+        (claude / name).touch()
+    hook = hook_file(sandbox, entry["hook"])
+    if not hook.exists():
+        return {"decision": "missing", "markers_after": [], "duration_ms": 0.0, "exit": None}
+    start = time.perf_counter_ns()
+    run = subprocess.run(
+        ["bash", str(hook), *entry["args"]],
+        input=entry["payload"].encode(),
+        capture_output=True,
+        cwd=sandbox,
+        env={**os.environ, "CLAUDE_PROJECT_DIR": str(sandbox)},
+    )
+    elapsed = (time.perf_counter_ns() - start) / 1e6
+    return {
+        "decision": decision(run.stdout.decode("utf-8", "replace")),
+        "markers_after": markers(sandbox),
+        "duration_ms": elapsed,
+        "exit": run.returncode,
+    }
+
+
+def replay_all(entries, hooks_source, jobs):
+    """Replay every entry across `jobs` sandboxes; results come back in log order."""
+    sandboxes = [make_sandbox(hooks_source) for _ in range(jobs)]
+    try:
+        # Strided, not chunked: a chunk would put one session's consecutive burst
+        # on one worker, while striding spreads every hook across all of them.
+        def work(worker):
+            return [(i, replay_one(sandboxes[worker], entries[i])) for i in range(worker, len(entries), jobs)]
+
+        results = [None] * len(entries)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as pool:
+            for chunk in pool.map(work, range(jobs)):
+                for i, result in chunk:
+                    results[i] = result
+        return results
+    finally:
+        for sandbox in sandboxes:
+            shutil.rmtree(sandbox, ignore_errors=True)
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def latency_table(entries, baseline, current, threshold):
+    """Per-hook p50/p95 for baseline vs current; returns (lines, regressed hooks)."""
+    by_hook = {}
+    for entry, old, new in zip(entries, baseline, current):
+        by_hook.setdefault(entry["hook"], ([], []))
+        by_hook[entry["hook"]][0].append(old)
+        by_hook[entry["hook"]][1].append(new)
+    lines, regressed = [], []
+    for hook, (old, new) in sorted(by_hook.items()):
+        old50, new50 = statistics.median(old), statistics.median(new)
+        old95, new95 = percentile(old, 0.95), percentile(new, 0.95)
+        # A ratio alone flags a 1ms -> 2ms hook, which is noise at this scale; the
+        # absolute floor keeps the report to changes a session would feel.
+        worse = (new50 > old50 * threshold and new50 - old50 > 5) or (
+            new95 > old95 * threshold and new95 - old95 > 5
+        )
+        if worse:
+            regressed.append(hook)
+        lines.append(
+            f"  {'SLOW' if worse else 'ok  '} {hook:34s} n={len(old):<5d} "
+            f"p50 {old50:7.1f} -> {new50:7.1f} ms   p95 {old95:7.1f} -> {new95:7.1f} ms"
+        )
+    return lines, regressed
+
+
+def cmd_replay(args):
+    entries = read_log(args.log)
+    if args.hook:
+        entries = [e for e in entries if e["hook"] in args.hook or e["hook"].rsplit("/", 1)[-1] in args.hook]
+    if not entries:
+        print("nothing to replay")
+        return 0
+
+    start = time.perf_counter()
+    current = replay_all(entries, REPO, args.j)
+    if args.against:
+        baseline = replay_all(entries, args.against, args.j)
+        reference = f"replay at {args.against}"
+    else:
+        baseline = [
+            {"decision": e["decision"], "markers_after": e["markers_after"], "duration_ms": e["duration_ms"]}
+            for e in entries
+        ]
+        reference = "the recording"
+    elapsed = time.perf_counter() - start
+    print(f"replayed {len(entries)} calls in {elapsed:.1f}s with -j {args.j}, against {reference}")
+
+    drift = [
+        (i, e, old, new)
+        for i, (e, old, new) in enumerate(zip(entries, baseline, current))
+        if (old["decision"], old["markers_after"]) != (new["decision"], new["markers_after"])
+    ]
+    print(f"\ndecision drift: {len(drift)}")
+    for i, entry, old, new in drift[: args.max_reports]:
+        print(f"  #{i} {entry['hook']} {' '.join(entry['args'])}".rstrip())
+        print(f"      was {old['decision']:8s} markers {old['markers_after']}")
+        print(f"      now {new['decision']:8s} markers {new['markers_after']}")
+    if len(drift) > args.max_reports:
+        print(f"  ... {len(drift) - args.max_reports} more")
+
+    print("\nlatency")
+    lines, regressed = latency_table(
+        entries, [b["duration_ms"] for b in baseline], [c["duration_ms"] for c in current], args.threshold
+    )
+    print("\n".join(lines))
+    if not args.against:
+        print("  (baseline is the recording machine's timing; use --against REF to compare like with like)")
+    return 1 if drift or regressed else 0
+
+
+def cmd_summary(args):
+    entries = read_log(args.log)
+    by_hook = {}
+    for entry in entries:
+        by_hook.setdefault(entry["hook"], []).append(entry)
+    print(f"{len(entries)} calls across {len(by_hook)} hooks")
+    for hook, calls in sorted(by_hook.items()):
+        durations = [c["duration_ms"] for c in calls]
+        decisions = {}
+        for c in calls:
+            decisions[c["decision"]] = decisions.get(c["decision"], 0) + 1
+        spread = ", ".join(f"{k} {v}" for k, v in sorted(decisions.items()))
+        print(f"  {hook:34s} n={len(calls):<5d} p50 {statistics.median(durations):7.1f} ms  {spread}")
+    return 0
+
+
+def main(argv):
+    if argv[:1] == ["record"]:
+        return record(argv[1:])
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    rp = sub.add_parser("replay", help="replay a log against the hooks in this checkout")
+    rp.add_argument("log", type=pathlib.Path)
+    rp.add_argument("--against", metavar="REF", help="also replay through the hooks at this git ref")
+    rp.add_argument("--hook", action="append", help="replay only this hook (repeatable)")
+    rp.add_argument("-j", type=int, default=os.cpu_count() or 4, help="parallel sandboxes")
+    rp.add_argument("--threshold", type=float, default=1.5, help="latency ratio that counts as a regression")
+    rp.add_argument("--max-reports", type=int, default=20)
+    sm = sub.add_parser("summary", help="per-hook call counts, decisions and latency")
+    sm.add_argument("log", type=pathlib.Path)
+    args = parser.parse_args(argv)
+    return cmd_replay(args) if args.command == "replay" else cmd_summary(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
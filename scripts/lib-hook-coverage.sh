@@ -0,0 +1,24 @@
+# Sourced through BASH_ENV by `python3 scripts/run-suites.py --coverage`.
+#
+# Every non-interactive bash reads BASH_ENV before its script, which is the one
+# place a trace can be switched on for a hook without editing the hook or the
+# harness that runs it. Anything that is not a hook under .claude/hooks/ returns
+# straight away, so `git`, the harnesses' own `bash -c` calls and the Stop gate's
+# helpers stay untraced.
+#
+# The trace goes to its own file descriptor (BASH_XTRACEFD, bash 4.1+), one file
+# per process, never to stderr: several harness cases assert that a hook's stderr
+# is empty, and a trace there would fail them for a reason that has nothing to do
+# with the hook. run-suites.py refuses --coverage on an older bash for that reason
+# rather than letting the trace leak. PS4 carries the source file and line so a
+# function sourced from lib-commit-shape.sh is credited to that file, not the hook.
+case "$0" in
+  */.claude/hooks/* | .claude/hooks/*) ;;
+  *) return 0 ;;
+esac
+[ -n "${HOOK_COVERAGE_DIR:-}" ] || return 0
+
+exec 19>>"$HOOK_COVERAGE_DIR/trace.$$"
+BASH_XTRACEFD=19
+PS4='+@cov@${BASH_SOURCE}@${LINENO}@ '
+set -x
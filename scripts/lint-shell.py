@@ -0,0 +1,207 @@
+"""Check every shell script in the tree for constructs that abort on bash 3.2.
+
+```
+python3 scripts/lint-shell.py                 # every shell script git knows about, plus .claude/hooks/
+python3 scripts/lint-shell.py a.sh b.sh       # just these (lefthook passes the staged ones)
+python3 scripts/lint-shell.py --no-cache
+```
+
+`test-aegis-gate.py` grew the bash-3.2 invariant after the Aegis stamp silently
+failed to be created on macOS for weeks (its docstring has the history), but it
+applies it only to the three hooks in its own `HOOKS` tuple. Every other hook,
+the Cursor stamp hook and the scripts under `scripts/` run on the same Macs and
+went unchecked. The rules live here now, and the harness imports
+`shopt_is_guarded` from this file rather than keeping a second copy that could
+drift.
+
+The rules, on each line with whole-line comments stripped:
+
+- **unguarded-shopt** — every `shopt` statement must end in `|| true`. `shopt -s`
+  exits non-zero on an option the running bash does not know, and `set -e` turns
+  that into an abort; see `shopt_is_guarded` for exactly what "guarded" means.
+- **bash4-builtin** — `mapfile`, `readarray` and `declare -A` do not exist in
+  bash 3.2 at all. A plain substring match, so a trailing comment naming one fails
+  the check on a harmless line — it fails closed, never open.
+
+Neither is a shell parser. They catch the construct written plainly, which is
+how it gets reintroduced by accident, not someone working around it.
+
+What is checked without arguments: every tracked `*.sh`, everything under
+`.claude/hooks/` and `.cursor/hooks/` (tracked or not, since a hook being written
+is exactly the one to check), and any other tracked file whose first line is a
+`sh` or `bash` shebang. Results are cached in `.cache/lint-shell.json` by the
+sha256 of each file's content, and the whole cache is dropped when this file
+changes, so an unchanged tree costs a hash per file. Files that miss the cache are
+linted across processes when there are enough of them to repay starting the
+pool; a handful is faster inline. Exits non-zero on any finding.
+"""
+
+import argparse
+import concurrent.futures
+import hashlib
+import json
+import os
+import pathlib
+import re
+import shlex
+import subprocess
+import sys
+
+REPO = pathlib.Path(__file__).resolve().parent.parent
+CACHE = REPO / ".cache/lint-shell.json"
+HOOK_DIRS = (".claude/hooks", ".cursor/hooks")
+BASH4_BUILTINS = ("mapfile", "readarray", "declare -A")
+SHEBANG = re.compile(rb"^#!\s*\S*(/|env\s+)(ba)?sh\b")
+# Below this many cache misses the pool costs more to start than it saves.
+POOL_THRESHOLD = 8
+
+
+def shopt_is_guarded(line):
+    """True when every `shopt` on `line` is guarded the way bash 3.2 requires.
+
+    `set -e` aborts on a failing command unless that command is a non-final part
+    of an `&&` / `||` list, so the guard has to sit at the end of the same
+    statement as the `shopt` — not merely somewhere on the line. The line is
+    tokenized (`shlex` with `punctuation_chars`, so `||` and `;` are their own
+    tokens), split into statements on top-level `;` and `&`, and every statement
+    containing `shopt` must end in the token pair `||` `true`.
+
+    Each earlier version of this check was fail-open in a way hand-testing
+    missed, which is why `test-aegis-gate.py` asserts the known shapes on every
+    run rather than leaving them to be checked by hand:
+
+    - a substring search for `|| true` accepted `shopt -s globstar "|| true"`,
+      where bash sees an argument and exits;
+    - stripping comments by cutting at `" #"` missed a tab and then `;#`;
+    - looking for the token pair anywhere accepted
+      `shopt -s globstar; false || true` and `true || true && shopt -s globstar`,
+      both of which abort, and missed the second `shopt` in
+      `shopt -s globstar || true; shopt -s bogusopt`.
+
+    A backgrounded statement (`shopt -s x &`) is exempt: its exit status is never
+    checked, so it cannot abort the script.
+
+    Two imprecisions remain, and both can only report a guarded line as
+    unguarded — never the reverse:
+
+    - `shlex` opens a comment on any unquoted `#`, while bash opens one only on a
+      `#` that begins a word. `globstar#opt` is a single invalid option name to
+      bash, not `globstar` plus a comment.
+    - A line `shlex` cannot tokenize (an unbalanced quote) yields no tokens and
+      is reported unguarded rather than guessed at.
+    """
+    lex = shlex.shlex(line, posix=False, punctuation_chars=True)
+    lex.whitespace_split = True
+    try:
+        tokens = list(lex)
+    except ValueError:
+        return False
+
+    statements = []
+    current = []
+    for token in tokens:
+        if token in (";", "&"):
+            statements.append((current, token == "&"))
+            current = []
+        else:
+            current.append(token)
+    statements.append((current, False))
+
+    return all(
+        backgrounded or stmt[-2:] == ["||", "true"]
+        for stmt, backgrounded in statements
+        if "shopt" in stmt
+    )
+
+
+def lint_text(text):
+    """[(line number, rule, detail)] for one script's text."""
+    findings = []
+    for number, line in enumerate(text.splitlines(), 1):
+        if line.lstrip().startswith("#"):
+            continue
+        if re.match(r"\s*shopt\s", line) and not shopt_is_guarded(line):
+            findings.append((number, "unguarded-shopt", line.strip()))
+        for word in BASH4_BUILTINS:
+            if word in line:
+                findings.append((number, "bash4-builtin", word))
+    return findings
+
+
+def lint_file(path):
+    return lint_text(pathlib.Path(path).read_text(errors="replace"))
+
+
+def discover():
+    """Every shell script in the tree, as paths relative to the repository."""
+    tracked = subprocess.run(
+        ["git", "ls-files", "-z"], cwd=REPO, capture_output=True, check=True
+    ).stdout.decode().split("\0")
+    found = set()
+    for rel in filter(None, tracked):
+        path = REPO / rel
+        if rel.endswith(".sh") or rel.startswith(tuple(d + "/" for d in HOOK_DIRS)):
+            found.add(rel)
+        elif path.is_file() and "/node_modules/" not in f"/{rel}":
+            with open(path, "rb") as fh:
+                if SHEBANG.match(fh.readline(200)):
+                    found.add(rel)
+    for hook_dir in HOOK_DIRS:
+        if (REPO / hook_dir).is_dir():
+            found.update(
+                str(p.relative_to(REPO)) for p in (REPO / hook_dir).iterdir() if p.is_file()
+            )
+    return sorted(rel for rel in found if (REPO / rel).is_file())
+
+
+def load_cache(rules):
+    try:
+        cache = json.loads(CACHE.read_text())
+    except (FileNotFoundError, ValueError):
+        return {}
+    return cache["files"] if cache.get("rules") == rules else {}
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("paths", nargs="*", help="scripts to check (default: every shell script in the tree)")
+    parser.add_argument("--no-cache", action="store_true", help="lint every file, ignoring cached results")
+    parser.add_argument("-j", type=int, default=os.cpu_count() or 1, help="processes for cache misses")
+    args = parser.parse_args(argv)
+
+    rules = hashlib.sha256(pathlib.Path(__file__).read_bytes()).hexdigest()
+    cache = {} if args.no_cache else load_cache(rules)
+    paths = args.paths or discover()
+    digests = {p: hashlib.sha256(pathlib.Path(REPO, p).read_bytes()).hexdigest() for p in paths}
+    misses = sorted({d: p for p, d in digests.items() if d not in cache}.items())
+
+    if len(misses) >= POOL_THRESHOLD and args.j > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=args.j) as pool:
+            results = pool.map(lint_file, [REPO / p for _, p in misses], chunksize=4)
+            fresh = dict(zip((d for d, _ in misses), results))
+    else:
+        fresh = {d: lint_file(REPO / p) for d, p in misses}
+    cache.update({d: [list(f) for f in found] for d, found in fresh.items()})
+
+    CACHE.parent.mkdir(exist_ok=True)
+    live = set(digests.values())
+    if not args.paths:
+        # A full run knows every current file, so entries for content that no
+        # longer exists anywhere can go.
+        cache = {d: f for d, f in cache.items() if d in live}
+    CACHE.write_text(json.dumps({"rules": rules, "files": cache}, indent=1) + "\n")
+
+    total = 0
+    for path in paths:
+        for number, rule, detail in cache[digests[path]]:
+            print(f"{path}:{number}: {rule}: {detail}")
+            total += 1
+    if total:
+        print(f"\n{total} finding(s) in {len(paths)} script(s); see scripts/lint-shell.py for the rules")
+        return 1
+    print(f"{len(paths)} script(s) clean ({len(misses)} linted, {len(paths) - len(misses)} cached)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
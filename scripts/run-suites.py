@@ -0,0 +1,502 @@
+"""Run the scripts/test-*.py suites concurrently, skipping any whose inputs have not changed.
+
+```
+python3 scripts/run-suites.py                 # every suite, cached passes reused
+python3 scripts/run-suites.py test-bash-guard # only suites whose name contains this
+python3 scripts/run-suites.py --no-cache      # run everything, record fresh passes
+python3 scripts/run-suites.py --junit out.xml --json out.json --slowest 15
+```
+
+Every suite is its own process — each already builds its own throwaway directory,
+so nothing they share can collide — and they run side by side (`-j`, default one
+per suite). A suite's output is held until it finishes and then printed whole, so
+the log reads the same as running them one at a time.
+
+A suite's result is a function of its inputs: the harness source, every hook it
+copies or runs, every script it loads, `.claude/settings.json` (which
+`test-review-gate.py` reads for the wiring checks), and the shell and Python that
+execute them — the bash version line is the one `test-aegis-gate.py` already prints,
+because the 2026-07-29 outage was a bash-3.2-only failure. Those are hashed into
+one key per suite. A suite that passed under the same key is skipped and said so;
+anything else runs. Only passes are cached — a failure always re-runs, so a cached
+result can never hide one.
+
+The inputs are discovered from the harness, not listed here: string literals naming
+`.claude/hooks/…` or `scripts/…` files, the names in its `HOOKS` tuple, and, one
+level down, any `lib-*.sh` a hook sources. A list kept in this file would go stale
+the next time a hook is added to a suite, which is the drift `test-review-gate.py`'s
+own docstring already records once.
+
+What the key cannot see is state outside those files — the sibling directory
+`test-md-links.py` points at, a `jq` upgrade. `--no-cache` is the escape hatch for
+when that matters. The cache lives in `.cache/suites.json`, untracked.
+
+Per-check timing needs nothing from the suites. They all print one line per
+`check()` — `  ok  <label>` or `  FAIL <label>` under an unindented section
+heading — and run unbuffered here, so the time between a check's line and the line
+before it is that check's wall time: the hook runs it made plus its own
+bookkeeping. Module-level setup before the first heading belongs to no check and
+shows up only in the suite's total. `--junit` and `--json` write those timings
+(a cached suite appears as skipped), `--slowest` lists the most expensive checks,
+and under GitHub Actions the same table is appended to the job summary.
+
+`--coverage DIR` answers a different question: which lines of each hook did the
+suites actually execute. Several harness docstrings record a case that passed "for
+the wrong reason" — it never reached the branch it was named for — and only a line
+report shows that. Every hook process is put under xtrace by
+`scripts/lib-hook-coverage.sh`, loaded through BASH_ENV so neither the hooks nor
+the harnesses change, with the trace routed to a private file descriptor
+(BASH_XTRACEFD) so no assertion on a hook's stderr can notice it. The traces of
+every process of every suite are merged per hook, keyed by file name because the
+harnesses run copies under temp directories, and DIR receives one annotated
+listing per hook plus `summary.txt`. Coverage runs every suite (the cache is
+neither read nor written, so it keeps the uninstrumented timing), and the report
+states the instrumented wall time against that timing. Exits non-zero when any
+suite that ran failed.
+"""
+
+import argparse
+import ast
+import concurrent.futures
+import hashlib
+import json
+import os
+import pathlib
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+
+REPO = pathlib.Path(__file__).resolve().parent.parent
+CACHE = REPO / ".cache/suites.json"
+SETTINGS = REPO / ".claude/settings.json"
+
+REFERENCED = re.compile(r"(?:\.claude/hooks/[\w.-]+|scripts/[\w./-]+\.(?:py|sh))")
+SOURCED_LIB = re.compile(r"lib-[\w-]+\.sh")
+# The line every suite's `check()` prints, and the SKIP some of them print when a
+# case cannot run on this machine.
+CHECK_LINE = re.compile(r"^  (ok  |FAIL|SKIP) (.*)$")
+STATUS = {"ok  ": "passed", "FAIL": "failed", "SKIP": "skipped"}
+TRACE_LINE = re.compile(r"^\++@cov@(.*?)@(\d+)@ ")
+# Lines xtrace never reports because they are syntax, not commands.
+STRUCTURAL = re.compile(r"^(then|else|fi|do|done|esac|;;|\{|\}|\)|in)?\s*(;;)?$|^[\w-]+\s*\(\)\s*\{?$|^[^()]*\)$")
+
+
+def discover():
+    """Every suite under scripts/, in name order."""
+    return sorted((REPO / "scripts").glob("test-*.py"))
+
+
+def suite_inputs(harness):
+    """The repository files `harness` depends on, harness first.
+
+    Read with `ast` rather than a regex over the whole text so that a path
+    mentioned in a comment (the harnesses explain a lot in comments, including
+    hooks that no longer exist) is not mistaken for a dependency.
+    """
+    tree = ast.parse(harness.read_text(), str(harness))
+    # Docstrings are bare string statements; they describe neighbouring tools
+    # (test-bash-guard.py names the fuzzer) without depending on them.
+    prose = {id(n.value) for n in ast.walk(tree) if isinstance(n, ast.Expr)}
+    found = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Constant) and isinstance(node.value, str) and id(node) not in prose:
+            found.update(REFERENCED.findall(node.value))
+        # `HOOKS = ("a.sh", ...)` names hooks relative to .claude/hooks/.
+        if (
+            isinstance(node, ast.Assign)
+            and any(isinstance(t, ast.Name) and t.id == "HOOKS" for t in node.targets)
+            and isinstance(node.value, (ast.Tuple, ast.List))
+        ):
+            for elt in node.value.elts:
+                if isinstance(elt, ast.Constant) and isinstance(elt.value, str):
+                    found.add(f".claude/hooks/{elt.value}")
+    paths = {REPO / rel for rel in found}
+    # A hook that sources a library is as much an input as the hook itself: the
+    # commit gate lives in lib-commit-shape.sh, not in pre-bash-guard.sh.
+    for path in list(paths):
+        if path.suffix == ".sh" and path.exists():
+            for lib in SOURCED_LIB.findall(path.read_text()):
+                paths.add(path.parent / lib)
+    paths.discard(harness)
+    return [harness, *sorted(paths)]
+
+
+def file_digest(path):
+    if not path.exists():
+        return "missing"
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def environment():
+    """The interpreter facts every suite shares."""
+    bash = subprocess.run(["bash", "--version"], capture_output=True, text=True).stdout.splitlines()
+    return {
+        "bash": bash[0] if bash else "unknown",
+        "python": sys.version.split()[0],
+        ".claude/settings.json": file_digest(SETTINGS),
+    }
+
+
+def suite_key(harness, env):
+    """(key, parts): the content address of one suite, and what went into it."""
+    parts = {str(p.relative_to(REPO)): file_digest(p) for p in suite_inputs(harness)}
+    parts.update(env)
+    key = hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+    return key, parts
+
+
+def why_stale(cached, parts):
+    """Name what changed since the cached pass, for the report."""
+    if cached is None:
+        return "no cached pass"
+    changed = sorted(k for k in parts.keys() | cached["parts"].keys() if parts.get(k) != cached["parts"].get(k))
+    return "changed: " + ", ".join(changed[:4]) + (f" (+{len(changed) - 4})" if len(changed) > 4 else "")
+
+
+def load_cache():
+    try:
+        return json.loads(CACHE.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(cache):
+    CACHE.parent.mkdir(parents=True, exist_ok=True)
+    tmp = CACHE.with_suffix(".tmp")
+    tmp.write_text(json.dumps(cache, indent=2, sort_keys=True) + "\n")
+    tmp.replace(CACHE)
+
+
+def statement_spans(text):
+    """Map every line of a shell script to the line its statement starts on.
+
+    Returns (executable, owner): the set of statement start lines xtrace can
+    report, and a dict from each line to that start. A statement continued over
+    several lines — a backslash continuation, a multi-line quoted `jq` program, a
+    heredoc body — is one statement; whichever of its lines bash reports, it is
+    credited to the first. Blank lines, comments and bare syntax (`fi`, `done`,
+    `;;`, case patterns, function headers) are neither executable nor owned.
+
+    The quote tracking is deliberately simple — single and double quotes toggle,
+    a backslash escapes outside single quotes, `#` opens a comment only at the
+    start of a word — and errs towards joining lines, which can only under-count
+    executable lines, never report a covered one as missed.
+    """
+    executable, owner = set(), {}
+    start = None
+    quote = None
+    heredoc = None
+    for number, line in enumerate(text.split("\n"), 1):
+        if heredoc is not None:
+            owner[number] = start
+            if line.strip() == heredoc:
+                heredoc = None
+                start = None
+            continue
+        stripped = line.strip()
+        if start is None:
+            if not stripped or stripped.startswith("#") or STRUCTURAL.match(stripped):
+                continue
+            start = number
+            executable.add(number)
+        owner[number] = start
+        i = 0
+        while i < len(line):
+            ch = line[i]
+            if quote == "'":
+                if ch == "'":
+                    quote = None
+            elif ch == "\\":
+                i += 1
+            elif quote == '"':
+                if ch == '"':
+                    quote = None
+            elif ch in "'\"":
+                quote = ch
+            elif ch == "#" and (i == 0 or line[i - 1] in " \t;|&("):
+                break
+            i += 1
+        m = re.search(r"<<-?\s*['\"]?([A-Za-z_]\w*)['\"]?", line) if quote is None else None
+        if m:
+            heredoc = m.group(1)
+        elif quote is None and not line.rstrip().endswith(("\\", "|", "&&", "||")):
+            start = None
+    return executable, owner
+
+
+def collect_traces(trace_dir):
+    """{hook file name: set of reported line numbers}, merged across every process."""
+    hits = {}
+    for trace in pathlib.Path(trace_dir).glob("trace.*"):
+        with open(trace, encoding="utf-8", errors="replace") as fh:
+            for line in fh:
+                m = TRACE_LINE.match(line)
+                if m and "/.claude/hooks/" in f"/{m.group(1)}":
+                    hits.setdefault(pathlib.Path(m.group(1)).name, set()).add(int(m.group(2)))
+    return hits
+
+
+def write_coverage(out_dir, hits):
+    """Annotated listing per hook (`+` covered, `-` missed) and a summary; returns its lines."""
+    out_dir = pathlib.Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    summary = []
+    for hook in sorted((REPO / ".claude/hooks").glob("*")):
+        if not hook.is_file():
+            continue
+        text = hook.read_text()
+        executable, owner = statement_spans(text)
+        covered = {owner[n] for n in hits.get(hook.name, ()) if n in owner}
+        covered &= executable
+        listing = []
+        for number, line in enumerate(text.split("\n"), 1):
+            mark = "+" if number in covered else ("-" if number in executable else " ")
+            listing.append(f"{mark} {number:4d}  {line}")
+        (out_dir / f"{hook.name}.txt").write_text("\n".join(listing) + "\n")
+        pct = 100 * len(covered) / len(executable) if executable else 100.0
+        missed = sorted(executable - covered)
+        shown = ", ".join(map(str, missed[:12])) + (" …" if len(missed) > 12 else "")
+        summary.append(
+            f"  {pct:5.1f}%  {hook.name:34s} {len(covered):3d}/{len(executable):<3d}"
+            + (f"  missed: {shown}" if missed else "")
+        )
+    (out_dir / "summary.txt").write_text("\n".join(summary) + "\n")
+    return summary
+
+
+def bash_supports_xtracefd():
+    probe = subprocess.run(
+        ["bash", "-c", 'echo "${BASH_VERSINFO[0]} ${BASH_VERSINFO[1]}"'], capture_output=True, text=True
+    ).stdout.split()
+    return len(probe) == 2 and (int(probe[0]), int(probe[1])) >= (4, 1)
+
+
+def run_suite(harness, env=None):
+    """Run one suite in its own process and time each check it prints.
+
+    Returns a result dict: `passed`, `seconds`, the captured `output` lines, and
+    `checks` — one entry per check line with its section, label, status and the
+    seconds since the line before it.
+    """
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-u", str(harness)],
+        cwd=REPO,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+    )
+    output, checks = [], []
+    section = ""
+    last = start
+    for line in proc.stdout:
+        now = time.perf_counter()
+        line = line.rstrip("\n")
+        output.append(line)
+        m = CHECK_LINE.match(line)
+        if m:
+            checks.append(
+                {
+                    "section": section,
+                    "name": m.group(2).strip(),
+                    "status": STATUS[m.group(1)],
+                    "seconds": round(now - last, 4),
+                }
+            )
+        elif line and not line.startswith(" "):
+            section = line
+        last = now
+    rc = proc.wait()
+    return {
+        "passed": rc == 0,
+        "exit": rc,
+        "seconds": round(time.perf_counter() - start, 3),
+        "output": output,
+        "checks": checks,
+    }
+
+
+def write_junit(path, results):
+    """One <testsuite> per suite, one <testcase> per check, classname = section."""
+    root = ET.Element("testsuites")
+    for name, result in results.items():
+        checks = result.get("checks", [])
+        suite = ET.SubElement(
+            root,
+            "testsuite",
+            name=name,
+            tests=str(max(len(checks), 1)),
+            failures=str(sum(c["status"] == "failed" for c in checks)),
+            skipped=str(sum(c["status"] == "skipped" for c in checks) if checks else int(result["cached"])),
+            time=f"{result.get('seconds', 0):.3f}",
+        )
+        if result["cached"]:
+            case = ET.SubElement(suite, "testcase", classname=name, name="cached pass", time="0")
+            ET.SubElement(case, "skipped", message=result["reason"])
+            continue
+        for check in checks:
+            case = ET.SubElement(
+                suite, "testcase", classname=check["section"] or name, name=check["name"], time=f"{check['seconds']:.4f}"
+            )
+            if check["status"] == "failed":
+                ET.SubElement(case, "failure", message=check["name"])
+            elif check["status"] == "skipped":
+                ET.SubElement(case, "skipped", message=check["name"])
+        # A suite that dies before (or between) its checks has failed without a
+        # failing check line; without this case the XML would read green.
+        if not result["passed"] and not any(c["status"] == "failed" for c in checks):
+            case = ET.SubElement(suite, "testcase", classname=name, name="exit status", time="0")
+            failure = ET.SubElement(case, "failure", message=f"exited {result['exit']}")
+            failure.text = "\n".join(result["output"][-40:])
+    ET.indent(root)
+    pathlib.Path(path).write_text(ET.tostring(root, encoding="unicode") + "\n")
+
+
+def slowest(results, count):
+    ranked = [
+        (check["seconds"], name, check)
+        for name, result in results.items()
+        for check in result.get("checks", [])
+    ]
+    ranked.sort(key=lambda item: -item[0])
+    return ranked[:count]
+
+
+def step_summary(results, count):
+    """Markdown for the GitHub Actions job summary."""
+    lines = ["### Hook suites", "", "| suite | result | checks | wall |", "| --- | --- | --- | --- |"]
+    for name, result in results.items():
+        state = "cached" if result["cached"] else ("pass" if result["passed"] else "**FAIL**")
+        lines.append(f"| {name} | {state} | {len(result.get('checks', []))} | {result.get('seconds', 0):.1f}s |")
+    lines += ["", f"Slowest {count} checks", "", "| seconds | suite | section | check |", "| --- | --- | --- | --- |"]
+    for seconds, name, check in slowest(results, count):
+        label = check["name"].replace("|", "\\|")
+        lines.append(f"| {seconds:.3f} | {name} | {check['section']} | {label} |")
+    return "\n".join(lines) + "\n"
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("only", nargs="*", help="run only suites whose file name contains one of these")
+    parser.add_argument("--no-cache", action="store_true", help="ignore cached passes (fresh ones are still recorded)")
+    parser.add_argument("-j", type=int, default=0, help="suites to run at once (default: all of them)")
+    parser.add_argument("--junit", metavar="PATH", help="write JUnit XML with per-check timing")
+    parser.add_argument("--json", metavar="PATH", help="write the same results as JSON")
+    parser.add_argument("--slowest", type=int, default=10, metavar="N", help="list the N slowest checks")
+    parser.add_argument("--coverage", metavar="DIR", help="trace every hook and write per-hook line coverage to DIR")
+    args = parser.parse_args(argv)
+
+    suite_env = None
+    trace_dir = None
+    if args.coverage:
+        if not bash_supports_xtracefd():
+            print("--coverage needs bash 4.1+ (BASH_XTRACEFD); on an older bash the trace would land on")
+            print("stderr, where several cases assert silence. Run it where a newer bash is first on PATH.")
+            return 2
+        trace_dir = tempfile.mkdtemp(prefix="hook-coverage-")
+        suite_env = {
+            **os.environ,
+            "BASH_ENV": str(REPO / "scripts/lib-hook-coverage.sh"),
+            "HOOK_COVERAGE_DIR": trace_dir,
+        }
+        args.no_cache = True
+
+    suites = [s for s in discover() if not args.only or any(o in s.name for o in args.only)]
+    env = environment()
+    cache = load_cache()
+    results = {}
+    pending = []
+    for harness in suites:
+        key, parts = suite_key(harness, env)
+        cached = cache.get(harness.name)
+        if not args.no_cache and cached is not None and cached["key"] == key:
+            when = time.strftime("%Y-%m-%d %H:%M", time.localtime(cached["passed_at"]))
+            results[harness.name] = {"cached": True, "passed": True, "reason": f"inputs unchanged since the pass at {when}"}
+            continue
+        reason = "--no-cache" if args.no_cache else why_stale(cached, parts)
+        results[harness.name] = {"cached": False, "reason": reason, "key": key, "parts": parts}
+        pending.append(harness)
+
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=args.j or max(len(pending), 1)) as pool:
+        futures = {pool.submit(run_suite, harness, suite_env): harness for harness in pending}
+        for future in concurrent.futures.as_completed(futures):
+            harness = futures[future]
+            entry = results[harness.name]
+            entry.update(future.result())
+            print(f"== {harness.name} ({entry['reason']})")
+            print("\n".join(entry["output"]))
+            print(flush=True)
+            if args.coverage:
+                continue
+            if entry["passed"]:
+                cache[harness.name] = {
+                    "key": entry["key"],
+                    "parts": entry["parts"],
+                    "passed_at": time.time(),
+                    "seconds": entry["seconds"],
+                }
+            else:
+                # Drop any older pass: its key no longer describes the tree, and
+                # keeping it would only make the next report's "what changed"
+                # misleading.
+                cache.pop(harness.name, None)
+    wall = time.perf_counter() - start
+    if args.coverage:
+        try:
+            summary = write_coverage(args.coverage, collect_traces(trace_dir))
+        finally:
+            shutil.rmtree(trace_dir, ignore_errors=True)
+        print("hook line coverage")
+        print("\n".join(summary))
+        baseline = [cache[n]["seconds"] for n in results if n in cache]
+        if len(baseline) == len(results):
+            print(f"instrumented suite time {sum(e['seconds'] for e in results.values()):.1f}s, "
+                  f"uninstrumented {sum(baseline):.1f}s at the last cached passes")
+        print(f"annotated listings in {args.coverage}/")
+        print()
+    else:
+        save_cache(cache)
+
+    for entry in results.values():
+        entry.pop("key", None)
+        entry.pop("parts", None)
+    if args.junit:
+        write_junit(args.junit, results)
+    if args.json:
+        pathlib.Path(args.json).write_text(json.dumps(results, indent=2) + "\n")
+    if os.environ.get("GITHUB_STEP_SUMMARY"):
+        with open(os.environ["GITHUB_STEP_SUMMARY"], "a", encoding="utf-8") as fh:
+            fh.write(step_summary(results, args.slowest))
+
+    print("suites")
+    failed = []
+    for name, entry in results.items():
+        if entry["cached"]:
+            print(f"  skip {name}: {entry['reason']}")
+        elif entry["passed"]:
+            print(f"  ran  {name}: passed in {entry['seconds']:.1f}s ({entry['reason']})")
+        else:
+            failed.append(name)
+            print(f"  FAIL {name}: failed in {entry['seconds']:.1f}s ({entry['reason']})")
+    ran = [e["seconds"] for e in results.values() if not e["cached"]]
+    if ran:
+        print(f"wall {wall:.1f}s for {sum(ran):.1f}s of suite time")
+    ranked = slowest(results, args.slowest)
+    if ranked:
+        print(f"\nslowest {len(ranked)} checks")
+        for seconds, name, check in ranked:
+            print(f"  {seconds:7.3f}s  {name}  {check['name']}")
+    if failed:
+        print(f"\nFAILED: {len(failed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
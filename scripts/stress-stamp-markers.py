@@ -0,0 +1,407 @@
+"""Fire interleaved hook events from many processes and check the marker files.
+
+```
+python3 scripts/stress-stamp-markers.py                   # 1, 2, 4, 8, 16 workers, both layouts
+python3 scripts/stress-stamp-markers.py --levels 4 --steps 400 --mode shared
+python3 scripts/stress-stamp-markers.py --log /tmp/stress.ndjson   # every event, for a post-mortem
+```
+
+`.review-stamp`, `.session-id`, `.aegis-stamp` and `.aegis-unavailable` are plain
+files the hooks create and delete with no locking, and this project runs several
+sessions at once — usually in parallel worktrees, sometimes two in one. The
+harnesses drive each hook from a single process, so they say nothing about what
+happens when a `SubagentStop` in one session lands in the middle of a
+`SessionStart` in another. This does.
+
+The drivers are not re-implemented here. `dispatch()`, `stop()`, `gate()`,
+`session_start()`, `compile_hook()` and the `hook()` / `raw_hook()` they sit on
+are lifted out of `test-review-gate.py` and `test-aegis-gate.py` by name (the two
+files cannot be imported — they run their cases at import), together with the
+constants they read, and executed in a fresh namespace per worker whose `WORK` is
+that worker's project directory. The hooks copied in are the union of the two
+harnesses' `HOOKS` tuples. A driver renamed or dropped there fails this script at
+start-up rather than leaving it to drive something else.
+
+Each worker runs a seeded random mix of events as fast as it can. After every
+event it records what it saw — which markers exist and what `.session-id` holds —
+and every event and observation carries its CLOCK_MONOTONIC start and end, which
+is one clock across processes. Nothing is asserted while the run is live, because
+in a shared worktree a marker can legitimately change between a worker's event
+and its look. The check runs afterwards, over the merged log of each worktree,
+and only flags what no interleaving of the logged events can explain:
+
+- **lost** — a marker seen absent although an event that creates it finished
+  before the look began and no event that may remove it overlaps the span in
+  between;
+- **phantom** — a marker seen present (or a `gate()` that admitted a commit)
+  although an event that certainly removes it finished before the look began and
+  no event that creates it overlaps the span in between;
+- **torn** — `.session-id` holding anything other than nothing or an id some
+  worker actually sent, such as the empty file a reader meets between a
+  truncating redirect and its write.
+
+`SessionStart` removes every marker only when the session id changed (ADR-0027),
+and with several sessions sharing a directory whether it changed is itself a race,
+so it counts as "may remove": it can explain an absence but never establishes one.
+No event lands a commit, so `post-bash-stamp-consume.sh` is not driven; the
+commit-shape cases in `test-review-gate.py` are its coverage. `.aegis-unavailable`
+is written directly, because the agent writes it, not a hook (ADR-0013).
+
+Throughput is reported per concurrency level as events per second and per-event
+latency, shared layout and separate worktrees side by side; on a machine with
+fewer cores than workers the falling rate is the scheduler, not the hooks.
+Exits non-zero when any lost, phantom or torn marker is found, or a hook exits
+non-zero.
+"""
+
+import argparse
+import ast
+import bisect
+import json
+import multiprocessing
+import os
+import pathlib
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO = pathlib.Path(__file__).resolve().parent.parent
+
+# What is lifted out of each harness. Constants are listed with the functions
+# because the drivers read them as globals.
+DRIVERS = {
+    "review": (
+        "test-review-gate.py",
+        {"LAND", "OMIT", "hook", "raw_hook", "dispatch", "stop", "gate", "session_start"},
+    ),
+    "aegis": ("test-aegis-gate.py", {"COMPILE_TOOL", "hook", "compile_hook", "dispatch"}),
+}
+
+MARKERS = (".review-stamp", ".aegis-stamp", ".aegis-unavailable")
+ALL = set(MARKERS)
+
+# event: (weight, what it does to the markers). `clear` certainly removes,
+# `may_clear` possibly removes, `set` creates.
+EVENTS = {
+    "review-dispatch": (3, {"clear": {".review-stamp"}}),
+    "review-stop": (4, {"set": {".review-stamp"}}),
+    "gate": (4, {}),
+    "session-start": (1, {"may_clear": ALL}),
+    "compile": (4, {"set": {".aegis-stamp"}}),
+    "user-prompt": (2, {"clear": {".aegis-stamp"}}),
+    "agent-dispatch": (3, {}),
+    "degrade": (1, {"set": {".aegis-unavailable"}}),
+}
+
+
+def driver_source(harness, names):
+    """The named top-level definitions of `harness`, as source."""
+    tree = ast.parse((REPO / "scripts" / harness).read_text())
+    keep, found = [], set()
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef) and node.name in names:
+            keep.append(node)
+            found.add(node.name)
+        elif isinstance(node, ast.Assign):
+            targets = {t.id for t in node.targets if isinstance(t, ast.Name)}
+            if targets & names:
+                keep.append(node)
+                found |= targets & names
+    missing = names - found
+    if missing:
+        sys.exit(f"{harness} no longer defines {', '.join(sorted(missing))}; update DRIVERS here")
+    return ast.unparse(ast.Module(body=keep, type_ignores=[]))
+
+
+def harness_hooks():
+    """The union of the two harnesses' HOOKS tuples, in first-seen order."""
+    hooks = []
+    for harness, _ in DRIVERS.values():
+        for node in ast.parse((REPO / "scripts" / harness).read_text()).body:
+            if isinstance(node, ast.Assign) and any(
+                isinstance(t, ast.Name) and t.id == "HOOKS" for t in node.targets
+            ):
+                hooks += [h for h in ast.literal_eval(node.value) if h not in hooks]
+    return hooks
+
+
+class _Subprocess:
+    """Stands in for `subprocess` inside the drivers, keeping the last hook's result.
+
+    `dispatch()` and `stop()` return stdout only; the exit status is what shows a
+    hook aborting under `set -e` when a file it expected vanished under it.
+    """
+
+    def __init__(self):
+        self.last = None
+
+    def run(self, *args, **kwargs):
+        self.last = subprocess.run(*args, **kwargs)
+        return self.last
+
+
+def make_project(root, hooks):
+    """A git repository holding the hooks, ignoring the markers like the real .gitignore."""
+    root.mkdir(parents=True)
+    (root / ".claude/hooks").mkdir(parents=True)
+    for name in hooks:
+        shutil.copy(REPO / ".claude/hooks" / name, root / ".claude/hooks" / name)
+    (root / ".gitignore").write_text(
+        "\n".join(f".claude/{m}" for m in (".review-stamp", ".session-id", ".aegis-stamp", ".aegis-unavailable"))
+        + "\n"
+    )
+    (root / "AGENTS.md").write_text("stress fixture\n")
+    git = ["git", "-C", str(root), "-c", "user.email=test@example.com", "-c", "user.name=test"]
+    subprocess.run(git + ["init", "-q"], check=True)
+    subprocess.run(git + ["add", "-A"], check=True)
+    subprocess.run(git + ["commit", "-qm", "base"], check=True)
+    return git
+
+
+def layout(tmp, workers, mode, hooks):
+    """One project directory per worker: the same one (shared) or a worktree each."""
+    base = tmp / "base"
+    git = make_project(base, hooks)
+    if mode == "shared":
+        return [base] * workers
+    dirs = []
+    for w in range(workers):
+        tree = tmp / f"wt{w}"
+        subprocess.run(git + ["worktree", "add", "-q", "--detach", str(tree)], check=True)
+        dirs.append(tree)
+    return dirs
+
+
+def worker(index, project, sources, steps, seed, barrier, out):
+    os.chdir(project)
+    shim = _Subprocess()
+    ns = {}
+    for name, source in sources.items():
+        ns[name] = {
+            "WORK": pathlib.Path(project),
+            "STAMP": pathlib.Path(project) / ".claude/.aegis-stamp",
+            "UNAVAILABLE": pathlib.Path(project) / ".claude/.aegis-unavailable",
+            "json": json,
+            "os": os,
+            "pathlib": pathlib,
+            "subprocess": shim,
+        }
+        exec(source, ns[name])
+    review, aegis = ns["review"], ns["aegis"]
+    session = f"session-w{index}"
+    actions = {
+        "review-dispatch": lambda: review["dispatch"]("code-reviewer"),
+        "review-stop": lambda: review["stop"](),
+        "gate": lambda: review["gate"](),
+        "session-start": lambda: review["session_start"](session, source="startup"),
+        "compile": lambda: aegis["compile_hook"]({"isError": False}),
+        "user-prompt": lambda: aegis["hook"]("user-prompt-gate.sh", {"prompt": "next task"}),
+        "agent-dispatch": lambda: aegis["dispatch"](),
+        "degrade": lambda: (pathlib.Path(project) / ".claude/.aegis-unavailable").write_text(
+            "aegis MCP tools absent in this session\n"
+        ),
+    }
+    names = list(EVENTS)
+    weights = [EVENTS[n][0] for n in names]
+    rng = random.Random(seed * 1000 + index)
+    claude = pathlib.Path(project) / ".claude"
+    log = []
+    barrier.wait()
+    for _ in range(steps):
+        event = rng.choices(names, weights)[0]
+        shim.last = None
+        t0 = time.monotonic()
+        result = actions[event]()
+        t1 = time.monotonic()
+        entry = {"w": index, "event": event, "t0": t0, "t1": t1}
+        if shim.last is not None and shim.last.returncode != 0:
+            entry["exit"] = shim.last.returncode
+            entry["stderr"] = shim.last.stderr.strip()[-300:]
+        if event in ("gate", "agent-dispatch"):
+            entry["decision"] = result
+        log.append(entry)
+        o0 = time.monotonic()
+        seen = [m for m in MARKERS if (claude / m).exists()]
+        try:
+            sid = (claude / ".session-id").read_text()
+        except FileNotFoundError:
+            sid = None
+        log.append({"w": index, "event": "look", "t0": o0, "t1": time.monotonic(), "present": seen, "session_id": sid})
+    pathlib.Path(out).write_text(json.dumps({"session": session, "log": log}))
+
+
+class Oracle:
+    """Answers "could this marker be present / absent during [a, b]" for one worktree."""
+
+    def __init__(self, events):
+        self.sets, self.clears, self.any_clears = {}, {}, {}
+        for e in events:
+            effects = EVENTS.get(e["event"], (0, {}))[1]
+            for m in effects.get("set", ()):
+                self.sets.setdefault(m, []).append(e)
+            for m in effects.get("clear", ()):
+                self.clears.setdefault(m, []).append(e)
+                self.any_clears.setdefault(m, []).append(e)
+            for m in effects.get("may_clear", ()):
+                self.any_clears.setdefault(m, []).append(e)
+        self.ends = {}
+        for table in (self.sets, self.clears):
+            for m, evs in table.items():
+                evs.sort(key=lambda e: e["t1"])
+                self.ends[(id(table), m)] = [e["t1"] for e in evs]
+
+    def _latest_before(self, table, marker, a):
+        evs = table.get(marker, [])
+        i = bisect.bisect_left(self.ends.get((id(table), marker), []), a)
+        return evs[i - 1] if i else None
+
+    def may_be_present(self, marker, a, b):
+        """False when a certain removal finished before `a` and nothing could re-create it by `b`."""
+        clear = self._latest_before(self.clears, marker, a)
+        since = clear["t0"] if clear else float("-inf")
+        return any(s["t1"] > since and s["t0"] < b for s in self.sets.get(marker, ()))
+
+    def culprit_clear(self, marker, a):
+        return self._latest_before(self.clears, marker, a)
+
+    def may_be_absent(self, marker, a, b):
+        """False when a creation finished before `a` and nothing could remove it by `b`."""
+        made = self._latest_before(self.sets, marker, a)
+        if made is None:
+            return True
+        return any(c["t1"] > made["t0"] and c["t0"] < b for c in self.any_clears.get(marker, ()))
+
+    def culprit_set(self, marker, a):
+        return self._latest_before(self.sets, marker, a)
+
+
+def check(events, sessions):
+    """Lost, phantom and torn findings for the merged log of one worktree."""
+    oracle = Oracle(events)
+    findings = []
+    for e in events:
+        a, b = e["t0"], e["t1"]
+        if e["event"] == "look":
+            for m in MARKERS:
+                if m in e["present"] and not oracle.may_be_present(m, a, b):
+                    findings.append(("phantom", m, e, oracle.culprit_clear(m, a)))
+                if m not in e["present"] and not oracle.may_be_absent(m, a, b):
+                    findings.append(("lost", m, e, oracle.culprit_set(m, a)))
+            if e["session_id"] is not None and e["session_id"] not in sessions:
+                findings.append(("torn", ".session-id", e, None))
+        elif e["event"] == "gate" and e["decision"] == "PASS":
+            if not oracle.may_be_present(".review-stamp", a, b):
+                findings.append(("phantom", ".review-stamp (gate admitted)", e, oracle.culprit_clear(".review-stamp", a)))
+    return findings
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+
+def run_level(workers, mode, steps, seed, sources, hooks):
+    with tempfile.TemporaryDirectory(prefix="stress-stamp-") as tmp:
+        tmp = pathlib.Path(tmp)
+        dirs = layout(tmp, workers, mode, hooks)
+        ctx = multiprocessing.get_context("spawn")
+        barrier = ctx.Barrier(workers + 1)
+        procs = []
+        for w in range(workers):
+            p = ctx.Process(target=worker, args=(w, str(dirs[w]), sources, steps, seed, barrier, str(tmp / f"log{w}.json")))
+            p.start()
+            procs.append(p)
+        barrier.wait()
+        start = time.monotonic()
+        for p in procs:
+            p.join()
+        crashed = [w for w, p in enumerate(procs) if p.exitcode != 0]
+        if crashed:
+            sys.exit(f"worker(s) {crashed} crashed at {workers} workers ({mode})")
+        results = [json.loads((tmp / f"log{w}.json").read_text()) for w in range(workers)]
+    events = [e for r in results for e in r["log"]]
+    wall = max(e["t1"] for e in events) - start
+    by_tree = {}
+    for w, r in enumerate(results):
+        by_tree.setdefault(str(dirs[w]), {"events": [], "sessions": set()})
+        by_tree[str(dirs[w])]["events"] += r["log"]
+        by_tree[str(dirs[w])]["sessions"].add(r["session"])
+    findings = []
+    for tree in by_tree.values():
+        findings += check(tree["events"], tree["sessions"])
+    hooks_run = [e for e in events if e["event"] != "look"]
+    latencies = [1000 * (e["t1"] - e["t0"]) for e in hooks_run]
+    return {
+        "workers": workers,
+        "mode": mode,
+        "events": len(hooks_run),
+        "rate": len(hooks_run) / wall if wall else 0.0,
+        "p50": percentile(latencies, 0.5),
+        "p95": percentile(latencies, 0.95),
+        "findings": findings,
+        "errors": [e for e in hooks_run if "exit" in e],
+        "log": events,
+    }
+
+
+def describe(kind, marker, seen, culprit):
+    at = f"worker {seen['w']} {seen['event']} [{seen['t0']:.6f}, {seen['t1']:.6f}]"
+    if kind == "torn":
+        return f"torn {marker}: {seen['session_id']!r} at {at}"
+    if culprit is None:
+        return f"{kind} {marker} at {at}"
+    return (
+        f"{kind} {marker} at {at}; last {'removal' if kind == 'phantom' else 'creation'}: "
+        f"worker {culprit['w']} {culprit['event']} [{culprit['t0']:.6f}, {culprit['t1']:.6f}]"
+    )
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--levels", default="1,2,4,8,16", help="comma-separated worker counts")
+    parser.add_argument("--steps", type=int, default=100, help="events per worker per level")
+    parser.add_argument("--mode", choices=("shared", "separate", "both"), default="both")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--log", metavar="PATH", help="append every event and look as NDJSON")
+    parser.add_argument("--max-reports", type=int, default=10, help="findings printed per level")
+    args = parser.parse_args(argv)
+
+    hooks = harness_hooks()
+    absent = [h for h in hooks if not (REPO / ".claude/hooks" / h).is_file()]
+    if absent:
+        sys.exit(f"missing hooks: {', '.join(absent)}")
+    sources = {name: driver_source(harness, names) for name, (harness, names) in DRIVERS.items()}
+    levels = [int(n) for n in args.levels.split(",")]
+    modes = ("shared", "separate") if args.mode == "both" else (args.mode,)
+
+    bad = 0
+    print(f"{'layout':9s} {'workers':>7s} {'events':>7s} {'ev/s':>7s} {'p50 ms':>7s} {'p95 ms':>7s}"
+          f" {'lost':>5s} {'phantom':>7s} {'torn':>5s} {'errors':>6s}")
+    for mode in modes:
+        for workers in levels:
+            r = run_level(workers, mode, args.steps, args.seed, sources, hooks)
+            count = {k: sum(1 for f in r["findings"] if f[0] == k) for k in ("lost", "phantom", "torn")}
+            print(f"{mode:9s} {workers:7d} {r['events']:7d} {r['rate']:7.1f} {r['p50']:7.1f} {r['p95']:7.1f}"
+                  f" {count['lost']:5d} {count['phantom']:7d} {count['torn']:5d} {len(r['errors']):6d}")
+            for f in r["findings"][: args.max_reports]:
+                print(f"    {describe(*f)}")
+            for e in r["errors"][: args.max_reports]:
+                print(f"    worker {e['w']} {e['event']} exited {e['exit']}: {e['stderr']}")
+            bad += len(r["findings"]) + len(r["errors"])
+            if args.log:
+                with open(args.log, "a") as fh:
+                    for e in r["log"]:
+                        fh.write(json.dumps({"layout": mode, "workers": workers, **e}) + "\n")
+    print()
+    if bad:
+        print(f"FAILED: {bad} finding(s)")
+        return 1
+    print("no lost, phantom or torn markers")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -5,7 +5,9 @@
 Builds a throwaway project directory under the system temp directory, copies the
 hooks into it, and drives the sequences the gate has to get right: a successful
 consultation stamps, a failed one does not, a user prompt clears the stamp, and
-`Agent` dispatch is admitted or blocked accordingly. Nothing touches this
+`Agent` dispatch is admitted or blocked accordingly. One successful
+consultation is the real result `scripts/aegis-local-server.py` returns from
+this repository's bundle; the rest are written by hand. Nothing touches this
 repository.
 
 Run it after changing post-aegis-compile.sh, user-prompt-gate.sh, or
@@ -27,17 +29,28 @@ a construct that aborts on the oldest shell the project runs on.
 """
 
 import atexit
+import importlib.util
 import json
 import os
 import pathlib
-import re
-import shlex
 import shutil
 import subprocess
 import sys
 import tempfile
 
 REPO = pathlib.Path(__file__).resolve().parent.parent
+
+# The bash-3.2 rules live in scripts/lint-shell.py, which applies them to every
+# shell script in the tree; this suite pins them and applies them to its hooks.
+_spec = importlib.util.spec_from_file_location("lint_shell", REPO / "scripts/lint-shell.py")
+LINT = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(LINT)
+shopt_is_guarded = LINT.shopt_is_guarded
+# The offline server answers from this repository's own bundle, so one case can
+# hand the hook a real compile_context result instead of a hand-written one.
+_spec = importlib.util.spec_from_file_location("aegis_local_server", REPO / "scripts/aegis-local-server.py")
+SERVER = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(SERVER)
 # A unique directory per run, removed at exit. A fixed shared path under the
 # system temp dir would let two concurrent runs clobber each other, and the
 # `rmtree` that kept it clean would delete whatever else occupied that name.
@@ -68,64 +81,6 @@ STAMP = WORK / ".claude/.aegis-stamp"
 UNAVAILABLE = WORK / ".claude/.aegis-unavailable"
 
 
-def shopt_is_guarded(line):
-    """True when every `shopt` on `line` is guarded the way bash 3.2 requires.
-
-    `set -e` aborts on a failing command unless that command is a non-final part
-    of an `&&` / `||` list, so the guard has to sit at the end of the same
-    statement as the `shopt` — not merely somewhere on the line. The line is
-    tokenized (`shlex` with `punctuation_chars`, so `||` and `;` are their own
-    tokens), split into statements on top-level `;` and `&`, and every statement
-    containing `shopt` must end in the token pair `||` `true`.
-
-    Each earlier version of this check was fail-open in a way hand-testing
-    missed, which is why the cases below the definition are asserted on every
-    run rather than checked by hand:
-
-    - a substring search for `|| true` accepted `shopt -s globstar "|| true"`,
-      where bash sees an argument and exits;
-    - stripping comments by cutting at `" #"` missed a tab and then `;#`;
-    - looking for the token pair anywhere accepted
-      `shopt -s globstar; false || true` and `true || true && shopt -s globstar`,
-      both of which abort, and missed the second `shopt` in
-      `shopt -s globstar || true; shopt -s bogusopt`.
-
-    A backgrounded statement (`shopt -s x &`) is exempt: its exit status is never
-    checked, so it cannot abort the script.
-
-    Two imprecisions remain, and both can only report a guarded line as
-    unguarded — never the reverse:
-
-    - `shlex` opens a comment on any unquoted `#`, while bash opens one only on a
-      `#` that begins a word. `globstar#opt` is a single invalid option name to
-      bash, not `globstar` plus a comment.
-    - A line `shlex` cannot tokenize (an unbalanced quote) yields no tokens and
-      is reported unguarded rather than guessed at.
-    """
-    lex = shlex.shlex(line, posix=False, punctuation_chars=True)
-    lex.whitespace_split = True
-    try:
-        tokens = list(lex)
-    except ValueError:
-        return False
-
-    statements = []
-    current = []
-    for token in tokens:
-        if token in (";", "&"):
-            statements.append((current, token == "&"))
-            current = []
-        else:
-            current.append(token)
-    statements.append((current, False))
-
-    return all(
-        backgrounded or stmt[-2:] == ["||", "true"]
-        for stmt, backgrounded in statements
-        if "shopt" in stmt
-    )
-
-
 def check(label, actual, expected):
     ok = actual == expected
     if not ok:
@@ -154,6 +109,13 @@ def compile_hook(tool_response, target_files=("AGENTS.md",)):
     return hook("post-aegis-compile.sh", payload)
 
 
+def served(arguments):
+    """The tools/call result aegis-local-server.py returns for a compile_context call."""
+    message = {"jsonrpc": "2.0", "id": 1, "method": "tools/call",
+               "params": {"name": "aegis_compile_context", "arguments": arguments}}
+    return SERVER.Server().handle(message)["result"]
+
+
 def dispatch(subagent_type="general-purpose", transcript=None):
     payload = {"tool_name": "Agent", "tool_input": {"subagent_type": subagent_type}}
     if transcript is not None:
@@ -206,37 +168,35 @@ print("no gate hook may use a construct that aborts on bash 3.2")
 # an abort. Guarding each one keeps a newer option optional rather than required.
 # `mapfile` / `readarray` / `declare -A` do not exist in 3.2 at all.
 #
-# Both are read with whole-line comments stripped — naming a construct in a comment
-# to explain why it is avoided is exactly what these hooks should do, and the first
-# version of this check failed on its own explanatory comment. The guard test then
-# lexes each `shopt` line and requires the `||` guard on that statement itself (see
-# `shopt_is_guarded`); the builtin test is a plain substring match. Neither is a
-# shell parser: they catch the construct written plainly, which is how it gets
-# reintroduced by accident, and they do not survive indirection (`command shopt …`,
-# `eval "shopt …"`, a builtin name assembled from a variable). That is the intended
-# strength — this guards against a careless edit, not against someone working
-# around it.
+# Both rules are `LINT.lint_text`, read with whole-line comments stripped — naming
+# a construct in a comment to explain why it is avoided is exactly what these hooks
+# should do, and the first version of this check failed on its own explanatory
+# comment. The guard test lexes each `shopt` line and requires the `||` guard on
+# that statement itself (see `shopt_is_guarded`); the builtin test is a plain
+# substring match. Neither is a shell parser: they catch the construct written
+# plainly, which is how it gets reintroduced by accident, and they do not survive
+# indirection (`command shopt …`, `eval "shopt …"`, a builtin name assembled from a
+# variable). That is the intended strength — this guards against a careless edit,
+# not against someone working around it.
 #
 # One gap is known and left as a gap, because it fails closed — it can fail the
-# test on a harmless line, never pass an aborting one. The builtin check matches
-# against the whole per-hook text rather than line by line, so a trailing comment
-# naming `mapfile` / `readarray` / `declare -A` would fail it even though no such
-# builtin is called.
+# test on a harmless line, never pass an aborting one. A trailing comment naming
+# `mapfile` / `readarray` / `declare -A` fails the builtin check even though no
+# such builtin is called.
+#
+# `python3 scripts/lint-shell.py` applies the same rules to every other shell
+# script in the tree; the check stays here as well so this suite still fails on
+# its own hooks when run alone.
 for hook_name in HOOKS:
-    code = "\n".join(
-        line
-        for line in (REPO / ".claude/hooks" / hook_name).read_text().splitlines()
-        if not line.lstrip().startswith("#")
+    found = LINT.lint_text((REPO / ".claude/hooks" / hook_name).read_text())
+    check(
+        f"no unguarded shopt: {hook_name}",
+        [detail for _, rule, detail in found if rule == "unguarded-shopt"],
+        [],
     )
-    unguarded = [
-        line.strip()
-        for line in code.splitlines()
-        if re.match(r"\s*shopt\s", line) and not shopt_is_guarded(line)
-    ]
-    check(f"no unguarded shopt: {hook_name}", unguarded, [])
     check(
         f"no bash-4-only builtins: {hook_name}",
-        sorted({w for w in ("mapfile", "readarray", "declare -A") if w in code}),
+        sorted({detail for _, rule, detail in found if rule == "bash4-builtin"}),
         [],
     )
 
@@ -260,6 +220,10 @@ empty_entry = compile_hook({"isError": False}, target_files=("",))
 check("empty-string target_file: exit", empty_entry.returncode, 0)
 check("empty-string target_file: stderr", empty_entry.stderr.strip(), "")
 check("empty-string target_file: stamp", stamped(), True)
+clear()
+served_run = compile_hook(served({"target_files": ["AGENTS.md"], "command": "review"}))
+check("real response from aegis-local-server: exit", served_run.returncode, 0)
+check("real response from aegis-local-server: stamp", stamped(), True)
 
 print("a consultation that did not succeed must not stamp — fail closed")
 for label, response in (
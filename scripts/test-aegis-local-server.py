@@ -0,0 +1,212 @@
+"""Exercise scripts/aegis-local-server.py over its stdio transport with malformed calls.
+
+    python3 scripts/test-aegis-local-server.py
+
+The server is one long-lived process for the whole session: an exception that
+escapes `handle` ends it, and every later compile in the session fails with it.
+So each case here is sent to one running server process, in order, and the last
+message must still be answered — a case that kills the process shows up as every
+case after it failing. Malformed arguments must come back as a JSON-RPC error
+(`-32602`), never as a crash, and never be half-used (a string `target_files`
+read one character at a time).
+
+The same session then checks what the server answers, against this repository's
+own bundle rather than responses written by hand: a path edge and a command edge
+return their documents in the resolver's order, intent tags expand through the
+tag mappings, a token budget cuts bodies to whole sections, and a repeated
+request is answered byte for byte from the LRU. The expected documents are read
+from `aegis-share/canonical.json`, so a rebuilt bundle moves them with it. No
+edge or mapping in the bundle reaches a superseded ADR today, so that case runs
+in-process: one edge and one mapping to adr-0003 are added to a server's
+resolver, and both must come back as its successor, adr-0012.
+
+Run it after touching aegis-local-server.py. Exits non-zero on a mismatch.
+"""
+
+import importlib.util
+import json
+import pathlib
+import subprocess
+import sys
+
+REPO = pathlib.Path(__file__).resolve().parent.parent
+BUNDLE = json.loads((REPO / "aegis-share/canonical.json").read_text())
+
+spec = importlib.util.spec_from_file_location("aegis_local_server", REPO / "scripts/aegis-local-server.py")
+mod = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(mod)
+
+failures = []
+
+
+def check(label, actual, expected):
+    ok = actual == expected
+    if not ok:
+        failures.append(label)
+    print(f"  {'ok  ' if ok else 'FAIL'} {label}: {actual} (expected {expected})")
+
+
+proc = subprocess.Popen(
+    [sys.executable, str(REPO / "scripts/aegis-local-server.py"), "--cache-size", "16"],
+    stdin=subprocess.PIPE,
+    stdout=subprocess.PIPE,
+    stderr=subprocess.PIPE,
+    text=True,
+)
+ids = iter(range(1, 1000))
+
+
+def call(method, params):
+    """The server's reply, or the string 'dead' when the process no longer answers."""
+    msg_id = next(ids)
+    try:
+        proc.stdin.write(json.dumps({"jsonrpc": "2.0", "id": msg_id, "method": method, "params": params}) + "\n")
+        proc.stdin.flush()
+    except BrokenPipeError:
+        return "dead"
+    line = proc.stdout.readline()
+    return json.loads(line) if line else "dead"
+
+
+def outcome(reply):
+    """'ok', 'isError', an error code, or 'dead'."""
+    if reply == "dead":
+        return "dead"
+    if "error" in reply:
+        return reply["error"]["code"]
+    return "isError" if reply["result"].get("isError") else "ok"
+
+
+def compile_call(arguments):
+    return call("tools/call", {"name": "aegis_compile_context", "arguments": arguments})
+
+
+def compiled(arguments):
+    """The compile_context result body, or None when the call did not succeed."""
+    reply = compile_call(arguments)
+    return json.loads(reply["result"]["content"][0]["text"]) if outcome(reply) == "ok" else None
+
+
+def doc_ids(result, part="base"):
+    return [d["doc_id"] for d in result[part]["documents"]] if result else None
+
+
+def edge_targets(source_type, value):
+    """The documents the bundle's edges from one path or command reach, in the resolver's order."""
+    edges = [e for e in BUNDLE["edges"] if e["source_type"] == source_type and e["source_value"] == value]
+    return [e["target_doc_id"] for e in sorted(edges, key=mod.RESOLVE.rank)]
+
+
+VALID = {"target_files": ["AGENTS.md"], "command": "review"}
+
+print("a well-formed call is answered")
+check("initialize", outcome(call("initialize", {"protocolVersion": "2025-06-18"})), "ok")
+check("compile", outcome(compile_call(VALID)), "ok")
+check("no arguments", outcome(call("tools/call", {"name": "aegis_compile_context"})), "ok")
+
+print("malformed arguments are refused, and the server stays up")
+for label, arguments in (
+    ("arguments is an array", ["a"]),
+    ("arguments is a string", "AGENTS.md"),
+    ("command is an array", {"command": ["x"]}),
+    ("command is an object", {"command": {"a": 1}}),
+    ("target_files is a string", {"target_files": "AGENTS.md"}),
+    ("target_files is an object", {"target_files": {"AGENTS.md": 1}}),
+    ("intent_tags is a string", {"intent_tags": "review"}),
+):
+    check(label, outcome(compile_call(arguments)), -32602)
+check("params is an array", outcome(call("tools/call", ["aegis_compile_context"])), -32602)
+check("non-string list members are dropped", outcome(compile_call({"target_files": ["AGENTS.md", 3, None]})), "ok")
+
+print("compile results on the real bundle")
+result = compiled({"target_files": ["wrangler.toml"]})
+check("path_requires: documents in order", doc_ids(result), edge_targets("path", "wrangler.toml"))
+check("path_requires: reason", {d["reason"] for d in result["base"]["documents"]}, {"path:wrangler.toml"})
+check("no near miss for a matched file", result["debug_info"]["near_miss_edges"], [])
+result = compiled({"target_files": [], "command": "scaffold"})
+check("command_requires: documents in order", doc_ids(result), edge_targets("command", "scaffold"))
+check("command_requires: priority first", doc_ids(result)[0], "adr-0008")
+result = compiled({"target_files": ["wrangler.toml"], "intent_tags": ["dependencies", "delegation", "no-such-tag"]})
+best = {}
+for m in BUNDLE["tag_mappings"]:
+    if m["tag"] in ("dependencies", "delegation") and m["doc_id"] not in edge_targets("path", "wrangler.toml"):
+        best[m["doc_id"]] = max(best.get(m["doc_id"], 0), m["confidence"])
+check("tag expansion: by confidence, base left out", doc_ids(result, "expanded"),
+      sorted(best, key=lambda d: (-best[d], d)))
+check("tag expansion: reason", result["expanded"]["documents"][0]["reason"], "tag:dependencies")
+check("unknown tag reported", result["debug_info"]["unknown_tags"], ["no-such-tag"])
+
+BUDGETED = {"target_files": ["AGENTS.md"], "command": "review"}
+whole = compiled({**BUDGETED, "content_mode": "always"})
+cut = compiled({**BUDGETED, "token_budget": 400})
+spent = cut["token_budget"]
+check("token_budget: within budget", spent["used"] <= 400, True)
+check("token_budget: accounting", (spent["budget"], spent["saved"]), (400, spent["full"] - spent["used"]))
+check("token_budget: same documents", doc_ids(cut), doc_ids(whole))
+check("token_budget: first document leads with its Decision", cut["base"]["documents"][0]["sections"][:1],
+      ["## Decision"])
+check("token_budget: kept sections are cut from the body",
+      all(d["content"] in w["content"] for d, w in zip(cut["base"]["documents"], whole["base"]["documents"])
+          if len(d["sections"]) == 1), True)
+roomy = compiled({**BUDGETED, "token_budget": spent["full"]})
+check("a budget of the full cost omits nothing",
+      ([d["omitted_sections"] for d in roomy["base"]["documents"]], roomy["token_budget"]["saved"]),
+      ([[] for _ in roomy["base"]["documents"]], 0))
+check("the full budget gives whole bodies",
+      [d["content"] for d in roomy["base"]["documents"]] == [d["content"] for d in whole["base"]["documents"]], True)
+
+first = compile_call({"target_files": ["wrangler.toml", "AGENTS.md"], "intent_tags": ["delegation"]})
+again = compile_call({"target_files": ["./AGENTS.md", "wrangler.toml", "AGENTS.md"], "intent_tags": ["delegation"]})
+check("a repeated request gets the same response", outcome(first) == "ok" and again["result"] == first["result"],
+      True)
+
+print("the process survived every case")
+reply = compile_call(VALID)
+check("still answering", outcome(reply), "ok")
+if reply != "dead":
+    body = json.loads(reply["result"]["content"][0]["text"])
+    check("same answer as before", body["server"], "aegis-local")
+try:
+    proc.stdin.close()
+except BrokenPipeError:
+    pass
+check("clean exit", proc.wait(timeout=10), 0)
+stderr = proc.stderr.read()
+check("no traceback", "Traceback" in stderr, False)
+
+print("a superseded ADR is delivered as its live successor")
+check("the bundle supersedes adr-0003", mod.PACK.supersession(BUNDLE["documents"])["adr-0003"]["successor"],
+      "adr-0012")
+server = mod.Server(cache_size=16)
+server.resolver = mod.RESOLVE.Resolver(
+    server.bundle.edges + [{"edge_id": "test-legacy", "source_type": "path", "source_value": "legacy/**",
+                            "target_doc_id": "adr-0003", "edge_type": "path_requires", "priority": -1,
+                            "specificity": 0}],
+    supersession=server.bundle.supersession,
+)
+server.bundle.tag_mappings = list(server.bundle.tag_mappings) + [
+    {"tag": "legacy", "doc_id": "adr-0003", "confidence": 1, "source": "manual"}
+]
+base = server.compile_context({"target_files": ["legacy/notes.md"]})["base"]["documents"]
+check("path edge: redirected", [(d["doc_id"], d.get("supersedes")) for d in base], [("adr-0012", ["adr-0003"])])
+base = server.compile_context({"target_files": ["legacy/notes.md"], "command": "scaffold"})["base"]["documents"]
+check("successor already reached: delivered once", [d["doc_id"] for d in base].count("adr-0012"), 1)
+check("successor already reached: no adr-0003", "adr-0003" in [d["doc_id"] for d in base], False)
+expanded = server.compile_context({"target_files": ["wrangler.toml"], "intent_tags": ["legacy"]})["expanded"]
+check("tag mapping: redirected", [(d["doc_id"], d.get("supersedes")) for d in expanded["documents"]],
+      [("adr-0012", ["adr-0003"])])
+
+print("a repeated request is an LRU hit")
+request = {"target_files": ["wrangler.toml"], "command": "review"}
+text = server.compile_text(request)
+hits = server.cache.hits
+check("same text", server.compile_text({**request, "target_files": ["./wrangler.toml"]}), text)
+check("served from the cache", server.cache.hits, hits + 1)
+
+print()
+if failures:
+    print(f"FAILED: {len(failures)}")
+    for f in failures:
+        print(f"  - {f}")
+    sys.exit(1)
+print("all checks passed")
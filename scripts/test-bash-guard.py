@@ -9,10 +9,16 @@ below feeds the real hook a synthetic PreToolUse payload and asserts the decisio
 it returns. Nothing in the repository is modified and no command from a case is
 ever executed.
 
-Run it after touching pre-bash-guard.sh. Exits non-zero on a mismatch.
+Every case is also put to `scripts/bash-guard-model.py`, the Python restatement
+of the same decisions that `scripts/fuzz-bash-guard.py` explores at volume. A case
+where the model and the hook disagree fails here too: the model is only useful to
+the fuzzer while these cases pin it to what the hook actually does.
+
+Run it after touching pre-bash-guard.sh or the model. Exits non-zero on a mismatch.
 """
 
 import atexit
+import importlib.util
 import json
 import os
 import pathlib
@@ -23,6 +29,10 @@ import tempfile
 REPO = pathlib.Path(__file__).resolve().parent.parent
 HOOK = REPO / ".claude/hooks/pre-bash-guard.sh"
 
+_spec = importlib.util.spec_from_file_location("bash_guard_model", REPO / "scripts/bash-guard-model.py")
+MODEL = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(MODEL)
+
 # A project directory that already holds a review stamp. The guard runs its three
 # decisions in order, so a case built to probe the env or `find` decision with a
 # commit-shaped command still reaches the commit gate — and would then be judged
@@ -70,10 +80,16 @@ def decide(command, project_dir=REPO):
 
 def check(command, expected, why, project_dir=REPO):
     actual = decide(command, project_dir)
-    ok = actual == expected
+    # Read the stamp at the moment the hook was asked, not from the case: the
+    # stamp sections below flip it between calls.
+    modelled, _guard = MODEL.decide(
+        command, (pathlib.Path(project_dir) / ".claude/.review-stamp").exists()
+    )
+    ok = actual == expected and modelled == actual
     if not ok:
         failures.append(f"{why}: {command}")
-    print(f"  {'ok  ' if ok else 'FAIL'} {actual:5s} (want {expected:5s})  {why}")
+    drift = f"  (model says {modelled})" if modelled != actual else ""
+    print(f"  {'ok  ' if ok else 'FAIL'} {actual:5s} (want {expected:5s})  {why}{drift}")
 
 
 print("find: scoped discovery runs unattended")
@@ -0,0 +1,152 @@
+"""Exercise scripts/evals/cost-gate.py on synthetic runs with known spreads.
+
+    python3 scripts/test-cost-gate.py
+
+The gate is the one tool that turns run-to-run noise into pass or fail, so its
+interval has to be the one its docstring states — the delta method on the log
+of the cost ratio, with Student t on the smaller side's degrees of freedom, not
+the pooled ones — and each verdict has to come out where the numbers put it.
+Runs here are report directories written the way run-review-diff.py saves them,
+with made-up wall times and token counts; store rows are made up per case.
+
+Run it after touching cost-gate.py. Exits non-zero on a mismatch.
+"""
+
+import atexit
+import contextlib
+import importlib.util
+import io
+import json
+import math
+import pathlib
+import statistics
+import sys
+import tempfile
+
+REPO = pathlib.Path(__file__).resolve().parent.parent
+
+spec = importlib.util.spec_from_file_location("cost_gate", REPO / "scripts/evals/cost-gate.py")
+mod = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(mod)
+
+_TMP = tempfile.TemporaryDirectory(prefix="cost-gate-check-")
+atexit.register(_TMP.cleanup)
+WORK = pathlib.Path(_TMP.name)
+
+failures = []
+
+
+def check(label, actual, expected):
+    ok = actual == expected
+    if not ok:
+        failures.append(label)
+    print(f"  {'ok  ' if ok else 'FAIL'} {label}: {actual} (expected {expected})")
+
+
+def runs(name, tokens, wall):
+    """One report directory per run: run i gets tokens[f][i] and wall[f][i] for each fixture f."""
+    dirs = []
+    for i in range(len(next(iter(tokens.values())))):
+        run = WORK / f"{name}-r{i + 1}"
+        run.mkdir()
+        for fixture in tokens:
+            (run / f"{fixture}.md").write_text(
+                f"# {fixture} — returned report, 2026-01-01\n\n(base abc1234, reviewer `stub`, exit 0, "
+                f"{wall[fixture][i]}s wall).\n\n---\n\n```json\n"
+                + json.dumps({"findings": [], "stats": {"tokens": tokens[fixture][i], "candidates": 2, "refuted": 1}})
+                + "\n```\n"
+            )
+        dirs.append(str(run))
+    return dirs
+
+
+def gate(argv):
+    """(exit status, printed output) of cost-gate.py."""
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(out):
+        try:
+            status = mod.main(argv)
+        except SystemExit as e:
+            status = e.code
+    return status, out.getvalue()
+
+
+def samples(tokens, wall):
+    return {f: {"tokens": [float(t) for t in tokens[f]], "wall_s": [float(w) for w in wall[f]],
+                "candidates": [], "refuted": []} for f in tokens}
+
+
+STEADY = {"fx-01": [100000, 101000, 99000], "fx-02": [50000, 50500, 49500]}
+STEADY_WALL = {"fx-01": [100, 102, 98], "fx-02": [60, 61, 59]}
+BASELINE = runs("base", STEADY, STEADY_WALL)
+
+print("the interval is the documented one")
+many = {"fx-01": [100000 + 1000 * (i % 3 - 1) for i in range(10)]}
+many_wall = {"fx-01": [100 + 2 * (i % 3 - 1) for i in range(10)]}
+three = {"fx-01": STEADY["fx-01"]}
+comparison = mod.Comparison("tokens", samples(many, many_wall), samples(three, {"fx-01": STEADY_WALL["fx-01"]}))
+check("runs per side", comparison.runs, (10, 3))
+c, b = comparison.cost
+vc = statistics.variance(many["fx-01"])
+vb = statistics.variance(three["fx-01"]) / 3
+half = 4.303 * math.sqrt(vc / 10 / c**2 + vb / b**2)
+low, high = comparison.interval()
+check("t on the smaller side's df (2, not 11)", (round(low, 6), round(high, 6)),
+      (round(comparison.ratio * math.exp(-half), 6), round(comparison.ratio * math.exp(half), 6)))
+check("t95 by degrees of freedom", (mod.t95(1), mod.t95(2), mod.t95(31)), (12.706, 4.303, 1.960))
+flat = mod.Comparison("tokens", samples({"fx-01": [5, 5, 5]}, {"fx-01": [1, 1, 1]}),
+                      samples({"fx-01": [5, 5, 5]}, {"fx-01": [1, 1, 1]}))
+check("no spread, no width", flat.interval(), (1.0, 1.0))
+
+print("each verdict where the numbers put it")
+status, out = gate(["check", *runs("same", STEADY, STEADY_WALL), "--against", *BASELINE])
+check("same cost passes", (status, out.strip().splitlines()[-1]), (0, "verdict: pass"))
+dearer = {f: [t * 13 // 10 for t in v] for f, v in STEADY.items()}
+status, out = gate(["check", *runs("dearer", dearer, STEADY_WALL), "--against", *BASELINE])
+check("30% more tokens fails", (status, out.strip().splitlines()[-1]), (1, "verdict: fail"))
+noisy = {"fx-01": [90000, 110000, 100000], "fx-02": [45000, 55000, 50000]}
+status, out = gate(["check", *runs("noisy", noisy, STEADY_WALL), "--against", *BASELINE])
+tokens_line = next(line for line in out.splitlines() if line.startswith("tokens"))
+check("a noisy candidate needs more runs", (status, out.strip().splitlines()[-1]), (3, "verdict: needs more runs"))
+check("and says how many", "needs more runs (+" in tokens_line and "of each fixture" in tokens_line, True)
+close = {"fx-01": [80000, 140000, 105000], "fx-02": [40000, 70000, 52000]}
+status, out = gate(["check", *runs("close", close, STEADY_WALL), "--against", *BASELINE])
+tokens_line = next(line for line in out.splitlines() if line.startswith("tokens"))
+check("×1.08 against ×1.10 is the baseline's to settle", (status, "record more baseline runs" in tokens_line), (3, True))
+status, out = gate(["check", *runs("short", {f: v[:2] for f, v in STEADY.items()},
+                                   {f: v[:2] for f, v in STEADY_WALL.items()}), "--against", *BASELINE])
+check("two runs are under the minimum", status, 3)
+check("the short side is named", "2 run(s) of some fixture; 3 are the minimum" in out, True)
+status, out = gate(["check", *runs("once", {f: v[:1] for f, v in STEADY.items()},
+                                   {f: v[:1] for f, v in STEADY_WALL.items()}), "--against", *BASELINE,
+                    "--min-runs", "1"])
+check("--min-runs 1 is refused", (status, "--min-runs must be at least 2" in out), (2, True))
+status, out = gate(["check", *runs("slow", STEADY, {f: [w * 2 for w in v] for f, v in STEADY_WALL.items()}),
+                    "--against", *BASELINE, "--gate", "tokens"])
+check("an ungated metric does not decide", status, 0)
+
+print("store rows: one model per side, each run once")
+ROW = {"suite": "verify-spec", "date": "2026-01-01", "fixture": "sx-01", "expected": "1", "found": "1", "fp": "0",
+       "candidates": "", "refuted": "", "source_sha": ""}
+rows = [
+    {**ROW, "run": "2026-01-01-flat", "model": "opus", "tokens": "47500", "wall_s": "98"},
+    {**ROW, "run": "2026-01-01-tiers", "model": "opus", "tokens": "47500", "wall_s": "98"},
+    {**ROW, "run": "2026-01-01-tiers", "model": "sonnet", "tokens": "53300", "wall_s": "128"},
+]
+check("a run restated elsewhere counts once", [r["tokens"] for r in mod.pick_rows(rows, "opus")], ["47500"])
+check("--model picks its rows", [r["tokens"] for r in mod.pick_rows(rows, "sonnet")], ["53300"])
+for label, model in (("mixed models are refused", None), ("an absent model is refused", "haiku")):
+    try:
+        mod.pick_rows(rows, model)
+        refused = False
+    except SystemExit:
+        refused = True
+    check(label, refused, True)
+
+print()
+if failures:
+    print(f"FAILED: {len(failures)}")
+    for f in failures:
+        print(f"  - {f}")
+    sys.exit(1)
+print("all checks passed")
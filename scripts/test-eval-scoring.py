@@ -0,0 +1,144 @@
+"""Exercise scripts/evals/score-reports.py against the calls it has to make.
+
+    python3 scripts/test-eval-scoring.py
+
+The scorer replaces reading each report against `fx-NN/expected.md` by hand, so
+it has to agree with the hand scoring already on record — the 2026-08-07 run
+was scored 4/4 found, 0 FP — and it has to make each of the rules in
+`scripts/evals/review-diff/README.md` the same way a reader would: REFUTED
+findings drop out, must-not-flag and unlisted files are false positives, an
+acceptable extra is neither, and a close call goes to a human instead of being
+guessed. The fixtures' own expected.md files are parsed as they stand; the
+findings are made up per case.
+
+Run it after touching score-reports.py or the expected.md format. Exits non-zero
+on a mismatch.
+"""
+
+import atexit
+import contextlib
+import importlib.util
+import io
+import pathlib
+import sys
+import tempfile
+
+REPO = pathlib.Path(__file__).resolve().parent.parent
+EVAL = REPO / "scripts/evals/review-diff"
+
+spec = importlib.util.spec_from_file_location("score_reports", REPO / "scripts/evals/score-reports.py")
+mod = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(mod)
+
+_TMP = tempfile.TemporaryDirectory(prefix="eval-scoring-check-")
+atexit.register(_TMP.cleanup)
+WORK = pathlib.Path(_TMP.name)
+
+failures = []
+
+
+def check(label, actual, expected):
+    ok = actual == expected
+    if not ok:
+        failures.append(label)
+    print(f"  {'ok  ' if ok else 'FAIL'} {label}: {actual} (expected {expected})")
+
+
+def quiet_main(argv):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return mod.main(argv)
+
+
+def verdicts(result):
+    return [v for _, v, _ in result["verdicts"]]
+
+
+FX01 = mod.parse_expected(EVAL / "fx-01/expected.md")
+FX06 = mod.parse_expected(EVAL / "fx-06/expected.md")
+FX08 = mod.parse_expected(EVAL / "fx-08/expected.md")
+EMPTY_NAME = {
+    "file": "src/entities/user/index.ts",
+    "line": 12,
+    "title": "UpdateUserSchema name accepts empty string",
+    "description": "min(0) lets an empty name through although the message says Name is required.",
+    "severity": "major",
+    "verdict": "CONFIRMED",
+}
+
+print("expected.md is parsed as the fixtures write it")
+check("fx-01 base", FX01["base"], "d343489dccc9f8e3c4b692259a51608d20134aee")
+check("fx-01 expected file", [e["file"] for e in FX01["expected"]], ["src/entities/user/index.ts"])
+check("fx-01 severity floor", FX01["expected"][0]["severity_floor"], "minor")
+check("fx-01 extra", [x["file"] for x in FX01["extras"]], ["src/entities/user/index.test.ts"])
+check("fx-06 expects nothing", FX06["expected"], [])
+check("fx-08 short base", FX08["base"], "ce149e0")
+check("fx-08 expected count", len(FX08["expected"]), 2)
+check("fx-08 must-not count", len(FX08["must_not"]), 6)
+
+print("the 2026-08-07 run scores as it was scored by hand")
+scored = {fixture: (result, error) for fixture, result, error in
+          mod.score_directory(EVAL / "results/2026-08-07-unified-agent")}
+check("fixtures read", sorted(scored), ["fx-01", "fx-06", "fx-07", "fx-08"])
+check("no unreadable reports", [f for f, (_, error) in scored.items() if error], [])
+check("found", sum(r["found"] for r, _ in scored.values()), 4)
+check("expected", sum(r["expected"] for r, _ in scored.values()), 4)
+check("false positives", sum(r["fp"] for r, _ in scored.values()), 0)
+check("needs a human", sum(r["review"] for r, _ in scored.values()), 0)
+check("exit status", quiet_main([str(EVAL / "results/2026-08-07-unified-agent")]), 0)
+
+print("each rule is applied")
+result = mod.score(FX01, [EMPTY_NAME])
+check("match found", (result["found"], verdicts(result)), (1, ["found"]))
+result = mod.score(FX01, [{**EMPTY_NAME, "verdict": "REFUTED"}])
+check("REFUTED dropped", (result["found"], result["fp"], len(result["missed"])), (0, 0, 1))
+result = mod.score(FX01, [{**EMPTY_NAME, "verdict": "PLAUSIBLE"}])
+check("PLAUSIBLE survives", result["found"], 1)
+result = mod.score(FX01, [{**EMPTY_NAME, "file": "./src/entities/user/index.ts"}])
+check("leading ./ ignored", result["found"], 1)
+result = mod.score(FX01, [{**EMPTY_NAME, "file": "src/entities/user/index.test.ts", "title": "min boundary untested",
+                           "description": "No test covers the new lower bound."}])
+check("acceptable extra", (verdicts(result), result["fp"]), (["extra"], 0))
+result = mod.score(FX08, [{**EMPTY_NAME, "file": "src/routes/login.tsx", "title": "label constant",
+                           "description": "Extracted constant changes nothing."}])
+check("must-not file is FP", (verdicts(result), result["fp"]), (["fp"], 1))
+result = mod.score(FX06, [{**EMPTY_NAME, "file": "src/components/ProfileForm.tsx"}])
+check("clean fixture FP", result["fp"], 1)
+result = mod.score(FX01, [{**EMPTY_NAME, "severity": "nit"}])
+check("below severity floor", (result["found"], result["review"], verdicts(result)), (0, 1, ["review"]))
+result = mod.score(FX01, [{**EMPTY_NAME, "title": "Schema accepts names of any length",
+                           "description": "There is no upper bound on name."}])
+check("close call goes to a human", (result["found"], verdicts(result)), (0, ["review"]))
+result = mod.score(FX01, [{**EMPTY_NAME, "title": "Typo in JSDoc", "description": "Spelling of a word."}])
+check("unrelated finding on expected file", verdicts(result), ["fp"])
+result = mod.score(FX01, [EMPTY_NAME, {**EMPTY_NAME, "line": 40}])
+check("a duplicate goes to a human", sorted(verdicts(result)), ["found", "review"])
+
+print("report parsing")
+(WORK / "plain.md").write_text(
+    "# fx-08 — exit 0, 300s wall\n\n```\n"
+    '{"effort": "high", "findings": [], "stats": {"candidates": 3, "refuted": 3}}\n```\n'
+)
+check("plain ``` fence", mod.parse_report(WORK / "plain.md"), ([], {"candidates": 3, "refuted": 3}))
+(WORK / "last.md").write_text(
+    '```json\n{"findings": [{"file": "a"}]}\n```\n\n```json\n{"findings": [], "stats": {}}\n```\n'
+)
+check("last block wins", mod.parse_report(WORK / "last.md"), ([], {}))
+(WORK / "none.md").write_text("# fx-01 — exit 1, 12s wall\n\nThe agent timed out.\n")
+try:
+    mod.parse_report(WORK / "none.md")
+    raised = False
+except ValueError:
+    raised = True
+check("no findings block raises", raised, True)
+run = WORK / "2026-01-01-broken"
+run.mkdir()
+(run / "fx-01.md").write_text((WORK / "none.md").read_text())
+check("unreadable report exits 1", quiet_main([str(run)]), 1)
+
+print()
+if failures:
+    print(f"FAILED: {len(failures)}")
+    for f in failures:
+        print(f"  - {f}")
+    sys.exit(1)
+print("all checks passed")
@@ -0,0 +1,108 @@
+"""Exercise scripts/evals/results-store.py's cell and table readers on the formats the results files use.
+
+    python3 scripts/test-results-store.py
+
+The store is built from hand-written Markdown, so what it holds is only as good
+as the heuristics that read each cell: a token total written as a sum, a wall
+time split over two agents, a result cell that says "found" in prose. Each case
+here is a cell or table as some results file writes it, and the real files that
+carry the less common layouts — a `base → now` re-run table, a `metric | result`
+table of one fixture — are read as they stand. Nothing is written to
+`.cache/eval-results.csv`.
+
+Run it after touching results-store.py or the layout of a results table. Exits
+non-zero on a mismatch.
+"""
+
+import importlib.util
+import pathlib
+import sys
+
+REPO = pathlib.Path(__file__).resolve().parent.parent
+RESULTS = REPO / "scripts/evals/review-diff/results"
+
+spec = importlib.util.spec_from_file_location("results_store", REPO / "scripts/evals/results-store.py")
+mod = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(mod)
+
+failures = []
+
+
+def check(label, actual, expected):
+    ok = actual == expected
+    if not ok:
+        failures.append(label)
+    print(f"  {'ok  ' if ok else 'FAIL'} {label}: {actual} (expected {expected})")
+
+
+def parse(name, text=None):
+    path = RESULTS / name
+    rows = mod.parse_results("review-diff", path, path.read_text() if text is None else text)
+    return {r["fixture"]: r for r in rows}
+
+
+print("tokens")
+check("plain thousands", mod.parse_tokens("34,755"), 34755)
+check("k suffix", mod.parse_tokens("79.4k"), 79400)
+check("a sum's bold total", mod.parse_tokens("42.4k + 37.0k = **79.4k**"), 79400)
+check("a sum without a total", mod.parse_tokens("41.9k + 39.9k"), 81800)
+check("no number", mod.parse_tokens("—"), None)
+
+print("wall time")
+check("seconds", mod.parse_seconds("163s"), 163)
+check("two agents' times add", mod.parse_seconds("56s + 93s"), 149)
+check("a footnote mark", mod.parse_seconds("546s*"), 546)
+check("bold", mod.parse_seconds("**26s**"), 26)
+check("no seconds", mod.parse_seconds("n/a"), None)
+
+print("found / expected")
+check("a ratio", mod.parse_found("1/1 CONFIRMED"), (1, 1))
+check("two of two", mod.parse_found("**2/2** found"), (2, 2))
+check("found in prose", mod.parse_found("**found**, CONFIRMED critical"), (1, 1))
+check("missed", mod.parse_found("missed (REFUTED)"), (0, 1))
+check("not found", mod.parse_found("not found"), (0, 1))
+check("clean probe", mod.parse_found("0 findings"), (0, 0))
+check("says neither", mod.parse_found("to score"), (None, None))
+
+print("a per-fixture table")
+rows = parse("2026-07-10-baseline-sonnet.md")
+check("fixtures", sorted(rows), ["fx-01", "fx-02", "fx-03", "fx-04", "fx-05"])
+check("fx-01", {k: rows["fx-01"][k] for k in ("found", "expected", "tokens", "wall_s", "model")},
+      {"found": 1, "expected": 1, "tokens": 34755, "wall_s": 57, "model": "sonnet"})
+
+print("a base → now re-run table is this run's now side")
+rows = parse("2026-07-10-delta-mode.md")
+check("fixtures", sorted(rows), ["fx-01", "fx-02", "fx-03", "fx-04"])
+check("fx-01 now", (rows["fx-01"]["tokens"], rows["fx-01"]["wall_s"]), (37438, 97))
+check("fx-02 now", (rows["fx-02"]["tokens"], rows["fx-02"]["wall_s"]), (54526, 210))
+check("re-run column scores it", (rows["fx-01"]["found"], rows["fx-01"]["expected"]), (1, 1))
+check("model from the title", rows["fx-01"]["model"], "sonnet")
+
+print("a metric | result table of one fixture")
+rows = parse("2026-07-12-fx08-large-diff.md")
+check("fixture from the title", sorted(rows), ["fx-08"])
+check("fx-08 full run", {k: rows["fx-08"][k] for k in ("found", "expected", "fp", "tokens", "wall_s", "model")},
+      {"found": 2, "expected": 2, "fp": 0, "tokens": 81800, "wall_s": 72, "model": "sonnet"})
+rows = parse("2026-01-01-made-up.md", (
+    "# Targeted run, 2026-01-01\n\nBoth agents opus.\n\n## fx-03 re-run\n\n"
+    "| metric | result |\n|---|---|\n| render impurity | missed |\n| tokens | 30.0k |\n| wall time | 40s |\n"
+))
+check("fixture from the heading", sorted(rows), ["fx-03"])
+check("a missed defect", (rows["fx-03"]["found"], rows["fx-03"]["expected"], rows["fx-03"]["fp"]), (0, 1, None))
+rows = parse("2026-01-01-made-up.md", "# No fixture named\n\n| metric | result |\n|---|---|\n| tokens | 30.0k |\n")
+check("no fixture named, no row", rows, {})
+
+print("tables left out")
+check("no tokens column", parse("2026-07-12-noise-suppression.md"), {})
+rows = parse("2026-01-01-made-up.md", (
+    "# Totals\n\n| fixture | tokens | wall |\n|---|---|---|\n| fx-01 | 30.0k | 40s |\n| **total** | 30.0k | 40s |\n"
+))
+check("a totals row", sorted(rows), ["fx-01"])
+
+print()
+if failures:
+    print(f"FAILED: {len(failures)}")
+    for f in failures:
+        print(f"  - {f}")
+    sys.exit(1)
+print("all checks passed")
@@ -0,0 +1,437 @@
+"""Read the end of a session transcript without reading the rest of it.
+
+```
+python3 scripts/transcript-index.py PATH              # last record, sidechain flag, last compile_context
+python3 scripts/transcript-index.py PATH --index      # same, keeping PATH.idx up to date
+python3 scripts/transcript-index.py --verify-hook     # agree with pre-agent-aegis-guard.sh
+python3 scripts/transcript-index.py --bench --sizes 1M,10M,100M,1G
+```
+
+Session transcripts are append-only JSONL and grow to hundreds of megabytes, and
+everything anyone asks of one is about its end: which record was written last,
+whether the session it belongs to is a subagent's (`isSidechain`, the one thing
+`pre-agent-aegis-guard.sh` takes from `transcript_path` — see the "a subagent's own
+dispatch" case in `test-aegis-gate.py`), and when the Aegis context was last
+compiled. Reading from the start makes each of those cost the whole session so
+far. This maps the file and walks backwards from EOF instead.
+
+The last record is the last line that parses as JSON. A final line without its
+newline is normally a record still being written, and a partial one does not
+parse, so it is skipped rather than guessed at — the forward reference does the
+same, so the two agree on a transcript caught mid-write.
+
+The most recent `compile_context` call is found with `rfind` on the tool's name,
+then confirmed by parsing the line: it counts only as a structured `tool_use`
+block naming `mcp__aegis__aegis_compile_context`, and its result is the
+`tool_result` carrying that block's id. Prose that mentions the tool — the guard's
+own block message does — is skipped. This is a **diagnostic**, for explaining a
+blocked dispatch ("the last consultation was 40 MB ago, and it failed"). ADR-0013
+is explicit that no gate may key on transcript content, this included: the guard
+decides on `.aegis-stamp`, and nothing here should be wired in as its input.
+
+With `--index`, a sidecar `PATH.idx` remembers how far the transcript has been
+indexed and where the last compile_context use and result sit. It is appended,
+never rewritten, one line per update; a later call only scans the bytes added
+since, and falls back to a full backward scan when the transcript was truncated or
+replaced (its first bytes no longer match what the sidecar recorded). The sidecar
+is derived data: delete it whenever.
+
+`--verify-hook` runs the real guard, with no stamp, on transcripts shaped to tell
+"the last record", "the first record" and "any record" readings apart, and checks
+that the guard admits exactly those this helper calls sidechain. `--bench` writes
+synthetic transcripts of the given sizes, times the backward scan (without and
+with the sidecar) against a forward scan from the start, and fails if any of them
+disagree. Exits non-zero on any disagreement.
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import pathlib
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO = pathlib.Path(__file__).resolve().parent.parent
+TOOL = "mcp__aegis__aegis_compile_context"
+NEEDLE = TOOL.encode()
+HEAD_BYTES = 4096
+
+
+def _parse(raw):
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return None
+
+
+def _blocks(record, kind):
+    """The content blocks of `kind` in a transcript record, tolerating any shape."""
+    message = record.get("message") if isinstance(record, dict) else None
+    content = message.get("content") if isinstance(message, dict) else None
+    if not isinstance(content, list):
+        return []
+    return [b for b in content if isinstance(b, dict) and b.get("type") == kind]
+
+
+def _compile_use(record):
+    for block in _blocks(record, "tool_use"):
+        if block.get("name") == TOOL:
+            return block
+    return None
+
+
+def _result_for(record, use_id):
+    for block in _blocks(record, "tool_result"):
+        if block.get("tool_use_id") == use_id:
+            return block
+    return None
+
+
+def _line_at(buf, pos, lo=0):
+    """(start, end) of the line containing `pos`, end excluding the newline."""
+    start = max(buf.rfind(b"\n", lo, pos) + 1, lo)
+    end = buf.find(b"\n", pos)
+    return start, (len(buf) if end == -1 else end)
+
+
+def last_record(buf, lo=0):
+    """(offset, record) of the last line at or after `lo` that parses, or (None, None)."""
+    end = len(buf)
+    while end > lo:
+        start = max(buf.rfind(b"\n", lo, end) + 1, lo)
+        line = buf[start:end].strip()
+        if line:
+            record = _parse(line)
+            if record is not None:
+                return start, record
+        end = start - 1
+    return None, None
+
+
+def last_compile(buf, lo=0):
+    """The last compile_context use at or after `lo`, and its result if one follows.
+
+    Returns {"use_offset", "use_id", "result_offset", "is_error"} or None.
+    """
+    end = len(buf)
+    while True:
+        hit = buf.rfind(NEEDLE, lo, end)
+        if hit == -1:
+            return None
+        start, stop = _line_at(buf, hit, lo)
+        record = _parse(buf[start:stop])
+        use = _compile_use(record) if record is not None else None
+        if use is not None and stop < len(buf):
+            return _with_result(buf, start, stop, use)
+        end = start
+
+
+def _with_result(buf, start, stop, use):
+    found = {"use_offset": start, "use_id": use.get("id"), "result_offset": None, "is_error": None}
+    if not isinstance(use.get("id"), str):
+        return found
+    needle = json.dumps(use["id"]).encode()
+    pos = stop
+    while True:
+        hit = buf.find(needle, pos)
+        if hit == -1:
+            return found
+        rs, re_ = _line_at(buf, hit)
+        record = _parse(buf[rs:re_])
+        result = _result_for(record, use["id"]) if record is not None else None
+        if result is not None:
+            found["result_offset"] = rs
+            found["is_error"] = bool(result.get("is_error"))
+            return found
+        pos = re_ + 1
+
+
+def summarize(offset, record, compile_):
+    return {
+        "last_record_offset": offset,
+        "sidechain": bool(record.get("isSidechain")) if isinstance(record, dict) else False,
+        "compile_context": compile_,
+    }
+
+
+def _mapped(path):
+    fh = open(path, "rb")
+    size = os.fstat(fh.fileno()).st_size
+    if size == 0:
+        fh.close()
+        return None, None
+    return fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def inspect(path):
+    """Backward scan over a memory map."""
+    fh, buf = _mapped(path)
+    if buf is None:
+        return summarize(None, None, None)
+    try:
+        offset, record = last_record(buf)
+        return summarize(offset, record, last_compile(buf))
+    finally:
+        buf.close()
+        fh.close()
+
+
+def read_index(idx):
+    """The last state line of a sidecar, or None. Only its tail is read."""
+    try:
+        with open(idx, "rb") as fh:
+            fh.seek(max(0, os.fstat(fh.fileno()).st_size - 65536))
+            lines = fh.read().splitlines()
+    except FileNotFoundError:
+        return None
+    for line in reversed(lines):
+        state = _parse(line)
+        if isinstance(state, dict) and "scanned" in state:
+            return state
+    return None
+
+
+def inspect_indexed(path):
+    """Backward scan of only the bytes the sidecar has not seen, then update it."""
+    idx = f"{path}.idx"
+    fh, buf = _mapped(path)
+    if buf is None:
+        return summarize(None, None, None)
+    try:
+        state = read_index(idx)
+        if state and (
+            state["scanned"] > len(buf)
+            or hashlib.sha256(buf[: state["head_len"]]).hexdigest() != state["head"]
+        ):
+            state = None
+        lo = state["scanned"] if state else 0
+        offset, record = last_record(buf, lo)
+        if offset is None and state and state.get("last_record") is not None:
+            offset = state["last_record"]
+            start, stop = _line_at(buf, offset)
+            record = _parse(buf[start:stop])
+        compile_ = last_compile(buf, lo)
+        if compile_ is None and state and state.get("compile"):
+            compile_ = state["compile"]
+            if compile_["result_offset"] is None:
+                start, stop = _line_at(buf, compile_["use_offset"])
+                compile_ = _with_result(buf, start, stop, _compile_use(_parse(buf[start:stop])))
+        # Only whole lines are recorded as scanned, so a record caught mid-write is
+        # looked at again next time.
+        scanned = buf.rfind(b"\n") + 1
+        if state is None or scanned != state["scanned"] or compile_ != state.get("compile"):
+            head_len = min(HEAD_BYTES, scanned)
+            entry = {
+                "scanned": scanned,
+                "head_len": head_len,
+                "head": hashlib.sha256(buf[:head_len]).hexdigest(),
+                "last_record": offset,
+                "compile": compile_,
+            }
+            with open(idx, "a") as out:
+                out.write(json.dumps(entry) + "\n")
+        return summarize(offset, record, compile_)
+    finally:
+        buf.close()
+        fh.close()
+
+
+def inspect_forward(path):
+    """The reference: read every line from the start, as a naive reader would."""
+    offset = record = compile_ = None
+    pending = None
+    pos = 0
+    with open(path, "rb") as fh:
+        for raw in fh:
+            here = pos
+            pos += len(raw)
+            complete = raw.endswith(b"\n")
+            line = raw.strip()
+            if line and (parsed := _parse(line)) is not None:
+                offset, record = here, parsed
+            else:
+                parsed = None
+            if parsed is None or not complete:
+                continue
+            use = _compile_use(parsed) if NEEDLE in line else None
+            if use is not None:
+                compile_ = {"use_offset": here, "use_id": use.get("id"), "result_offset": None, "is_error": None}
+                pending = use.get("id") if isinstance(use.get("id"), str) else None
+            elif pending is not None and (result := _result_for(parsed, pending)) is not None:
+                compile_["result_offset"] = here
+                compile_["is_error"] = bool(result.get("is_error"))
+                pending = None
+    return summarize(offset, record, compile_)
+
+
+def _record(kind, sidechain=False, **extra):
+    rec = {"type": kind, "isSidechain": sidechain, "uuid": f"{random.getrandbits(64):016x}"}
+    rec.update(extra)
+    return json.dumps(rec, separators=(",", ":")) + "\n"
+
+
+def _use(use_id):
+    return _record("assistant", message={"content": [{"type": "tool_use", "id": use_id, "name": TOOL, "input": {"target_files": ["src/x.ts"]}}]})
+
+
+def _result(use_id, is_error=False):
+    return _record("user", message={"content": [{"type": "tool_result", "tool_use_id": use_id, "is_error": is_error, "content": "{}"}]})
+
+
+def _chatter(n):
+    filler = "lorem ipsum dolor sit amet " * 20
+    out = []
+    for i in range(n):
+        if i % 50 == 0:
+            # prose naming the tool, which the scan must not mistake for a call
+            out.append(_record("assistant", message={"content": [{"type": "text", "text": f"call {TOOL} first"}]}))
+        else:
+            out.append(_record("user" if i % 2 else "assistant", message={"content": [{"type": "text", "text": filler}]}))
+    return "".join(out)
+
+
+def write_transcript(path, size, rng, sidechain_last=False, torn_tail=False):
+    """A transcript of about `size` bytes with compile_context calls early and at a random point."""
+    block = _chatter(400).encode()
+    calls = [0.05, rng.uniform(0.1, 0.9)]
+    written = 0
+    with open(path, "wb") as fh:
+        n = 0
+        while written < size:
+            if calls and written >= calls[0] * size:
+                calls.pop(0)
+                n += 1
+                chunk = (_use(f"toolu_{n:04d}") + _chatter(3) + _result(f"toolu_{n:04d}", is_error=n % 2 == 0)).encode()
+            else:
+                chunk = block
+            fh.write(chunk)
+            written += len(chunk)
+        fh.write(_record("assistant", sidechain=sidechain_last, message={"content": []}).encode())
+        if torn_tail:
+            fh.write(b'{"type":"assistant","isSidechain":tr')
+
+
+def parse_size(text):
+    units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+    text = text.strip().upper()
+    return int(float(text[:-1]) * units[text[-1]]) if text[-1] in units else int(text)
+
+
+def bench(sizes, seed):
+    rng = random.Random(seed)
+    bad = 0
+    print(f"{'size':>6s} {'forward':>9s} {'backward':>9s} {'indexed':>9s} {'append+idx':>10s}  speedup")
+    with tempfile.TemporaryDirectory(prefix="transcript-bench-") as tmp:
+        for label in sizes:
+            path = pathlib.Path(tmp) / f"t-{label}.jsonl"
+            write_transcript(path, parse_size(label), rng, sidechain_last=rng.random() < 0.5, torn_tail=rng.random() < 0.5)
+            times = {}
+            results = {}
+            for name, fn in (("forward", inspect_forward), ("backward", inspect), ("indexed", inspect_indexed)):
+                t0 = time.perf_counter()
+                results[name] = fn(path)
+                times[name] = time.perf_counter() - t0
+            # The sidecar now covers the file: time the steady state, where a few
+            # records arrive between two dispatches.
+            with open(path, "a") as fh:
+                fh.write(_record("user", message={"content": [{"type": "text", "text": "next"}]}))
+                fh.write(_use("toolu_late") + _result("toolu_late"))
+            t0 = time.perf_counter()
+            results["append+idx"] = inspect_indexed(path)
+            times["append+idx"] = time.perf_counter() - t0
+            expect_late = inspect_forward(path)
+            agree = (
+                results["forward"] == results["backward"] == results["indexed"]
+                and results["append+idx"] == expect_late
+            )
+            if not agree:
+                bad += 1
+            print(
+                f"{label:>6s} {times['forward']:8.3f}s {times['backward']:8.4f}s {times['indexed']:8.4f}s"
+                f" {times['append+idx']:9.4f}s  {times['forward'] / max(times['backward'], 1e-9):7.0f}x"
+                + ("" if agree else "  DISAGREE")
+            )
+            if not agree:
+                for name, result in results.items():
+                    print(f"    {name}: {result}")
+                print(f"    forward after append: {expect_late}")
+            path.unlink()
+            pathlib.Path(f"{path}.idx").unlink(missing_ok=True)
+    return bad
+
+
+def verify_hook():
+    """Check the sidechain reading against the real guard, with no stamp present."""
+    guard = REPO / ".claude/hooks/pre-agent-aegis-guard.sh"
+    if not guard.is_file():
+        print(f"missing {guard.relative_to(REPO)}")
+        return 1
+    cases = {
+        "single sidechain record": [True],
+        "single main record": [False],
+        "main session, sidechain last": [False, False, True],
+        "sidechain session, main last": [True, True, False],
+        "sidechain first only": [True, False],
+    }
+    bad = 0
+    with tempfile.TemporaryDirectory(prefix="transcript-verify-") as tmp:
+        work = pathlib.Path(tmp)
+        (work / ".claude/hooks").mkdir(parents=True)
+        (work / ".claude/hooks" / guard.name).write_bytes(guard.read_bytes())
+        for label, flags in cases.items():
+            for torn in (False, True):
+                path = work / "t.jsonl"
+                body = "".join(_record("assistant", sidechain=f, message={"content": []}) for f in flags)
+                path.write_text(body + ('{"isSidechain":tr' if torn else ""))
+                payload = {"tool_name": "Agent", "tool_input": {"subagent_type": "general-purpose"}, "transcript_path": str(path)}
+                out = subprocess.run(
+                    ["bash", f".claude/hooks/{guard.name}"],
+                    input=json.dumps(payload),
+                    capture_output=True,
+                    text=True,
+                    cwd=work,
+                    env={**os.environ, "CLAUDE_PROJECT_DIR": str(work)},
+                ).stdout
+                hook_says = "PASS" if '"block"' not in out else "BLOCK"
+                we_say = "PASS" if inspect(path)["sidechain"] else "BLOCK"
+                ok = hook_says == we_say
+                bad += not ok
+                name = label + (", torn tail" if torn else "")
+                print(f"  {'ok  ' if ok else 'FAIL'} {name}: guard {hook_says}, helper {we_say}")
+    return bad
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("path", nargs="?", help="transcript to inspect")
+    parser.add_argument("--index", action="store_true", help="use and extend the PATH.idx sidecar")
+    parser.add_argument("--verify-hook", action="store_true", help="compare sidechain decisions with the real guard")
+    parser.add_argument("--bench", action="store_true", help="time backward vs forward scans on synthetic transcripts")
+    parser.add_argument("--sizes", default="1M,10M,100M,1G", help="transcript sizes for --bench")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        bad = bench(args.sizes.split(","), args.seed)
+        print()
+        print(f"FAILED: {bad} size(s) disagree" if bad else "all scans agree")
+        return 1 if bad else 0
+    if args.verify_hook:
+        bad = verify_hook()
+        print()
+        print(f"FAILED: {bad}" if bad else "helper agrees with the guard")
+        return 1 if bad else 0
+    if not args.path:
+        parser.error("a transcript path is required unless --bench or --verify-hook is given")
+    result = (inspect_indexed if args.index else inspect)(args.path)
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))